@@ -0,0 +1,92 @@
+"""Benchmarks for array_handler.py.
+
+Run this as::
+
+  $ python bench_array_handler.py
+
+"""
+# Copyright (c) 2016,  Enthought, Inc.
+# License: BSD Style.
+
+import sys
+
+import numpy
+import vtk
+
+from tvtk import array_handler
+
+from common import run, get_benchmark_classes
+
+
+class TimeArray2VTK(object):
+    """Conversion of numpy arrays to VTK arrays and back."""
+
+    params = [['uint8', 'int32', 'int64', 'float32', 'float64'],
+              [1000, 1000000]]
+
+    def setup(self, dtype, size):
+        self.arr = numpy.ones((size, 3), dtype)
+        self.arr_1d = numpy.ones(size, dtype)
+        self.strided = numpy.ones((size, 6), dtype)[:, ::2]
+        self.vtk_arr = array_handler.array2vtk(self.arr)
+
+    def time_array2vtk(self, dtype, size):
+        array_handler.array2vtk(self.arr)
+
+    def time_array2vtk_1d(self, dtype, size):
+        array_handler.array2vtk(self.arr_1d)
+
+    def time_array2vtk_non_contiguous(self, dtype, size):
+        array_handler.array2vtk(self.strided)
+
+    def time_vtk2array(self, dtype, size):
+        array_handler.vtk2array(self.vtk_arr)
+
+
+class TimeVTK2Array(object):
+    """Conversion of VTK arrays not created by array2vtk."""
+
+    params = [[1000, 1000000]]
+
+    def setup(self, size):
+        arr = vtk.vtkFloatArray()
+        arr.SetNumberOfComponents(3)
+        arr.SetNumberOfTuples(size)
+        arr.Fill(1.0)
+        self.vtk_arr = arr
+
+    def time_vtk2array(self, size):
+        array_handler.vtk2array(self.vtk_arr)
+
+
+class TimeArray2VTKCellArray(object):
+    """Creation of cell arrays from the different kinds of input."""
+
+    params = [[1000, 100000]]
+
+    def setup(self, n_cells):
+        self.triangles = numpy.arange(n_cells*3).reshape(n_cells, 3)
+        n = n_cells//2
+        self.blocks = [numpy.arange(n*4).reshape(n, 4),
+                       numpy.arange(n*8).reshape(n, 8)]
+        sizes = numpy.tile([4, 8], n)
+        self.offsets = numpy.zeros(len(sizes) + 1, int)
+        numpy.cumsum(sizes, out=self.offsets[1:])
+        self.connectivity = numpy.arange(self.offsets[-1])
+        self.ragged = [list(range(s)) for s in sizes]
+
+    def time_2d_array(self, n_cells):
+        array_handler.array2vtkCellArray(self.triangles)
+
+    def time_list_of_blocks(self, n_cells):
+        array_handler.array2vtkCellArray(self.blocks)
+
+    def time_list_of_lists(self, n_cells):
+        array_handler.array2vtkCellArray(self.ragged)
+
+    def time_offsets(self, n_cells):
+        array_handler.offsets2vtkCellArray(self.offsets, self.connectivity)
+
+
+if __name__ == '__main__':
+    run(get_benchmark_classes(sys.modules[__name__]))
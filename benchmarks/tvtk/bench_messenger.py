@@ -0,0 +1,65 @@
+"""Benchmarks for messenger.py.
+
+Run this as::
+
+  $ python bench_messenger.py
+
+"""
+# Copyright (c) 2016,  Enthought, Inc.
+# License: BSD Style.
+
+import sys
+
+import vtk
+
+from tvtk import messenger
+
+from common import run, get_benchmark_classes
+
+
+class Handler(object):
+    def callback(self, obj, event, *args, **kw):
+        pass
+
+
+def callback(obj, event, *args, **kw):
+    pass
+
+
+class TimeSend(object):
+    """Dispatch of an event to a number of callbacks."""
+
+    params = [[1, 10, 100]]
+
+    def setup(self, n_callbacks):
+        self.source = vtk.vtkObject()
+        self.handlers = [Handler() for i in range(n_callbacks)]
+        for h in self.handlers:
+            messenger.connect(self.source, 'ModifiedEvent', h.callback)
+        self.source.AddObserver('ModifiedEvent', messenger.send)
+        self.other = vtk.vtkObject()
+        messenger.connect(self.other, 'ModifiedEvent', callback)
+
+    def teardown(self, n_callbacks):
+        messenger.disconnect(self.source)
+        messenger.disconnect(self.other)
+
+    def time_send_methods(self, n_callbacks):
+        messenger.send(self.source, 'ModifiedEvent')
+
+    def time_send_unconnected_event(self, n_callbacks):
+        messenger.send(self.source, 'DeleteEvent')
+
+    def time_send_function(self, n_callbacks):
+        messenger.send(self.other, 'ModifiedEvent')
+
+    def time_vtk_modified(self, n_callbacks):
+        # Goes through VTK's observer mechanism like TVTK objects.
+        self.source.Modified()
+
+    def time_vtk_modified_unobserved(self, n_callbacks):
+        self.other.Modified()
+
+
+if __name__ == '__main__':
+    run(get_benchmark_classes(sys.modules[__name__]))
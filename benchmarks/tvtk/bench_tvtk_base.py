@@ -0,0 +1,74 @@
+"""Benchmarks for tvtk_base.py.
+
+Run this as::
+
+  $ python bench_tvtk_base.py
+
+"""
+# Copyright (c) 2016,  Enthought, Inc.
+# License: BSD Style.
+
+import sys
+
+from tvtk import tvtk_base
+
+from common import Prop, run, get_benchmark_classes
+
+
+class TimeWrapperCreation(object):
+    """Creation of TVTK wrappers with and without lazy observer
+    setup."""
+
+    def teardown(self):
+        tvtk_base.set_lazy_observers(False)
+
+    def time_create(self):
+        tvtk_base.set_lazy_observers(False)
+        Prop()
+
+    def time_create_lazy(self):
+        tvtk_base.set_lazy_observers(True)
+        Prop()
+
+
+class TimeUpdateTraits(object):
+    """Syncing the traits from the VTK object."""
+
+    def setup(self):
+        self.prop = Prop()
+        self.vtk_obj = self.prop._vtk_obj
+        self.value = 0.0
+
+    def time_update_traits_unchanged(self):
+        self.prop.update_traits()
+
+    def time_modified_event(self):
+        # Changes the VTK object so the ModifiedEvent fires and the
+        # traits are updated via the messenger.
+        self.value = 1.0 - self.value
+        self.vtk_obj.SetOpacity(self.value)
+
+    def time_modified_event_deferred(self):
+        with tvtk_base.deferred_updates():
+            for i in range(10):
+                self.vtk_obj.SetOpacity(i*0.1)
+
+
+class TimeDoChange(object):
+    """Setting a trait, which changes the VTK object."""
+
+    def setup(self):
+        self.prop = Prop()
+        self.value = 0.0
+
+    def time_set_trait(self):
+        self.value = 1.0 - self.value
+        self.prop.opacity = self.value
+
+    def time_set_mapped_trait(self):
+        p = self.prop
+        p.representation = 'w' if p.representation == 'surface' else 's'
+
+
+if __name__ == '__main__':
+    run(get_benchmark_classes(sys.modules[__name__]))
@@ -0,0 +1,112 @@
+"""Support code for the tvtk benchmarks.
+
+Benchmarks are written as classes whose names start with 'Time'.  They
+have optional `setup`/`teardown` methods and a number of `time_*`
+methods, each of which times one operation.  This follows the
+conventions of airspeed velocity (asv).  The `run` function here times
+all of them.
+"""
+# Copyright (c) 2016,  Enthought, Inc.
+# License: BSD Style.
+
+from __future__ import print_function
+
+import gc
+import inspect
+import itertools
+import timeit
+
+import vtk
+
+from traits import api as traits
+from tvtk import tvtk_base
+
+
+# An elementary class based on vtkProperty that is used to benchmark
+# the wrapping layer without needing the generated tvtk classes.
+class Prop(tvtk_base.TVTKBase):
+    def __init__(self, obj=None, update=1, **traits):
+        tvtk_base.TVTKBase.__init__(self, vtk.vtkProperty, obj, update,
+                                    **traits)
+
+    edge_visibility = tvtk_base.false_bool_trait
+    def _edge_visibility_changed(self, old_val, new_val):
+        self._do_change(self._vtk_obj.SetEdgeVisibility,
+                        self.edge_visibility_)
+
+    representation = traits.Trait('surface',
+        tvtk_base.TraitRevPrefixMap({'points': 0, 'wireframe': 1,
+                                     'surface': 2}))
+    def _representation_changed(self, old_val, new_val):
+        self._do_change(self._vtk_obj.SetRepresentation,
+                        self.representation_)
+
+    opacity = traits.Trait(1.0, traits.Range(0.0, 1.0))
+    def _opacity_changed(self, old_val, new_val):
+        self._do_change(self._vtk_obj.SetOpacity, self.opacity)
+
+    color = tvtk_base.vtk_color_trait((1.0, 1.0, 1.0))
+    def _color_changed(self, old_val, new_val):
+        self._do_change(self._vtk_obj.SetColor, self.color)
+
+    _updateable_traits_ = (('edge_visibility', 'GetEdgeVisibility'),
+                           ('opacity', 'GetOpacity'),
+                           ('color', 'GetColor'),
+                           ('representation', 'GetRepresentation'))
+
+
+def time_method(meth, args=(), repeat=7):
+    """Return the best time per call (in seconds) of the given
+    benchmark method called with `args`."""
+    timer = timeit.Timer(lambda: meth(*args))
+    # Find a number of calls that takes at least 0.05 seconds.
+    number = 1
+    while timer.timeit(number) < 0.05:
+        number *= 10
+    return min(timer.repeat(repeat=repeat, number=number))/number
+
+
+def get_benchmark_classes(module):
+    """Return the benchmark classes (those whose name starts with
+    'Time') defined in the given module."""
+    return [k for n, k in sorted(inspect.getmembers(module,
+                                                    inspect.isclass))
+            if n.startswith('Time') and k.__module__ == module.__name__]
+
+
+def run(klasses, verbose=True):
+    """Time all the `time_*` methods of the given benchmark classes.
+
+    Classes may define a `params` attribute, a list of lists of
+    parameter values.  The `setup`, `teardown` and `time_*` methods
+    are then called with each combination of the parameters.
+
+    Returns a dictionary mapping the name of each benchmark to the
+    time per call in seconds.
+    """
+    results = {}
+    for klass in klasses:
+        params = getattr(klass, 'params', None)
+        if params is None:
+            combinations = [()]
+        else:
+            combinations = list(itertools.product(*params))
+        for args in combinations:
+            obj = klass()
+            if hasattr(obj, 'setup'):
+                obj.setup(*args)
+            names = sorted(n for n, m in inspect.getmembers(obj)
+                           if n.startswith('time_') and callable(m))
+            for name in names:
+                t = time_method(getattr(obj, name), args)
+                key = '%s.%s'%(klass.__name__, name)
+                if args:
+                    key += '(%s)'%', '.join(str(x) for x in args)
+                results[key] = t
+                if verbose:
+                    print('%s: %.3f us'%(key, t*1e6))
+            if hasattr(obj, 'teardown'):
+                obj.teardown(*args)
+            del obj
+            gc.collect()
+    return results
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Script to run all the benchmarks and compare them to a baseline.
+
+The results are compared with those stored in `baseline.json` and any
+benchmark slower than the baseline by more than the given factor is
+reported as a regression.  The baseline is machine dependent, so
+regenerate it with `--save` on the machine where comparisons are made
+before making the changes to be measured.
+"""
+# Copyright (c) 2016,  Enthought, Inc.
+# License: BSD Style.
+
+from __future__ import print_function
+
+import argparse
+import glob
+import importlib
+import json
+import os
+import subprocess
+import sys
+from os.path import dirname, join, splitext
+
+from common import run, get_benchmark_classes
+
+BASELINE = join(dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def get_benchmarks():
+    """Get all the benchmark modules to run.
+    """
+    here = dirname(os.path.abspath(__file__))
+    return sorted(splitext(os.path.basename(f))[0]
+                  for f in glob.glob(join(here, 'bench_*.py')))
+
+
+def run_module(name):
+    """Run the benchmarks of the named module in a separate Python
+    interpreter, so they are not affected by the state left behind by
+    other modules, and return the results.
+    """
+    here = dirname(os.path.abspath(__file__))
+    print(name)
+    output = subprocess.check_output([sys.executable, __file__,
+                                      '--child', name], cwd=here)
+    return json.loads(output.decode('utf-8'))
+
+
+def compare(results, baseline, threshold):
+    """Print the results next to the baseline and return the names of
+    the benchmarks slower than the baseline by more than `threshold`.
+    """
+    regressions = []
+    for key in sorted(results):
+        t = results[key]
+        base = baseline.get(key)
+        if base is None:
+            print('%-70s %10.3f us  (new)'%(key, t*1e6))
+            continue
+        ratio = t/base
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        print('%-70s %10.3f us  x%.2f%s'%(key, t*1e6, ratio, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*',
+                        help='Benchmark modules to run (default: all).')
+    parser.add_argument('--save', action='store_true',
+                        help='Store the results as the new baseline.')
+    parser.add_argument('--baseline', default=BASELINE,
+                        help='Baseline file (default: %(default)s).')
+    parser.add_argument('--threshold', type=float, default=2.0,
+                        help='Slowdown factor reported as a regression '
+                        '(default: %(default)s).')
+    parser.add_argument('--child', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Run the given module and print the results as JSON.
+        module = importlib.import_module(args.modules[0])
+        results = run(get_benchmark_classes(module), verbose=False)
+        print(json.dumps(results))
+        return 0
+
+    results = {}
+    for name in args.modules or get_benchmarks():
+        results.update(run_module(splitext(name)[0]))
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print("Saved %d results to %s"%(len(results), args.baseline))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    print('-'*70)
+    print("%d benchmarks, %d regressions"%(len(results), len(regressions)))
+    for key in regressions:
+        print(key)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
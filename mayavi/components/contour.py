@@ -3,24 +3,25 @@ tvtk.ContourFilter and provides convenient options to either
 automatically generate a specified number of contours between a given
 minimum and maximum value or explicitly specify the contours.  This
 component may be used for any input data.  The component also provides
-a convenient option to create "filled contours".
+a convenient option to create "filled contours".  When `parallel` is
+turned on, 3D image data is contoured with the multi-threaded
+tvtk.FlyingEdges3D filter.
 
 """
 # Author: Prabhu Ramachandran <prabhu_r@users.sf.net>
 # Copyright (c) 2005-2016, Enthought, Inc.
 # License: BSD Style.
 
-# Standard library imports.
-import numpy
-
 # Enthought library imports.
 from traits.api import Instance, List, Tuple, Bool, Range, \
                                  Float, Property
 from tvtk.api import tvtk
+from tvtk.common import enable_smp
 
 # Local imports.
 from mayavi.core.component import Component
 from mayavi.core.common import error
+from mayavi.core.module_manager import get_data_range
 from mayavi.components.common \
      import get_module_source, convert_to_poly_data
 
@@ -78,6 +79,12 @@ class Contour(Component):
                     rows=3,
                     desc='explicitly the contours to be generated')
 
+    # Specify if 3D image data is to be contoured in parallel blocks
+    # using multiple threads.  This is ignored for filled contours and
+    # other kinds of data.
+    parallel = Bool(False, desc='if image data is contoured using '\
+                    'multiple threads')
+
     # Specify if the filled contour option should be shown in the view
     # or not.  This is useful in situations like the iso_surface
     # module where it does not make sense to use filled contours at
@@ -142,13 +149,25 @@ class Contour(Component):
     _fill_cont_filt = Instance(tvtk.BandedPolyDataContourFilter, args=(),
                                kw={'clipping': 1, 'scalar_mode':'value'})
 
+    # The multi-threaded contour filter used for 3D image data when
+    # `parallel` is on.  This is created only when needed.
+    _parallel_cont_filt = Instance(tvtk.Object)
+
+    # Specifies if the input can be contoured by `_parallel_cont_filt`.
+    _parallel_input = Bool(False)
+
+    # The contour filter that was last connected to the input.
+    _last_cont_filt = Instance(tvtk.Object)
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(Contour, self).__get_pure_state__()
         # These traits are dynamically created.
-        for name in ('_data_min', '_data_max', '_default_contour'):
+        for name in ('_data_min', '_data_max', '_default_contour',
+                     '_parallel_cont_filt', '_parallel_input',
+                     '_last_cont_filt'):
             d.pop(name, None)
 
         return d
@@ -232,13 +251,7 @@ class Contour(Component):
         dataset = self._get_source_dataset(src)
         sc = dataset.point_data.scalars
         if sc is not None:
-            sc_array = sc.to_array()
-            has_nan = numpy.isnan(sc_array).any()
-            if has_nan:
-                rng = (float(numpy.nanmin(sc_array)),
-                       float(numpy.nanmax(sc_array)))
-            else:
-                rng = sc.range
+            rng = get_data_range(sc)[:2]
         else:
             error('Cannot contour: No scalars in input data!')
             rng = (0.0, 1.0)
@@ -292,23 +305,59 @@ class Contour(Component):
         self._auto_contours_changed(self.auto_contours)
         self.outputs = [cf]
 
+    def _parallel_changed(self, val):
+        if val:
+            enable_smp()
+        self._filled_contours_changed(self.filled_contours)
+
     def _get_contour_filter(self):
         if self.filled_contours:
             return self._fill_cont_filt
+        elif self.parallel and self._parallel_input:
+            if self._parallel_cont_filt is None:
+                self._parallel_cont_filt = tvtk.FlyingEdges3D(
+                    compute_normals=True, compute_scalars=True
+                )
+            return self._parallel_cont_filt
         else:
             return self._cont_filt
 
+    def _use_parallel_filter(self):
+        """Returns if the input is to be contoured by the
+        multi-threaded filter.
+        """
+        if not self.parallel:
+            return False
+        if getattr(tvtk, 'FlyingEdges3D', None) is None:
+            return False
+        o = self.inputs[0].outputs[0]
+        if o.is_a('vtkAlgorithmOutput'):
+            o = o.producer
+        if not o.is_a('vtkDataSet'):
+            o.update()
+            o = o.output
+        return (o is not None and o.is_a('vtkImageData')
+                and min(o.dimensions) > 1)
+
     def _set_contour_input(self):
         """Sets the input to the appropriate contour filter and
         returns the currently used contour filter.
         """
         inp = self.inputs[0].outputs[0]
+        self._parallel_input = self._use_parallel_filter()
         cf = self.contour_filter
         if self.filled_contours:
             inp = convert_to_poly_data(inp)
             self.configure_input(cf, inp)
         else:
             self.configure_input(cf, inp)
+        last = self._last_cont_filt
+        if last is not None and last is not cf:
+            # Carry the contours over to the new filter.
+            cf.number_of_contours = last.number_of_contours
+            for i in range(last.number_of_contours):
+                cf.set_value(i, last.get_value(i))
+        self._last_cont_filt = cf
         cf.update()
         return cf
 
@@ -1,4 +1,5 @@
-"""A simple wrapper for `tvtk.Cutter`.
+"""A simple wrapper for `tvtk.Cutter`.  When `parallel` is turned on,
+cuts by a plane are made with the multi-threaded `tvtk.PlaneCutter`.
 """
 # Author: Prabhu Ramachandran <prabhu_r@users.sf.net>
 # Copyright (c) 2005-2016, Enthought, Inc.
@@ -6,9 +7,10 @@
 
 
 # Enthought library imports.
-from traits.api import Instance, Property
+from traits.api import Instance, Property, Bool
 from traitsui.api import View, Group, Item
 from tvtk.api import tvtk
+from tvtk.common import enable_smp
 
 # Local imports.
 from mayavi.core.component import Component
@@ -27,15 +29,37 @@ class Cutter(Component):
     # traits that does not work.
     cut_function = Property
 
+    # Specify if cuts by a plane are made in parallel blocks using
+    # multiple threads.  The contour values of the `cutter` are not
+    # used in this case.
+    parallel = Bool(False, desc='if the plane is cut using multiple '\
+                    'threads')
+
     ########################################
     # View related traits.
 
-    view = View(Group(Item(name='cutter',
+    view = View(Group(Item(name='parallel')),
+                Group(Item(name='cutter',
                            style='custom',
                            resizable=True),
                       show_labels=False),
                 resizable=True)
 
+    ########################################
+    # Private traits.
+
+    # The multi-threaded plane cutter.  This is created only when
+    # needed.
+    _plane_cutter = Instance(tvtk.Object)
+
+    ######################################################################
+    # `object` interface
+    ######################################################################
+    def __get_pure_state__(self):
+        d = super(Cutter, self).__get_pure_state__()
+        d.pop('_plane_cutter', None)
+        return d
+
     ######################################################################
     # `Component` interface
     ######################################################################
@@ -48,7 +72,7 @@ class Cutter(Component):
         """
         if (len(self.inputs) == 0) or (len(self.inputs[0].outputs) == 0):
             return
-        c = self.cutter
+        c = self._get_active_cutter()
         self.configure_input(c, self.inputs[0].outputs[0])
         c.update()
         self.outputs = [c]
@@ -71,4 +95,26 @@ class Cutter(Component):
     def _set_cut_function(self, val):
         old = self.cutter.cut_function
         self.cutter.cut_function = val
+        if self._plane_cutter is not None and isinstance(val, tvtk.Plane):
+            self._plane_cutter.plane = val
         self.trait_property_changed('cut_function', old, val)
+
+    ######################################################################
+    # Non-public interface
+    ######################################################################
+    def _get_active_cutter(self):
+        """Returns the cutter to use for the current settings."""
+        cf = self.cutter.cut_function
+        if not self.parallel or not isinstance(cf, tvtk.Plane) or \
+               getattr(tvtk, 'PlaneCutter', None) is None:
+            return self.cutter
+        if self._plane_cutter is None:
+            self._plane_cutter = tvtk.PlaneCutter()
+        pc = self._plane_cutter
+        pc.plane = cf
+        return pc
+
+    def _parallel_changed(self, value):
+        if value:
+            enable_smp()
+        self.update_pipeline()
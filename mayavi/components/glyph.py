@@ -1,5 +1,9 @@
 """A component that allows one to place colored and scaled glyphs at
-input point data.
+input point data.  The glyphs are either generated as polydata by a
+`tvtk.Glyph3D` or, when `instancing` is turned on, rendered directly
+from a single copy of the glyph source by a `tvtk.Glyph3DMapper`.
+When `lod` is turned on, the input points are subsampled to a point
+budget while the scene is being interacted with.
 """
 # Author: Prabhu Ramachandran <prabhu_r@users.sf.net>
 #         KK Rai (kk.rai [at] iitb.ac.in)
@@ -7,11 +11,15 @@ input point data.
 # Copyright (c) 2005-2016, Enthought, Inc.
 # License: BSD Style.
 
+# Standard library imports.
+import time
+
 # Enthought library imports.
-from traits.api import Instance, Trait, Bool
+from traits.api import Instance, Trait, Bool, Range, Int, Float, Any, List
 from traits.api import Enum
 from traitsui.api import View, Group, Item
 from tvtk.api import tvtk
+from tvtk import messenger
 from tvtk.tvtk_base import TraitRevPrefixMap
 import tvtk.common as tvtk_common
 
@@ -20,6 +28,10 @@ from mayavi.core.component import Component
 from mayavi.core.module import Module
 from mayavi.components import glyph_source
 
+# The attribute types of `tvtk.DataSetAttributes` used to pick the
+# arrays of the glyph mapper.
+_SCALARS, _VECTORS, _NORMALS = 0, 1, 2
+
 
 ######################################################################
 # `Glyph` class.
@@ -70,9 +82,34 @@ class Glyph(Component):
     mask_points = Instance(tvtk.MaskPoints, args=(),
                            kw={'random_mode': True}, record=True)
 
+    # Render a subsample of the input points while the scene is being
+    # interacted with, and all of them when the interaction ends.
+    lod = Bool(False, desc='if the points are subsampled during '\
+                           'interaction')
+
+    # The maximum number of points glyphed during interaction.  Fewer
+    # points are used if rendering them is slower than the interactive
+    # update rate of the render window.
+    lod_points = Range(1, 100000000, 100000, enter_set=True,
+                       auto_set=False,
+                       desc='the number of points glyphed during '\
+                            'interaction')
+
     # The Glyph3D instance.
     glyph = Instance(tvtk.Object, allow_none=False, record=True)
 
+    # Specify if the vector glyphs are rendered by instancing the glyph
+    # source at each point instead of generating their polydata.  This
+    # uses far less memory for many points.  The settings of `glyph`
+    # are used by the glyph mapper and the module must render the
+    # output of this component with `glyph_mapper`.
+    instancing = Bool(False, desc='if the glyphs are rendered by '\
+                      'instancing the glyph source')
+
+    # The Glyph3DMapper used when `instancing` is on.  This is created
+    # only when needed.
+    glyph_mapper = Instance(tvtk.Object, record=False)
+
     # The Source to use for the glyph.  This is chosen from
     # `self._glyph_list` or `self.glyph_dict`.
     glyph_source = Instance(glyph_source.GlyphSource,
@@ -94,6 +131,24 @@ class Glyph(Component):
     # Used for optimization.
     _updating = Bool(False)
 
+    # The filter subsampling the points during interaction.
+    _lod_mask = Instance(tvtk.MaskPoints, args=())
+
+    # Whether the subsampled points are currently glyphed.
+    _lod_active = Bool(False)
+
+    # The current number of points glyphed during interaction, adapted
+    # to the measured frame times.
+    _lod_budget = Int(0)
+
+    # The time at which the current frame started rendering.
+    _render_start = Float(0.0)
+
+    # The renderer observed to switch the points and the ids of its
+    # observers.
+    _lod_renderer = Any
+    _lod_observer_ids = List
+
     ########################################
     # View related traits.
 
@@ -103,9 +158,13 @@ class Glyph(Component):
                                  style='custom', resizable=True),
                             show_labels=False,
                             ),
+                      Item(name='lod'),
+                      Item(name='lod_points', enabled_when='object.lod'),
                       label='Masking',
                       ),
-                Group(Group(Item(name='scale_mode',
+                Group(Group(Item(name='instancing',
+                                 visible_when='glyph_type == "vector"'),
+                            Item(name='scale_mode',
                                  enabled_when='show_scale_mode',
                                  visible_when='show_scale_mode'),
                             Item(name='color_mode',
@@ -134,7 +193,9 @@ class Glyph(Component):
     ######################################################################
     def __get_pure_state__(self):
         d = super(Glyph, self).__get_pure_state__()
-        for attr in ('module', '_updating'):
+        for attr in ('module', '_updating', 'glyph_mapper', '_lod_mask',
+                     '_lod_active', '_lod_budget', '_render_start',
+                     '_lod_renderer', '_lod_observer_ids'):
             d.pop(attr, None)
         return d
 
@@ -179,7 +240,7 @@ class Glyph(Component):
         self._scale_mode_changed(self.scale_mode)
 
         # Set our output.
-        tvtk_common.configure_outputs(self, self.glyph)
+        self._set_outputs()
         self.pipeline_changed = True
 
     def update_data(self):
@@ -203,19 +264,44 @@ class Glyph(Component):
             return
         self.glyph_source.start()
         super(Glyph, self).start()
+        self._observe_renderer(self.lod)
 
     def stop(self):
         if not self.running:
             return
+        self._observe_renderer(False)
         self.glyph_source.stop()
         super(Glyph, self).stop()
 
+    def update_actor_mapper(self, actor):
+        """Sets the mapper of the given `Actor` component, which renders
+        our output, to `glyph_mapper` when instancing and to a poly data
+        mapper otherwise.  Returns True if the mapper was changed.
+        """
+        if actor is None:
+            return False
+        if self.instancing and self.glyph_type == 'vector':
+            if actor.mapper is self.glyph_mapper:
+                return False
+            actor.mapper = self.glyph_mapper
+        elif actor.mapper.is_a('vtkGlyph3DMapper'):
+            actor.mapper = tvtk.PolyDataMapper(use_lookup_table_scalar_range=1)
+        else:
+            return False
+        return True
+
     def has_output_port(self):
         """ The filter has an output port."""
+        if self._use_instancing() and not self.mask_input_points:
+            return self.inputs[0].has_output_port()
         return True
 
     def get_output_object(self):
         """ Returns the output port."""
+        if self._use_instancing():
+            if self.mask_input_points:
+                return self.mask_points.output_port
+            return self.inputs[0].get_output_object()
         return self.glyph.output_port
 
     ######################################################################
@@ -223,15 +309,21 @@ class Glyph(Component):
     ######################################################################
     def _update_source(self):
         self.configure_source_data(self.glyph, self.glyph_source.outputs[0])
+        if self.glyph_mapper is not None:
+            self.configure_source_data(self.glyph_mapper,
+                                       self.glyph_source.outputs[0])
 
     def _glyph_source_changed(self, value):
         self.configure_source_data(self.glyph, value.outputs[0])
+        if self.glyph_mapper is not None:
+            self.configure_source_data(self.glyph_mapper, value.outputs[0])
 
     def _color_mode_changed(self, value):
         if len(self.inputs) == 0:
             return
         if value != 'no_coloring':
             self.glyph.color_mode = value
+        self._update_glyph_mapper()
 
     def _color_mode_tensor_changed(self, value):
         if len(self.inputs) == 0:
@@ -260,6 +352,7 @@ class Glyph(Component):
                 glyph.range = tuple(mm.scalar_lut_manager.data_range)
             else:
                 glyph.range = tuple(mm.vector_lut_manager.data_range)
+            self._update_glyph_mapper()
         finally:
             self._updating = False
             self.render()
@@ -274,7 +367,77 @@ class Glyph(Component):
             self.configure_connection(self.glyph, mask)
         else:
             self.configure_connection(self.glyph, inputs[0])
+        self._lod_active = False
         self.glyph.update()
+        if self._use_instancing():
+            # The glyphed points are our output.
+            self._set_outputs()
+
+    def _instancing_changed(self, value):
+        if value and self.glyph_mapper is None:
+            gm = tvtk.Glyph3DMapper(use_lookup_table_scalar_range=1)
+            if self.glyph_source is not None:
+                self.configure_source_data(gm, self.glyph_source.outputs[0])
+            self.glyph_mapper = gm
+        if len(self.inputs) > 0:
+            self._update_glyph_mapper()
+            self._set_outputs()
+
+    def _use_instancing(self):
+        """Returns if the glyphs are rendered by the glyph mapper."""
+        return (self.instancing and self.glyph_type == 'vector'
+                and len(self.inputs) > 0)
+
+    def _set_outputs(self):
+        if not self._use_instancing():
+            tvtk_common.configure_outputs(self, self.glyph)
+        elif self.mask_input_points:
+            tvtk_common.configure_outputs(self, self.mask_points)
+        else:
+            self.outputs = list(self.inputs[0].outputs)
+
+    def _update_glyph_mapper(self):
+        """Sets up the glyph mapper to match the settings of `glyph`."""
+        gm = self.glyph_mapper
+        if gm is None or not self._use_instancing():
+            return
+        g = self.glyph
+        gm.set(scale_factor=g.scale_factor, range=g.range,
+               clamping=g.clamping)
+
+        scale_mode = g.scale_mode
+        if not g.scaling or scale_mode == 'data_scaling_off':
+            gm.scale_mode = 'no_data_scaling'
+        elif scale_mode == 'scale_by_scalar':
+            gm.scale_mode = 'scale_by_magnitude'
+            gm.set_scale_array(_SCALARS)
+        elif scale_mode == 'scale_by_vector':
+            gm.scale_mode = 'scale_by_magnitude'
+            gm.set_scale_array(_VECTORS)
+        else:
+            gm.scale_mode = 'scale_by_vector_components'
+            gm.set_scale_array(_VECTORS)
+
+        if g.vector_mode == 'vector_rotation_off':
+            gm.orient = False
+        else:
+            gm.orient = g.orient
+            if g.vector_mode == 'use_normal':
+                gm.set_orientation_array(_NORMALS)
+            else:
+                gm.set_orientation_array(_VECTORS)
+
+        # Vector coloring maps the vectors of the input points.
+        vectors = None
+        if self.color_mode == 'color_by_vector':
+            dataset = self.inputs[0].get_output_dataset()
+            if dataset is not None:
+                vectors = dataset.point_data.vectors
+        if vectors is not None and vectors.name:
+            gm.scalar_mode = 'use_point_field_data'
+            gm.select_color_array(vectors.name)
+        else:
+            gm.scalar_mode = 'default'
 
     def _glyph_type_changed(self, value):
         if self.glyph_type == 'vector':
@@ -282,8 +445,114 @@ class Glyph(Component):
         else:
             self.glyph = tvtk.TensorGlyph(scale_factor=0.1)
             self.show_scale_mode = False
+        self.glyph.on_trait_change(self._update_glyph_mapper)
         self.glyph.on_trait_change(self.render)
 
+    def _lod_changed(self, value):
+        self._observe_renderer(value)
+        if not value:
+            self._set_lod_active(False)
+
+    def _lod_points_changed(self, value):
+        self._lod_budget = value
+
+    def _observe_renderer(self, observe):
+        """Adds or removes the observers of the renderer used to switch
+        the glyphed points.  We use the messenger to avoid an
+        uncollectable reference cycle."""
+        ren = self._lod_renderer
+        if ren is not None:
+            for id in self._lod_observer_ids:
+                ren.remove_observer(id)
+            ren_vtk = tvtk.to_vtk(ren)
+            messenger.disconnect(ren_vtk, 'StartEvent',
+                                 self._on_render_start)
+            messenger.disconnect(ren_vtk, 'EndEvent', self._on_render_end)
+            self._lod_observer_ids = []
+            self._lod_renderer = None
+        ren = getattr(self.scene, 'renderer', None)
+        if not observe or ren is None:
+            return
+        self._lod_observer_ids = [ren.add_observer(event, messenger.send)
+                                  for event in ('StartEvent', 'EndEvent')]
+        ren_vtk = tvtk.to_vtk(ren)
+        messenger.connect(ren_vtk, 'StartEvent', self._on_render_start)
+        messenger.connect(ren_vtk, 'EndEvent', self._on_render_end)
+        self._lod_renderer = ren
+
+    def _on_render_start(self, ren_vtk, event):
+        """Glyphs the subsampled points when the render window is asked
+        for the interactive update rate and all of them otherwise.
+        """
+        self._render_start = time.time()
+        rw = ren_vtk.GetRenderWindow()
+        iren = rw.GetInteractor() if rw is not None else None
+        self._set_lod_active(iren is not None and
+                             rw.GetDesiredUpdateRate() >
+                             iren.GetStillUpdateRate())
+
+    def _on_render_end(self, ren_vtk, event):
+        """Adapts the point budget so that the interactive frames are
+        rendered at the desired update rate."""
+        if not self._lod_active:
+            return
+        t = time.time() - self._render_start
+        rate = ren_vtk.GetRenderWindow().GetDesiredUpdateRate()
+        if t <= 0.0 or rate <= 0.0:
+            return
+        # The frame time is roughly proportional to the number of
+        # glyphs; adapt smoothly to avoid oscillations.
+        scale = min(max(1.0/(rate*t), 0.5), 2.0)
+        budget = int(self._lod_budget*scale)
+        self._lod_budget = min(max(budget, 1), self.lod_points)
+
+    def _set_lod_active(self, active):
+        """Connects the glyphs to the subsampled or the full points."""
+        if len(self.inputs) == 0:
+            return
+        if active:
+            # Use the points of the last update to avoid updating the
+            # upstream pipeline here.
+            dataset = self._get_points_dataset()
+            n_points = dataset.number_of_points if dataset else 0
+            if self._lod_budget == 0:
+                self._lod_budget = self.lod_points
+            budget = self._lod_budget
+            active = n_points > budget
+        if not active and not self._lod_active:
+            return
+        if self.mask_input_points:
+            points = self.mask_points
+        else:
+            points = self.inputs[0]
+        if self._use_instancing():
+            target = self.glyph_mapper
+        else:
+            target = self.glyph
+        self._updating = True
+        try:
+            if active:
+                mask = self._lod_mask
+                # A fixed stride keeps the same points from frame to
+                # frame.
+                mask.set(on_ratio=(n_points + budget - 1)//budget,
+                         maximum_number_of_points=budget)
+                self.configure_connection(mask, points)
+                self.configure_connection(target, mask)
+            else:
+                self.configure_connection(target, points)
+        finally:
+            self._updating = False
+        self._lod_active = active
+
+    def _get_points_dataset(self):
+        """Returns the last computed dataset of the points to glyph."""
+        if self.mask_input_points:
+            return self.mask_points.output
+        return self.inputs[0].get_output_dataset()
+
     def _scene_changed(self, old, new):
+        self._observe_renderer(False)
         super(Glyph, self)._scene_changed(old, new)
         self.glyph_source.scene = new
+        self._observe_renderer(self.lod)
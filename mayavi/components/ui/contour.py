@@ -17,6 +17,8 @@ from traitsui.api import Item, Group, View
 view = View(Group(Item(name='filled_contours',
                        defined_when='show_filled_contours'),
                   Item(name='auto_contours'),
+                  Item(name='parallel',
+                       visible_when='not filled_contours'),
 
                   # One group or the other, but not both.
                   Group(
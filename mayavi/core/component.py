@@ -77,7 +77,7 @@ class Component(PipelineBase):
         # Invoke render to update any changes.
         self.render()
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # `Base` interface
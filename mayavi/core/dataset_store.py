@@ -0,0 +1,555 @@
+"""Binary storage for the datasets of a saved visualization.
+
+The pickled state of a `VTKDataSource` normally embeds its dataset as
+gzipped legacy VTK text.  This is slow and memory hungry for large
+datasets.  A dataset store is a separate binary file holding the raw
+buffers of the arrays of the datasets.  The arrays are streamed to
+the file one after the other, optionally compressed in chunks, and
+are read back by memory mapping the file when they are not
+compressed.  The pickled state only keeps a small description of the
+dataset which refers to the arrays in the store.  String arrays are
+kept in the description itself.  Datasets with other kinds of arrays
+(e.g. a vtkVariantArray) are not stored and are saved as text.
+
+The arrays are keyed on a hash of their contents, so an array is
+stored only once even when it is used by several datasets, for
+instance when sources in different scenes share a dataset.  Likewise,
+the datasets loaded from identical descriptions are shared.
+
+The layout of the file is the following:
+
+ - an 8 byte magic string,
+ - the array buffers, each aligned to 64 bytes,
+ - a JSON index giving the dtype, shape, offset and the compressed
+   chunk sizes (if any) of each array,
+ - the offset of the index as a little endian 64 bit integer followed
+   by the magic string again.
+
+The stores used while saving and loading a visualization are setup
+with the `saving` and `loading` context managers.
+
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from contextlib import contextmanager
+from os.path import basename, join
+
+import numpy
+import vtk
+from vtk.util import numpy_support
+
+from tvtk import array_handler
+
+
+# The magic string at the start and end of the store.
+MAGIC = b'MVDSTORE'
+
+# The version of the store format.
+VERSION = 1
+
+# The alignment of the arrays in the file.
+ALIGNMENT = 64
+
+# The size of the chunks of compressed arrays.
+CHUNK_SIZE = 4*1024*1024
+
+# The dataset classes which can be stored.
+_dataset_classes = ('vtkImageData', 'vtkStructuredPoints',
+                    'vtkRectilinearGrid', 'vtkStructuredGrid',
+                    'vtkPolyData', 'vtkUnstructuredGrid')
+
+# The active writer and the directory of the stores being loaded.
+_writer = None
+_load_dir = None
+
+# The readers and datasets already loaded, only used within `loading`.
+_loaded = None
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def get_store_name(file_name):
+    """Returns the name of the dataset store saved along with the
+    visualization in `file_name`."""
+    return file_name + '.data'
+
+
+@contextmanager
+def saving(file_name, compress=False):
+    """Context manager writing the datasets of the `VTKDataSource`
+    objects persisted within the block to the store `file_name`.
+    If `compress` is True the arrays are compressed.  If the block
+    raises, an existing store is left untouched.
+    """
+    global _writer
+    writer = DatasetStoreWriter(file_name, compress=compress)
+    old, _writer = _writer, writer
+    try:
+        yield writer
+    except:
+        _writer = old
+        writer.discard()
+        raise
+    _writer = old
+    writer.close()
+
+
+@contextmanager
+def loading(directory):
+    """Context manager setting the directory where the stores refered
+    to by the states loaded within the block are found.  Within the
+    block, the datasets loaded from the same description are shared.
+    """
+    global _load_dir, _loaded
+    old = _load_dir, _loaded
+    _load_dir, _loaded = directory, {}
+    try:
+        yield
+    finally:
+        _load_dir, _loaded = old
+
+
+def get_writer():
+    """Returns the active `DatasetStoreWriter` or None."""
+    return _writer
+
+
+def dump_dataset(data):
+    """Writes the dataset to the active store and returns a JSON string
+    describing it.  Returns None if there is no active store or if
+    the dataset type is not supported.
+    """
+    if _writer is None:
+        return None
+    meta = _writer.add_dataset(data)
+    if meta is None:
+        return None
+    meta['store'] = basename(_writer.file_name)
+    return json.dumps(meta, sort_keys=True)
+
+
+def is_dataset_reference(state):
+    """Returns True if the given persisted data is a description
+    returned by `dump_dataset` rather than a gzipped VTK file."""
+    if isinstance(state, bytes):
+        return state[:1] == b'{'
+    return state[:1] == '{'
+
+
+def load_dataset(state, mmap=True):
+    """Returns the VTK dataset described by the string returned by
+    `dump_dataset`."""
+    if isinstance(state, bytes):
+        state = state.decode('utf-8')
+    cache = {} if _loaded is None else _loaded
+    if state in cache:
+        return cache[state]
+    meta = json.loads(state)
+    fname = meta['store']
+    if _load_dir is not None:
+        fname = join(_load_dir, fname)
+    reader = cache.get(fname)
+    if reader is None:
+        reader = cache[fname] = DatasetStoreReader(fname, mmap=mmap)
+    data = cache[state] = reader.get_dataset(meta)
+    return data
+
+
+def _hash_array(arr):
+    """Returns a hash of the dtype, shape and contents of the given
+    contiguous array."""
+    h = hashlib.sha1()
+    h.update(('%s%s'%(arr.dtype.str, arr.shape)).encode('ascii'))
+    data = memoryview(arr.reshape(-1).view(numpy.uint8))
+    for start in range(0, arr.nbytes, CHUNK_SIZE):
+        h.update(data[start:start + CHUNK_SIZE])
+    return h.hexdigest()
+
+
+def _replace_file(src, dst):
+    """Renames `src` to `dst`, replacing `dst` if it exists.  Any
+    memory map of the old `dst` keeps its data on POSIX systems."""
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # Windows does not rename over an existing file.
+        os.remove(dst)
+        os.rename(src, dst)
+
+
+def _get_cell_types(data):
+    """Returns the array of cell types of an unstructured grid."""
+    version = (vtk.vtkVersion.GetVTKMajorVersion(),
+               vtk.vtkVersion.GetVTKMinorVersion())
+    if version >= (9, 6):
+        return data.GetCellTypes()
+    return data.GetCellTypesArray()
+
+
+######################################################################
+# `DatasetStoreWriter` class.
+######################################################################
+class DatasetStoreWriter(object):
+
+    """Writes arrays and datasets to a dataset store.  The data is
+    streamed to a temporary file as it is added, which replaces
+    `file_name` once `close` is called.  This way an existing store,
+    whose arrays may still be memory mapped, is never truncated while
+    it is read.  Arrays whose contents were already written are not
+    written again.
+    """
+
+    def __init__(self, file_name, compress=False, chunk_size=CHUNK_SIZE):
+        self.file_name = file_name
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self._arrays = {}
+        # The number of bytes written and of those not written again.
+        self.nbytes_written = 0
+        self.nbytes_shared = 0
+        # The datasets already written keyed on their address and
+        # modification time.
+        self._datasets = {}
+        self._tmp_name = file_name + '.tmp'
+        self._fp = open(self._tmp_name, 'wb')
+        self._fp.write(MAGIC)
+
+    def add_array(self, arr):
+        """Writes the numpy array `arr` unless an identical array was
+        already written and returns its key."""
+        arr = numpy.ascontiguousarray(arr)
+        key = _hash_array(arr)
+        if key in self._arrays:
+            self.nbytes_shared += arr.nbytes
+        else:
+            self._write_array(key, arr)
+            self.nbytes_written += arr.nbytes
+        return key
+
+    def add_dataset(self, data):
+        """Writes the arrays of the given TVTK or VTK dataset and
+        returns a dictionary describing the dataset.  Returns None if
+        the type of dataset is not supported.  A dataset is only
+        written once even if it is added several times.
+        """
+        data = array_handler.deref_vtk(data)
+        cls = data.GetClassName()
+        if cls not in _dataset_classes:
+            return None
+        key = (data.GetAddressAsString('vtkObject'), data.GetMTime())
+        if key in self._datasets:
+            return dict(self._datasets[key])
+        fields = (data.GetPointData(), data.GetCellData(), data.GetFieldData())
+        if not all(self._can_store_attributes(f) for f in fields):
+            return None
+        meta = {'class': cls}
+        if cls in ('vtkImageData', 'vtkStructuredPoints'):
+            meta['extent'] = list(data.GetExtent())
+            meta['origin'] = list(data.GetOrigin())
+            meta['spacing'] = list(data.GetSpacing())
+        elif cls == 'vtkRectilinearGrid':
+            meta['extent'] = list(data.GetExtent())
+            meta['coordinates'] = [
+                self._add_vtk_array(c) for c in (data.GetXCoordinates(),
+                                                 data.GetYCoordinates(),
+                                                 data.GetZCoordinates())
+            ]
+        elif cls == 'vtkStructuredGrid':
+            meta['extent'] = list(data.GetExtent())
+        elif cls == 'vtkPolyData':
+            for name in ('verts', 'lines', 'polys', 'strips'):
+                cells = getattr(data, 'Get' + name.capitalize())()
+                meta[name] = self._add_cells(cells)
+        elif cls == 'vtkUnstructuredGrid':
+            types = _get_cell_types(data)
+            if types is not None and numpy.any(
+                    numpy_support.vtk_to_numpy(types) == vtk.VTK_POLYHEDRON):
+                # Polyhedral cells are not supported.
+                return None
+            meta['types'] = self._add_vtk_array(types)
+            meta['cells'] = self._add_cells(data.GetCells())
+
+        if cls in ('vtkStructuredGrid', 'vtkPolyData',
+                   'vtkUnstructuredGrid'):
+            points = data.GetPoints()
+            if points is None:
+                meta['points'] = None
+            else:
+                meta['points'] = self._add_vtk_array(points.GetData())
+
+        meta['point_data'] = self._add_attributes(data.GetPointData())
+        meta['cell_data'] = self._add_attributes(data.GetCellData())
+        meta['field_data'] = self._add_attributes(data.GetFieldData())
+        self._datasets[key] = meta
+        return dict(meta)
+
+    def close(self):
+        """Writes the index, closes the file and moves it to
+        `file_name`."""
+        fp = self._fp
+        if fp is None:
+            return
+        offset = fp.tell()
+        index = {'version': VERSION, 'arrays': self._arrays}
+        fp.write(json.dumps(index).encode('utf-8'))
+        fp.write(struct.pack('<Q', offset))
+        fp.write(MAGIC)
+        fp.close()
+        self._fp = None
+        _replace_file(self._tmp_name, self.file_name)
+
+    def discard(self):
+        """Closes and removes the file without touching `file_name`."""
+        fp = self._fp
+        if fp is None:
+            return
+        fp.close()
+        self._fp = None
+        os.remove(self._tmp_name)
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _write_array(self, key, arr):
+        arr = numpy.ascontiguousarray(arr)
+        fp = self._fp
+        pos = fp.tell()
+        offset = (pos + ALIGNMENT - 1)//ALIGNMENT*ALIGNMENT
+        fp.write(b'\0'*(offset - pos))
+
+        data = memoryview(arr.reshape(-1).view(numpy.uint8))
+        chunks = [] if self.compress else None
+        step = self.chunk_size
+        for start in range(0, arr.nbytes, step):
+            block = data[start:start + step]
+            if chunks is not None:
+                block = zlib.compress(block.tobytes())
+                chunks.append(len(block))
+            fp.write(block)
+        self._arrays[key] = {'dtype': arr.dtype.str,
+                             'shape': list(arr.shape),
+                             'offset': offset,
+                             'chunks': chunks}
+
+    def _add_vtk_array(self, vtk_arr):
+        """Writes a VTK data array and returns a dictionary describing
+        it."""
+        arr = numpy_support.vtk_to_numpy(vtk_arr)
+        return {'array': self.add_array(arr),
+                'type': vtk_arr.GetDataType(),
+                'components': vtk_arr.GetNumberOfComponents(),
+                'name': vtk_arr.GetName()}
+
+    def _add_cells(self, cells):
+        if cells is None:
+            return None
+        if hasattr(cells, 'GetOffsetsArray'):
+            return {'offsets': self._add_vtk_array(cells.GetOffsetsArray()),
+                    'connectivity':
+                        self._add_vtk_array(cells.GetConnectivityArray())}
+        return {'n_cells': cells.GetNumberOfCells(),
+                'legacy': self._add_vtk_array(cells.GetData())}
+
+    def _add_string_array(self, vtk_arr):
+        """Returns a dictionary describing a vtkStringArray, the
+        strings are kept in the description itself."""
+        return {'strings': [vtk_arr.GetValue(i)
+                            for i in range(vtk_arr.GetNumberOfValues())],
+                'components': vtk_arr.GetNumberOfComponents(),
+                'name': vtk_arr.GetName()}
+
+    def _can_store_attributes(self, field_data):
+        """Returns True if all the arrays of a vtkFieldData can be
+        stored faithfully."""
+        for i in range(field_data.GetNumberOfArrays()):
+            arr = field_data.GetAbstractArray(i)
+            if arr is None or not (arr.IsA('vtkDataArray') or
+                                   arr.IsA('vtkStringArray')):
+                return False
+        return True
+
+    def _add_attributes(self, field_data):
+        """Writes the arrays of a vtkFieldData and returns a list
+        describing them along with the attribute they are active as.
+        """
+        result = []
+        is_attribute = getattr(field_data, 'IsArrayAnAttribute', None)
+        for i in range(field_data.GetNumberOfArrays()):
+            arr = field_data.GetAbstractArray(i)
+            if arr.IsA('vtkStringArray'):
+                result.append(self._add_string_array(arr))
+                continue
+            entry = self._add_vtk_array(arr)
+            if is_attribute is not None:
+                entry['attribute'] = is_attribute(i)
+            result.append(entry)
+        return result
+
+
+######################################################################
+# `DatasetStoreReader` class.
+######################################################################
+class DatasetStoreReader(object):
+
+    """Reads the arrays and datasets of a dataset store.  When `mmap`
+    is True, the uncompressed arrays are memory mapped rather than
+    read.
+    """
+
+    def __init__(self, file_name, mmap=True):
+        self.file_name = file_name
+        self.mmap = mmap
+        with open(file_name, 'rb') as fp:
+            fp.seek(0, 2)
+            size = fp.tell()
+            fp.seek(size - 16)
+            tail = fp.read(16)
+            if size < 24 or tail[8:] != MAGIC:
+                raise IOError('%s is not a dataset store.'%file_name)
+            offset = struct.unpack('<Q', tail[:8])[0]
+            fp.seek(offset)
+            index = json.loads(fp.read(size - 16 - offset).decode('utf-8'))
+        self._arrays = index['arrays']
+
+    def get_array(self, key):
+        """Returns the numpy array with the given key."""
+        info = self._arrays[key]
+        dtype = numpy.dtype(info['dtype'])
+        shape = tuple(info['shape'])
+        chunks = info['chunks']
+        size = int(numpy.prod(shape))*dtype.itemsize
+        if self.mmap and chunks is None and size > 0:
+            # Copy on write so VTK may use the buffer directly.
+            return numpy.memmap(self.file_name, dtype=dtype, mode='c',
+                                offset=info['offset'], shape=shape)
+
+        result = numpy.empty(shape, dtype)
+        buf = result.reshape(-1).view(numpy.uint8)
+        with open(self.file_name, 'rb') as fp:
+            fp.seek(info['offset'])
+            if chunks is None:
+                fp.readinto(memoryview(buf))
+            else:
+                pos = 0
+                for n in chunks:
+                    block = zlib.decompress(fp.read(n))
+                    buf[pos:pos + len(block)] = numpy.frombuffer(block,
+                                                                 numpy.uint8)
+                    pos += len(block)
+        return result
+
+    def get_dataset(self, meta):
+        """Returns the VTK dataset described by the dictionary returned
+        by `DatasetStoreWriter.add_dataset`."""
+        cls = meta['class']
+        data = getattr(vtk, cls)()
+        if cls in ('vtkImageData', 'vtkStructuredPoints'):
+            data.SetExtent(meta['extent'])
+            data.SetOrigin(meta['origin'])
+            data.SetSpacing(meta['spacing'])
+        elif cls == 'vtkRectilinearGrid':
+            data.SetExtent(meta['extent'])
+            x, y, z = [self._get_vtk_array(c) for c in meta['coordinates']]
+            data.SetXCoordinates(x)
+            data.SetYCoordinates(y)
+            data.SetZCoordinates(z)
+        elif cls == 'vtkStructuredGrid':
+            data.SetExtent(meta['extent'])
+
+        if meta.get('points') is not None:
+            points = vtk.vtkPoints()
+            points.SetData(self._get_vtk_array(meta['points']))
+            data.SetPoints(points)
+
+        if cls == 'vtkPolyData':
+            for name in ('verts', 'lines', 'polys', 'strips'):
+                cells = self._get_cells(meta[name])
+                if cells is not None:
+                    getattr(data, 'Set' + name.capitalize())(cells)
+        elif cls == 'vtkUnstructuredGrid':
+            types = self._get_vtk_array(meta['types'])
+            cells = self._get_cells(meta['cells'])
+            if cells is not None:
+                if hasattr(cells, 'GetOffsetsArray'):
+                    data.SetCells(types, cells)
+                else:
+                    locations = self._get_cell_locations(cells)
+                    data.SetCells(types, locations, cells)
+
+        self._set_attributes(data.GetPointData(), meta['point_data'])
+        self._set_attributes(data.GetCellData(), meta['cell_data'])
+        self._set_attributes(data.GetFieldData(), meta['field_data'])
+        return data
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _get_vtk_array(self, info):
+        arr = self.get_array(info['array'])
+        n_comp = info['components']
+        if n_comp > 1:
+            arr = arr.reshape(-1, n_comp)
+        typ = info['type']
+        if typ in array_handler.get_vtk_to_numeric_typemap():
+            result = array_handler.array2vtk(
+                arr, array_handler.create_vtk_array(typ)
+            )
+        else:
+            # Types like VTK_LONG_LONG which tvtk does not map to a
+            # numpy type, the array keeps a reference to `arr`.
+            result = numpy_support.numpy_to_vtk(arr, array_type=typ)
+        if info['name'] is not None:
+            result.SetName(info['name'])
+        return result
+
+    def _get_cells(self, info):
+        if info is None:
+            return None
+        if 'legacy' in info:
+            cells = vtk.vtkCellArray()
+            data = self._get_vtk_array(info['legacy'])
+            cells.SetCells(info['n_cells'], data)
+            return cells
+        offsets = self.get_array(info['offsets']['array'])
+        conn = self.get_array(info['connectivity']['array'])
+        return array_handler.offsets2vtkCellArray(offsets, conn)
+
+    def _get_cell_locations(self, cells):
+        """Returns the locations of the cells of a legacy (VTK < 9)
+        cell array."""
+        data = numpy_support.vtk_to_numpy(cells.GetData())
+        n_cells = cells.GetNumberOfCells()
+        locations = numpy.empty(n_cells, array_handler.ID_TYPE_CODE)
+        pos = 0
+        for i in range(n_cells):
+            locations[i] = pos
+            pos += data[pos] + 1
+        return array_handler.array2vtk(locations, vtk.vtkIdTypeArray())
+
+    def _get_string_array(self, info):
+        result = vtk.vtkStringArray()
+        result.SetNumberOfComponents(info['components'])
+        strings = info['strings']
+        result.SetNumberOfValues(len(strings))
+        for i, value in enumerate(strings):
+            result.SetValue(i, value)
+        if info['name'] is not None:
+            result.SetName(info['name'])
+        return result
+
+    def _set_attributes(self, field_data, arrays):
+        for info in arrays:
+            if 'strings' in info:
+                field_data.AddArray(self._get_string_array(info))
+                continue
+            idx = field_data.AddArray(self._get_vtk_array(info))
+            attribute = info.get('attribute', -1)
+            if attribute >= 0:
+                field_data.SetActiveAttribute(idx, attribute)
@@ -7,6 +7,8 @@ highest level.
 # License: BSD Style.
 
 # Standard library imports.
+from os.path import abspath, dirname
+
 # VTK is used to just shut off the warnings temporarily.
 try:
     import vtk
@@ -28,6 +30,7 @@ from tvtk.common import is_old_pipeline
 from mayavi.core.base import Base
 from mayavi.core.scene import Scene
 from mayavi.core.common import error, process_ui_events
+from mayavi.core import dataset_store
 from mayavi.core.registry import registry
 from mayavi.core.adder_node import AdderNode, SceneAdderNode
 from mayavi.preferences.api import preference_manager
@@ -52,6 +55,13 @@ def get_args(function):
     """
     return function.__code__.co_varnames[:function.__code__.co_argcount]
 
+def _get_file_name(file_or_fname):
+    """Returns the name of the given file or file name, or None if the
+    file object has no name."""
+    if isinstance(file_or_fname, str):
+        return file_or_fname
+    return getattr(file_or_fname, 'name', None)
+
 ######################################################################
 # `Engine` class
 ######################################################################
@@ -246,59 +256,37 @@ class Engine(HasStrictTraits):
         self.add_filter(mod, obj=obj)
 
     @recordable
-    def save_visualization(self, file_or_fname):
+    def save_visualization(self, file_or_fname, binary=False,
+                           compress=False):
         """Given a file or a file name, this saves the current
         visualization to the file.
+
+        If `binary` is True, the datasets of the `VTKDataSource`
+        objects are written as raw binary arrays to a separate dataset
+        store next to the file (see `mayavi.core.dataset_store`), which
+        is much faster for large datasets.  The arrays are compressed
+        if `compress` is True.  Arrays and datasets shared by several
+        sources or scenes are only stored once.  This requires the
+        file to have a name, a `ValueError` is raised otherwise.
         """
-        # Save the state of VTK's global warning display.
-        o = vtk.vtkObject
-        w = o.GetGlobalWarningDisplay()
-        o.SetGlobalWarningDisplay(0) # Turn it off.
-        try:
-            #FIXME: This is for streamline seed point widget position which
-            #does not get serialized correctly
-            if is_old_pipeline():
-                state_pickler.dump(self, file_or_fname)
-            else:
-                state = state_pickler.get_state(self)
-                st = state.scenes[0].children[0].children[0].children[4]
-                l_pos = st.seed.widget.position
-                st.seed.widget.position = [pos.item() for pos in l_pos]
-                saved_state = state_pickler.dumps(state)
-                file_or_fname.write(saved_state)
-        except (IndexError, AttributeError):
-            state_pickler.dump(self, file_or_fname)
-        finally:
-            # Reset the warning state.
-            o.SetGlobalWarningDisplay(w)
+        fname = _get_file_name(file_or_fname)
+        if binary and fname is None:
+            raise ValueError('Saving with binary=True needs a file name '
+                             'or a file object with a name.')
+        if binary:
+            store = dataset_store.get_store_name(fname)
+            with dataset_store.saving(store, compress=compress):
+                self._save_state(file_or_fname)
+        else:
+            self._save_state(file_or_fname)
 
     @recordable
     def load_visualization(self, file_or_fname):
         """Given a file/file name this loads the visualization."""
-        # Save the state of VTK's global warning display.
-        o = vtk.vtkObject
-        w = o.GetGlobalWarningDisplay()
-        o.SetGlobalWarningDisplay(0) # Turn it off.
-        try:
-            # Get the state from the file.
-            state = state_pickler.load_state(file_or_fname)
-            state_pickler.update_state(state)
-            # Add the new scenes.
-            for scene_state in state.scenes:
-                self.new_scene()
-                scene = self.scenes[-1]
-                # Disable rendering initially.
-                if scene.scene is not None:
-                    scene.scene.disable_render = True
-                # Update the state.
-                state_pickler.update_state(scene_state)
-                scene.__set_pure_state__(scene_state)
-                # Setting the state will automatically reset the
-                # disable_render.
-                scene.render()
-        finally:
-            # Reset the warning state.
-            o.SetGlobalWarningDisplay(w)
+        fname = _get_file_name(file_or_fname)
+        directory = None if fname is None else dirname(abspath(fname))
+        with dataset_store.loading(directory):
+            self._load_state(file_or_fname)
 
     @recordable
     def open(self, filename, scene=None):
@@ -507,6 +495,55 @@ class Engine(HasStrictTraits):
     ######################################################################
     # Non-public interface
     ######################################################################
+    def _save_state(self, file_or_fname):
+        # Save the state of VTK's global warning display.
+        o = vtk.vtkObject
+        w = o.GetGlobalWarningDisplay()
+        o.SetGlobalWarningDisplay(0) # Turn it off.
+        try:
+            #FIXME: This is for streamline seed point widget position which
+            #does not get serialized correctly
+            if is_old_pipeline():
+                state_pickler.dump(self, file_or_fname)
+            else:
+                state = state_pickler.get_state(self)
+                st = state.scenes[0].children[0].children[0].children[4]
+                l_pos = st.seed.widget.position
+                st.seed.widget.position = [pos.item() for pos in l_pos]
+                saved_state = state_pickler.dumps(state)
+                file_or_fname.write(saved_state)
+        except (IndexError, AttributeError):
+            state_pickler.dump(self, file_or_fname)
+        finally:
+            # Reset the warning state.
+            o.SetGlobalWarningDisplay(w)
+
+    def _load_state(self, file_or_fname):
+        # Save the state of VTK's global warning display.
+        o = vtk.vtkObject
+        w = o.GetGlobalWarningDisplay()
+        o.SetGlobalWarningDisplay(0) # Turn it off.
+        try:
+            # Get the state from the file.
+            state = state_pickler.load_state(file_or_fname)
+            state_pickler.update_state(state)
+            # Add the new scenes.
+            for scene_state in state.scenes:
+                self.new_scene()
+                scene = self.scenes[-1]
+                # Disable rendering initially.
+                if scene.scene is not None:
+                    scene.scene.disable_render = True
+                # Update the state.
+                state_pickler.update_state(scene_state)
+                scene.__set_pure_state__(scene_state)
+                # Setting the state will automatically reset the
+                # disable_render.
+                scene.render()
+        finally:
+            # Reset the warning state.
+            o.SetGlobalWarningDisplay(w)
+
     def _on_select(self, object):
         """Called by the EngineTree when an object on the view is
         selected.  This basically sets the current object and current
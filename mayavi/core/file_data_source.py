@@ -7,16 +7,21 @@ sources derive.
 # License: BSD Style.
 
 # Standard library imports.
+import json
 import re
-from os.path import split, join, isfile
-from glob import glob
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+from os import curdir, listdir, stat
+from os.path import split, splitext, join, isfile
+from xml.etree import ElementTree
 
 # Enthought library imports.
-from traits.api import (Any, Bool, Button, Float, List, Str, Instance, Int,
-                        Range)
+from traits.api import (Any, Bool, Button, Dict, Float, List, Str, Instance,
+                        Int, Range)
 from traitsui.api import Group, HGroup, Item, FileEditor, RangeEditor
 from apptools.persistence.state_pickler import set_state
 from apptools.persistence.file_path import FilePath
+from tvtk.api import tvtk
 
 # Local imports
 from mayavi.core.source import Source
@@ -26,6 +31,14 @@ from mayavi.core.common import handle_children_state
 ######################################################################
 # Utility functions.
 ######################################################################
+# Matches the name of a file in a time series: the head, the index
+# and the tail of the name.
+_series_re = re.compile(r'^(.*[^0-9])?([0-9]+)([^0-9]*)$')
+
+# Maps a directory to a (mtime, series) tuple, see `_get_series_index`.
+_series_cache = {}
+
+
 def get_file_list(file_name):
     """ Given a file name, this function treats the file as a part of
     a series of files based on the index of the file and tries to
@@ -33,49 +46,117 @@ def get_file_list(file_name):
     file in a time series must be of the form 'some_name[0-9]*.ext'.
     That is the integers at the end of the file determine what part of
     the time series the file belongs to.  The files are then sorted as
-    per this index."""
+    per this index, which may or may not be zero padded.
+
+    The file may also be a series descriptor listing the files
+    explicitly: either a ParaView data file ('.pvd') or a ParaView
+    file series ('.series') file.
+
+    The files found in a directory are cached until the directory is
+    modified, so looking up several series in the same directory only
+    lists it once."""
+
+    ext = splitext(file_name)[1].lower()
+    if ext == '.pvd':
+        return _read_pvd_file(file_name)
+    elif ext == '.series':
+        return _read_series_file(file_name)
 
     # The matching is done only for the basename of the file.
     f_dir, f_base = split(file_name)
-    # Find the head and tail of the file pattern.
-    head = re.sub("[0-9]+[^0-9]*$", "", f_base)
-    tail = re.sub("^.*[0-9]+", "", f_base)
-    pattern = head+"[0-9]*"+tail
-    # Glob the files for the pattern.
-    _files = glob(join(f_dir, pattern))
-
-    # A simple function to get the index from the file.
-    def _get_index(f, head=head, tail=tail):
-        base = split(f)[1]
-        result = base.replace(head, '')
-        return float(result.replace(tail, ''))
-
-    # Before sorting make sure the files in the globbed series are
-    # really part of a timeseries.  This can happen in cases like so:
-    # 5_2_1.vtk and 5_2_1s.vtk will be globbed but 5_2_1s.vtk is
-    # obviously not a valid time series file.
-    files = []
-    for x in _files:
-        try:
-            _get_index(x)
-        except ValueError:
-            pass
-        else:
-            files.append(x)
-
-    # Sort the globbed files based on the index value.
-    def file_sort(x, y):
-        x1 = _get_index(x)
-        y1 = _get_index(y)
-        if x1 > y1:
-            return 1
-        elif y1 > x1:
-            return -1
-        else:
-            return 0
-
-    files.sort(key=lambda x:_get_index(x))
-    return files
+    match = _series_re.match(f_base)
+    if match is None:
+        return []
+    head, index, tail = match.groups()
+    files = _get_series_index(f_dir).get((head or '', tail), [])
+    return [f for i, f in files]
+
+
+def _get_series_index(f_dir):
+    """Returns a dictionary mapping the (head, tail) of the names of the
+    numbered files in the directory `f_dir` to the list of their
+    (index, file name) sorted by index.  The result is cached until
+    the modification time of the directory changes.
+    """
+    path = f_dir or curdir
+    try:
+        mtime = stat(path).st_mtime
+    except OSError:
+        return {}
+    cached = _series_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    series = {}
+    for base in listdir(path):
+        match = _series_re.match(base)
+        if match is not None:
+            head, index, tail = match.groups()
+            series.setdefault((head or '', tail), []).append(
+                (int(index), join(f_dir, base))
+            )
+    for files in series.values():
+        files.sort()
+    _series_cache[path] = (mtime, series)
+    return series
+
+
+def _read_pvd_file(file_name):
+    """Returns the files listed in the given ParaView data file sorted
+    by timestep.  Only the first part of multi-part datasets is used.
+    """
+    f_dir = split(file_name)[0]
+    root = ElementTree.parse(file_name).getroot()
+    entries = []
+    for i, ds in enumerate(root.iter('DataSet')):
+        if ds.get('part', '0') != '0':
+            continue
+        t = float(ds.get('timestep', i))
+        entries.append((t, i, join(f_dir, ds.get('file'))))
+    entries.sort()
+    return [f for t, i, f in entries]
+
+
+def _read_series_file(file_name):
+    """Returns the files listed in the given ParaView file series (JSON)
+    file sorted by time.
+    """
+    f_dir = split(file_name)[0]
+    with open(file_name) as fp:
+        data = json.load(fp)
+    entries = []
+    for i, entry in enumerate(data.get('files', [])):
+        t = float(entry.get('time', i))
+        entries.append((t, i, join(f_dir, entry['name'])))
+    entries.sort()
+    return [f for t, i, f in entries]
+
+
+def _read_file(vtk_reader):
+    """Executes the given VTK reader.  This is run on a worker thread
+    to prefetch timesteps, so the reader must not have any TVTK
+    observers.  Raises an IOError if the reader reports an error."""
+    errors = []
+    obs = vtk_reader.AddObserver('ErrorEvent',
+                                 lambda obj, event: errors.append(event))
+    try:
+        vtk_reader.Update()
+    finally:
+        vtk_reader.RemoveObserver(obs)
+    if len(errors) > 0 or vtk_reader.GetErrorCode() != 0:
+        raise IOError('Reading %s failed.'%vtk_reader.GetFileName())
+
+
+def _get_memory_size(reader):
+    """Returns the size in bytes of the outputs of the given TVTK
+    reader."""
+    obj = tvtk.to_vtk(reader)
+    size = 0
+    for i in range(obj.GetNumberOfOutputPorts()):
+        output = obj.GetOutputDataObject(i)
+        if output is not None:
+            size += output.GetActualMemorySize()
+    return size*1024
 
 
 class NoUITimer(object):
@@ -141,6 +222,14 @@ class FileDataSource(Source):
 
     update_files = Button('Rescan files')
 
+    # The number of timesteps after and before the current one which
+    # are read in the background.  Zero disables the prefetching and
+    # the caching of the timesteps.
+    prefetch = Int(0, desc='the number of timesteps read in advance')
+
+    # The memory budget of the cache of timesteps in megabytes.
+    cache_size = Float(256.0, desc='the memory used to cache timesteps (MB)')
+
     base_file_name=Str('', desc="the base name of the file",
                        enter_set=True, auto_set=False,
                        editor=FileEditor())
@@ -179,13 +268,28 @@ class FileDataSource(Source):
     _max_timestep = Int(0)
     _timer = Any
 
+    # The readers of the cached timesteps keyed on the file name, in
+    # least recently used order.  The values are (reader, nbytes).
+    _cache = Instance(OrderedDict, ())
+
+    # The readers being prefetched keyed on the file name.  The values
+    # are (reader, async_result).
+    _pending = Dict
+
+    # The thread pool reading the prefetched files.
+    _pool = Any
+
+    # The cache statistics.
+    _cache_stats = Dict
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(FileDataSource, self).__get_pure_state__()
         # These are obtained dynamically, so don't pickle them.
-        for x in ['file_list', 'timestep', 'play']:
+        for x in ['file_list', 'timestep', 'play', '_timer', '_cache',
+                  '_pending', '_pool', '_cache_stats']:
             d.pop(x, None)
         return d
 
@@ -215,10 +319,38 @@ class FileDataSource(Source):
         """
         self.base_file_name = base_file_name
 
+    def get_cache_stats(self):
+        """Returns a dictionary with the statistics of the timestep
+        cache: the number of `hits` and `misses` when the timestep
+        changes, the number of files `prefetched`, the number of
+        `evictions` and the number (`n_cached`) and size in bytes
+        (`nbytes`) of the cached timesteps.
+        """
+        stats = dict(hits=0, misses=0, prefetched=0, evictions=0)
+        stats.update(self._cache_stats)
+        stats['n_cached'] = len(self._cache)
+        stats['nbytes'] = sum(n for r, n in self._cache.values())
+        return stats
+
+    def clear_cache(self):
+        """Discards the cached and prefetched timesteps."""
+        self._cache.clear()
+        self._pending.clear()
+
+    ######################################################################
+    # `Base` interface
+    ######################################################################
+    def stop(self):
+        self.clear_cache()
+        self._close_pool()
+        super(FileDataSource, self).stop()
+
     ######################################################################
     # Non-public interface
     ######################################################################
     def _file_list_changed(self, value):
+        # The files may have changed on disk.
+        self.clear_cache()
         # Change the range of the timestep suitably to reflect new list.
         n_files = len(self.file_list)
         timestep = max(min(self.timestep, n_files-1), 0)
@@ -233,8 +365,19 @@ class FileDataSource(Source):
 
     def _timestep_changed(self, value):
         file_list = self.file_list
+        swapped = False
         if len(file_list) > 0:
-            self.file_path = FilePath(file_list[value])
+            fname = file_list[value]
+            if self.prefetch > 0:
+                swapped = self._load_cached(fname)
+            outputs = list(self.outputs)
+            self.file_path = FilePath(fname)
+            if swapped and self.outputs == outputs:
+                # The outputs now come from another reader.  Changing
+                # the outputs already fires pipeline_changed.
+                self.pipeline_changed = True
+            if self.prefetch > 0:
+                self._prefetch_around(value)
         else:
             self.file_path = FilePath('')
         if self.sync_timestep:
@@ -253,6 +396,8 @@ class FileDataSource(Source):
         if value:
             if mm is not None:
                 mm.animation_start()
+            if self.prefetch > 0:
+                self._prefetch_around(self.timestep)
             self._timer = self._make_play_timer()
             if not self._timer.IsRunning():
                 self._timer.Start()
@@ -289,6 +434,145 @@ class FileDataSource(Source):
             self._timer.Stop()
             self._timer.Start(self.play_delay*1000)
 
+    def _prefetch_changed(self, value):
+        if value == 0:
+            self.clear_cache()
+            self._close_pool()
+        elif len(self.file_list) > 0:
+            self._prefetch_around(self.timestep)
+
+    def _cache_size_changed(self):
+        self._trim_cache()
+
+    def _make_reader(self, file_name):
+        """Returns a new reader for `file_name` configured like the
+        current one, without reading the file.  Sources supporting the
+        prefetching of timesteps must override this and have a
+        `reader` trait.  Returns None if prefetching is not supported.
+        """
+        return None
+
+    def _load_cached(self, file_name):
+        """Makes the cached or prefetched reader of `file_name` the
+        current reader, or a new reader if the timestep is not cached
+        so that the current one can be.  Returns True if the reader
+        was changed.
+        """
+        current = getattr(self, 'reader', None)
+        if current is not None and current.file_name == file_name:
+            return False
+        stats = self._cache_stats
+        entry = self._cache.pop(file_name, None)
+        if entry is not None:
+            reader = entry[0]
+        elif file_name in self._pending:
+            reader, result = self._pending.pop(file_name)
+            try:
+                result.get()
+            except Exception:
+                # Read the file again on this thread, which reports
+                # the errors as usual.
+                reader = None
+            else:
+                self._finish_prefetch(reader)
+        else:
+            reader = None
+        if reader is None:
+            stats['misses'] = stats.get('misses', 0) + 1
+            reader = self._make_reader(file_name)
+            if reader is None:
+                return False
+        else:
+            stats['hits'] = stats.get('hits', 0) + 1
+        self._add_to_cache(current)
+        self.reader = reader
+        return True
+
+    def _add_to_cache(self, reader):
+        """Caches an already executed reader."""
+        if reader is None:
+            return
+        fname = reader.file_name
+        if not fname or fname in self._cache:
+            return
+        self._cache[fname] = (reader, _get_memory_size(reader))
+        self._trim_cache()
+
+    def _finish_prefetch(self, reader):
+        """Restores the TVTK observers of a prefetched reader, once
+        its file is read, and updates its traits."""
+        reader.setup_observers()
+        reader.update_traits()
+
+    def _close_pool(self):
+        """Shuts down the threads prefetching the timesteps."""
+        pool = self._pool
+        if pool is not None:
+            self._pool = None
+            pool.close()
+            pool.join()
+
+    def _trim_cache(self):
+        """Evicts the least recently used timesteps until the cache
+        fits in its memory budget."""
+        cache = self._cache
+        budget = self.cache_size*1024*1024
+        nbytes = sum(n for r, n in cache.values())
+        while len(cache) > 0 and nbytes > budget:
+            fname, (reader, n) = cache.popitem(last=False)
+            nbytes -= n
+            self._cache_stats['evictions'] = \
+                self._cache_stats.get('evictions', 0) + 1
+
+    def _prefetch_around(self, index):
+        """Starts reading the files of the timesteps after and before
+        `index` in the background.  When playing, only the following
+        timesteps are read.
+        """
+        # Move the finished reads to the cache.
+        pending = self._pending
+        for fname, (reader, result) in list(pending.items()):
+            if result.ready():
+                del pending[fname]
+                # Failed reads are dropped, the file is read again when
+                # its timestep is shown.
+                if result.successful():
+                    self._finish_prefetch(reader)
+                    self._add_to_cache(reader)
+
+        file_list = self.file_list
+        n_files = len(file_list)
+        steps = range(1, self.prefetch + 1)
+        if self.play:
+            offsets = list(steps)
+        else:
+            offsets = [x for step in steps for x in (step, -step)]
+        current = file_list[index]
+        for offset in offsets:
+            i = index + offset
+            if self.loop:
+                i = i % n_files
+            elif i < 0 or i >= n_files:
+                continue
+            fname = file_list[i]
+            if fname == current or fname in self._cache or \
+                    fname in pending:
+                continue
+            reader = self._make_reader(fname)
+            if reader is None:
+                return
+            if self._pool is None:
+                self._pool = ThreadPool(2)
+            # The TVTK observers of the reader would notify the traits
+            # listeners on the worker thread, so they are removed until
+            # the file is read.
+            reader.teardown_observers()
+            result = self._pool.apply_async(_read_file,
+                                            (tvtk.to_vtk(reader),))
+            pending[fname] = (reader, result)
+            self._cache_stats['prefetched'] = \
+                self._cache_stats.get('prefetched', 0) + 1
+
     def _make_play_timer(self):
         scene = self.scene
         if scene is None or scene.off_screen_rendering:
@@ -309,6 +593,9 @@ class FileDataSource(Source):
         # First get all the siblings before we change the current file list.
         siblings = self._find_sibling_datasets() if self.sync_timestep else []
         fname = self.base_file_name
+        # Rescan the directory, its modification time may not have
+        # changed with the files, for instance on a coarse filesystem.
+        _series_cache.pop(split(fname)[0] or curdir, None)
         file_list = get_file_list(fname)
         if len(file_list) == 0:
             file_list = [fname]
@@ -87,7 +87,7 @@ class Filter(Source):
         # Invoke render to update any changes.
         self.render()
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # `Base` interface
@@ -139,7 +139,7 @@ class Filter(Source):
         if old_outputs == self.outputs:
             # Even if the outputs don't change we want to propagate a
             # data_changed event since the data could have changed.
-            self.data_changed = True
+            self.fire_data_changed()
 
     def _inputs_changed(self, old, new):
         if self.running:
@@ -10,6 +10,8 @@ import sys
 import subprocess
 import warnings
 
+import numpy
+
 # Enthought library imports.
 from traits.api import Instance, Range, Bool, Array, \
      Str, Property, Enum, Button
@@ -46,21 +48,47 @@ except (IOError, ValueError) as exception:
     pylab_luts = {}
 
 
+# The tables of the pylab colormaps, see `get_pylab_lut_table`.
+_pylab_lut_tables = {}
+
+
 #################################################################
 # Utility functions.
 #################################################################
 def set_lut(vtk_lut, lut_lst):
-    """Setup the tvtk.LookupTable (`vtk_lut`) using the passed list of
-    lut values."""
-    n_col = len(lut_lst)
-    vtk_lut.number_of_colors = n_col
-    vtk_lut.build()
-    for i in range(0, n_col):
-        lt = lut_lst[i]
-        vtk_lut.set_table_value(i, lt[0], lt[1], lt[2], lt[3])
-
+    """Setup the tvtk.LookupTable (`vtk_lut`) using the passed list or
+    array of lut values.  The values are RGBA floats between 0 and 1,
+    unless an array of unsigned bytes is passed.  The table of the
+    lookup table is always a copy of the passed values."""
+    table = numpy.array(lut_lst)
+    if table.dtype != numpy.uint8:
+        table = numpy.clip(table*255.0 + 0.5, 0, 255).astype(numpy.uint8)
+    vtk_lut.number_of_colors = len(table)
+    vtk_lut.table = table.reshape(-1, 4)
     return vtk_lut
 
+def get_pylab_lut_table(name, n_colors, reverse=False):
+    """Returns the table of the pylab colormap `name` sampled to about
+    `n_colors` colors, as an (n, 4) array of unsigned bytes.  If the
+    colormap has less colors than `n_colors`, all of them are used.
+
+    The tables are cached per (name, n_colors, reverse), so the
+    returned array is read-only, `set_lut` copies it.
+    """
+    key = (name, n_colors, reverse)
+    table = _pylab_lut_tables.get(key)
+    if table is None:
+        lut = numpy.asarray(pylab_luts[name])
+        if reverse:
+            lut = lut[::-1, :]
+        n_total = len(lut)
+        if n_colors < n_total:
+            lut = lut[::int(round(n_total/float(n_colors)))]
+        table = numpy.clip(lut*255.0 + 0.5, 0, 255).astype(numpy.uint8)
+        table.flags.writeable = False
+        _pylab_lut_tables[key] = table
+    return table
+
 def check_lut_first_line(line, file_name=''):
     """Check the line to see if this is a valid LUT file."""
     first = line.split()
@@ -77,35 +105,33 @@ def check_lut_first_line(line, file_name=''):
     else:
         return n_color
 
-def parse_lut_file(file_name):
-    """Parse the file specified by its name `file_name` for a LUT and
-    return the list of parsed values."""
-
-    input = open(file_name, "r")
-
-    line = input.readline()
-    n_color = check_lut_first_line(line, file_name)
-
-    lut = []
-    for line in input.readlines():
-        entr = line.split()
-        if len(entr) != 4:
-            errmsg="Error: insufficient or too much data in line "\
-                    "-- \"%s\""%(entr)
-            raise IOError(errmsg)
-
-        tmp = []
-        for color in entr:
+def read_lut_file(file_name):
+    """Read the LUT in the file specified by its name `file_name` and
+    return the values as an (n, 4) array."""
+    with open(file_name, "r") as input:
+        line = input.readline()
+        check_lut_first_line(line, file_name)
+        with warnings.catch_warnings():
+            # Do not warn about empty tables.
+            warnings.simplefilter('ignore', UserWarning)
             try:
-                tmp.append(float(color))
-            except:
+                lut = numpy.loadtxt(input, dtype=float, ndmin=2)
+            except ValueError as err:
                 raise IOError(
-                    "Unknown entry '%s'in lookup table input."%color
+                    "Invalid data in lookup table input: %s"%err
                 )
-        lut.append(tmp)
-
+    if lut.size == 0:
+        return numpy.empty((0, 4))
+    if lut.shape[1] != 4:
+        raise IOError("Error: insufficient or too much data in lines "\
+                      "of the lookup table input.")
     return lut
 
+def parse_lut_file(file_name):
+    """Parse the file specified by its name `file_name` for a LUT and
+    return the list of parsed values."""
+    return read_lut_file(file_name).tolist()
+
 
 def lut_mode_list():
     """ Function to generate the list of acceptable lut_mode values.
@@ -290,14 +316,9 @@ class LUTManager(Base):
 
         reverse = self.reverse_lut
         if value in pylab_luts:
-            lut = pylab_luts[value]
-            if reverse:
-                lut = lut[::-1, :]
-            n_total = len(lut)
-            n_color = self.number_of_colors
-            if not n_color >= n_total:
-                lut = lut[::round(n_total/float(n_color))]
-            self.load_lut_from_list(lut.tolist())
+            table = get_pylab_lut_table(value, self.number_of_colors,
+                                        reverse)
+            self.load_lut_from_list(table)
             #self.lut.force_build()
             return
         elif value == 'blue-red':
@@ -351,15 +372,11 @@ class LUTManager(Base):
         elif self.lut_mode in pylab_luts:
             # We can't interpolate these LUTs, as they are defined from a
             # table. We hack around this limitation
-            reverse = self.reverse_lut
-            lut = pylab_luts[self.lut_mode]
-            if reverse:
-                lut = lut[::-1, :]
-            n_total = len(lut)
-            if value > n_total:
+            if value > len(pylab_luts[self.lut_mode]):
                 return
-            lut = lut[::round(n_total/float(value))]
-            self.load_lut_from_list(lut.tolist())
+            table = get_pylab_lut_table(self.lut_mode, value,
+                                        self.reverse_lut)
+            self.load_lut_from_list(table)
         else:
             lut = self.lut
             lut.number_of_table_values = value
@@ -458,14 +475,14 @@ class LUTManager(Base):
             else:
                 f.close()
                 try:
-                    lut_list = parse_lut_file(file_name)
+                    lut_list = read_lut_file(file_name)
                 except IOError as err_msg:
                     msg = "Sorry could not parse LUT file: %s\n"%file_name
-                    msg += err_msg
+                    msg += str(err_msg)
                     error(msg)
                 else:
                     if self.reverse_lut:
-                        lut_list.reverse()
+                        lut_list = lut_list[::-1]
                     self.lut = set_lut(self.lut, lut_list)
                     self.render()
 
@@ -98,7 +98,7 @@ class Module(PipelineBase):
         sends a `data_changed` event.
         """
         # By default, just invoke render and set data_changed.
-        self.data_changed = True
+        self.fire_data_changed()
         self.render()
 
 
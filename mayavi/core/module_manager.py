@@ -6,12 +6,16 @@ tables.
 # Copyright (c) 2005-2008,  Enthought, Inc.
 # License: BSD Style.
 
+from collections import OrderedDict
+
 import numpy
 
 # Enthought library imports.
 from traits.api import List, Instance, Trait, TraitPrefixList, \
                                  HasTraits, Str
 from apptools.persistence.state_pickler import set_state
+from tvtk.api import tvtk
+from tvtk.array_handler import vtk2array
 
 # Local imports
 from mayavi.core.base import Base
@@ -22,6 +26,82 @@ from mayavi.core.common import handle_children_state, exception
 from mayavi.core.pipeline_info import PipelineInfo
 
 
+# The number of values scanned at once when looking for NaNs.
+RANGE_CHUNK_SIZE = 1 << 16
+
+# The maximum number of ranges cached by `get_data_range`.
+RANGE_CACHE_SIZE = 256
+
+# The ranges computed by `get_data_range`.
+_range_cache = OrderedDict()
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def get_data_range(data, vectors=False):
+    """Returns the `(min, max, has_nan)` tuple of the given TVTK data
+    array, ignoring the NaNs.  The range is that of the first component
+    or, if `vectors` is True, that of the magnitude of the vectors,
+    which starts at 0 unless the vectors have NaNs.
+
+    The ranges are keyed by the address and modification time of the
+    arrays, so they are computed once per change of the data and
+    shared by the module managers, filters and modules.
+    """
+    vtk_array = tvtk.to_vtk(data)
+    key = (vtk_array.__this__, vtk_array.GetMTime(), vectors)
+    result = _range_cache.pop(key, None)
+    if result is not None:
+        # Reinsert it to mark it as the most recently used.
+        _range_cache[key] = result
+        return result
+
+    has_nan = _has_nan(vtk_array)
+    if vectors and not has_nan:
+        rng = (0.0, vtk_array.GetMaxNorm())
+    else:
+        rng = vtk_array.GetRange(-1 if vectors else 0)
+    if has_nan and (numpy.isnan(rng[0]) or numpy.isnan(rng[1])):
+        # Older VTK versions do not skip the NaNs.
+        rng = _get_nan_range(vtk_array, vectors)
+    result = (float(rng[0]), float(rng[1]), has_nan)
+    _range_cache[key] = result
+    while len(_range_cache) > RANGE_CACHE_SIZE:
+        _range_cache.popitem(last=False)
+    return result
+
+def _has_nan(vtk_array):
+    """Returns if the VTK array has NaNs, scanning it in chunks."""
+    arr = vtk2array(vtk_array)
+    if arr.dtype.kind != 'f':
+        return False
+    for i in range(0, len(arr), RANGE_CHUNK_SIZE):
+        # The minimum of a chunk is NaN if the chunk has NaNs.
+        if numpy.isnan(arr[i:i + RANGE_CHUNK_SIZE].min()):
+            return True
+    return False
+
+def _get_nan_range(vtk_array, vectors):
+    """Returns the range of the VTK array ignoring the NaNs, computed
+    in chunks."""
+    arr = vtk2array(vtk_array)
+    lo, hi = numpy.inf, -numpy.inf
+    for i in range(0, len(arr), RANGE_CHUNK_SIZE):
+        chunk = arr[i:i + RANGE_CHUNK_SIZE]
+        if vectors:
+            chunk = numpy.sqrt(numpy.einsum('ij,ij->i', chunk, chunk))
+        elif chunk.ndim > 1:
+            chunk = chunk[:, 0]
+        chunk = chunk[~numpy.isnan(chunk)]
+        if len(chunk) > 0:
+            lo = min(lo, chunk.min())
+            hi = max(hi, chunk.max())
+    if lo > hi:
+        return numpy.nan, numpy.nan
+    return lo, hi
+
+
 ######################################################################
 # `DataAttributes` class.
 ######################################################################
@@ -38,11 +118,6 @@ class DataAttributes(HasTraits):
     # The range of the data array.
     range = List
 
-    def _get_np_arr(self, arr):
-        data_array = arr.to_array()
-        data_has_nan = numpy.isnan(data_array).any()
-        return data_array, data_has_nan
-
     def compute_scalar(self, data, mode='point'):
         """Compute the scalar range from given VTK data array.  Mode
         can be 'point' or 'cell'."""
@@ -50,12 +125,7 @@ class DataAttributes(HasTraits):
             if data.name is None or len(data.name) == 0:
                 data.name = mode + '_scalars'
             self.name = data.name
-            data_array, data_has_nan = self._get_np_arr(data)
-            if data_has_nan:
-                self.range = [float(numpy.nanmin(data_array)),
-                              float(numpy.nanmax(data_array))]
-            else:
-                self.range = list(data.range)
+            self.range = list(get_data_range(data)[:2])
 
     def compute_vector(self, data, mode='point'):
         """Compute the vector range from given VTK data array.  Mode
@@ -64,13 +134,7 @@ class DataAttributes(HasTraits):
             if data.name is None or len(data.name) == 0:
                 data.name = mode + '_vectors'
             self.name = data.name
-            data_array, data_has_nan = self._get_np_arr(data)
-            if data_has_nan:
-                d_mag = numpy.sqrt((data_array*data_array).sum(axis=1))
-                self.range = [float(numpy.nanmin(d_mag)),
-                              float(numpy.nanmax(d_mag))]
-            else:
-                self.range = [0.0, data.max_norm]
+            self.range = list(get_data_range(data, vectors=True)[:2])
 
     def config_lut(self, lut_mgr):
         """Set the attributes of the LUTManager."""
@@ -299,6 +363,13 @@ class ModuleManager(Base):
         data_attr = DataAttributes(name='No scalars')
         point_data_attr = DataAttributes(name='No scalars')
         point_data_attr.compute_scalar(ps, 'point')
+        # Streaming sources only hold the extent read last, so they give
+        # the range of their whole array.
+        get_scalar_range = getattr(self.source, 'get_scalar_range', None)
+        if ps is not None and get_scalar_range is not None:
+            rng = get_scalar_range()
+            if rng is not None:
+                point_data_attr.range = list(rng)
         cell_data_attr = DataAttributes(name='No scalars')
         cell_data_attr.compute_scalar(cs, 'cell')
 
@@ -52,7 +52,8 @@ class PipelineBase(Base):
     pipeline_changed = Event(record=False)
 
     # This event is fired when the data alone changes but the pipeline
-    # outputs are the same.
+    # outputs are the same.  Use `fire_data_changed` to fire it so the
+    # scene is rendered once the whole pipeline is updated.
     data_changed = Event(record=False)
 
     ##################################################
@@ -164,6 +165,22 @@ class PipelineBase(Base):
             scene.remove_widgets(self.widgets)
             self._actors_added = False
 
+    def fire_data_changed(self):
+        """Fires the `data_changed` event with the renders of the scene
+        held.  The renders requested by the objects updated while the
+        event propagates are coalesced into a single render, done once
+        the whole downstream pipeline is updated.
+        """
+        s = self.scene
+        if s is None:
+            self.data_changed = True
+            return
+        s.hold_renders()
+        try:
+            self.data_changed = True
+        finally:
+            s.release_renders()
+
     def has_output_port(self):
         """ We assume the old pipeline topology.
         As such we assume no output_port exists."""
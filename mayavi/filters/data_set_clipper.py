@@ -129,7 +129,7 @@ class DataSetClipper(Filter):
 
         self.filter.update()
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # Non-public methods.
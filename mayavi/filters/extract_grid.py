@@ -184,7 +184,7 @@ class ExtractGrid(FilterBase):
         fil.update_whole_extent()
         fil.update()
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # Non-public methods.
@@ -253,14 +253,14 @@ class ExtractGrid(FilterBase):
                  self.z_min, self.z_max)
         f.update_whole_extent()
         f.update()
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _update_sample_rate(self):
         f = self.filter
         f.sample_rate = (self.x_ratio, self.y_ratio, self.z_ratio)
         f.update_whole_extent()
         f.update()
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _filter_changed(self, old, new):
         if old is not None:
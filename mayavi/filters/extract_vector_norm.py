@@ -66,7 +66,7 @@ class ExtractVectorNorm(FilterBase):
         self.filter.update()
         self._set_array_name(self.filter)
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # Non-public interface.
@@ -86,7 +86,7 @@ class FilterBase(Filter):
 
         self.filter.update()
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _filter_changed(self, old, new):
         if old is not None:
@@ -248,7 +248,7 @@ class ImageDataProbe(Filter):
         fil.update()
         self._rescale_scalars_changed(self.rescale_scalars)
         fil.global_warning_display = w
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _reset_defaults_fired(self):
         self._setup_probe_data(reset=True)
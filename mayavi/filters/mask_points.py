@@ -5,6 +5,7 @@
 # Enthought library imports.
 from traits.api import Instance
 from tvtk.api import tvtk
+from tvtk.common import is_version_7
 
 # Local imports
 from mayavi.filters.filter_base import FilterBase
@@ -42,9 +43,11 @@ class MaskPoints(FilterBase):
         # FIXME: This is needed, for with VTK-5.10 (for sure), the filter
         # allocates memory for maximum_number_of_points which is impossibly
         # large,  so we set it to the number of points in the input
-        # for safety.
-        self.filter.maximum_number_of_points = \
-            self._find_number_of_points_in_input()
+        # for safety.  Newer versions only allocate for the points they
+        # output, so we avoid updating the upstream pipeline to count them.
+        if not is_version_7():
+            self.filter.maximum_number_of_points = \
+                self._find_number_of_points_in_input()
         super(MaskPoints, self).update_pipeline()
 
     ######################################################################
@@ -78,7 +78,7 @@ class SelectOutput(Filter):
 
     def update_data(self):
         # Propagate the event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # Trait handlers.
@@ -122,7 +122,7 @@ class SetActiveAttribute(Filter):
     # `Filter` interface.
     ######################################################################
     def update_data(self):
-        self.data_changed = True
+        self.fire_data_changed()
 
     def update_pipeline(self):
         if len(self.inputs) == 0 or len(self.inputs[0].outputs) == 0:
@@ -191,7 +191,7 @@ class SetActiveAttribute(Filter):
             d = getattr(input, attr_type + '_data')
             method = getattr(d, 'set_active_%s'%data_type)
             method(None)
-            self.data_changed = True
+            self.fire_data_changed()
             return
 
         aa = self._assign_attribute
@@ -206,7 +206,7 @@ class SetActiveAttribute(Filter):
         aa.assign(value, data_type.upper(), attr_type.upper() +'_DATA')
         aa.update()
         # Fire an event, so the changes propagate.
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _point_scalars_name_changed(self, value):
         self._set_data_name('scalars', 'point', value)
@@ -7,8 +7,6 @@
 # Copyright (c) 2010, Enthought, Inc.
 # License: BSD Style.
 
-import numpy as np
-
 # Enthought library imports.
 from traits.api import Instance, Range, Float, Bool, \
                                  Property, Enum
@@ -17,6 +15,7 @@ from tvtk.api import tvtk
 
 # Local imports
 from mayavi.core.filter import Filter
+from mayavi.core.module_manager import get_data_range
 from mayavi.core.pipeline_info import PipelineInfo
 
 
@@ -157,7 +156,7 @@ class Threshold(Filter):
         self._update_ranges()
 
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # Non-public interface
@@ -166,13 +165,13 @@ class Threshold(Filter):
         fil = self.threshold_filter
         fil.threshold_between(new_value, self.upper_threshold)
         fil.update()
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _upper_threshold_changed(self, new_value):
         fil = self.threshold_filter
         fil.threshold_between(self.lower_threshold, new_value)
         fil.update()
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _update_ranges(self):
         """Updates the ranges of the input.
@@ -230,17 +229,9 @@ class Threshold(Filter):
         # FIXME: need to be able to handle cell and point data
         # together.
         if ps is not None:
-            data_range = list(ps.range)
-            if np.isnan(data_range[0]):
-                data_range[0] = float(np.nanmin(ps.to_array()))
-            if np.isnan(data_range[1]):
-                data_range[1] = float(np.nanmax(ps.to_array()))
+            data_range = list(get_data_range(ps)[:2])
         elif cs is not None:
-            data_range = cs.range
-            if np.isnan(data_range[0]):
-                data_range[0] = float(np.nanmin(cs.to_array()))
-            if np.isnan(data_range[1]):
-                data_range[1] = float(np.nanmax(cs.to_array()))
+            data_range = list(get_data_range(cs)[:2])
         return data_range
 
     def _auto_reset_lower_changed(self, value):
@@ -286,4 +277,4 @@ class Threshold(Filter):
 
     def _threshold_filter_edited(self):
         self.threshold_filter.update()
-        self.data_changed = True
+        self.fire_data_changed()
@@ -150,7 +150,7 @@ class TransformData(Filter):
 
         self.filter.update()
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # Non-public interface.
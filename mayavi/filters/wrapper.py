@@ -116,7 +116,7 @@ class Wrapper(Filter):
         sends a `data_changed` event.
         """
         # Propagate the data_changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     ######################################################################
     # Private interface.
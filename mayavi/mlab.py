@@ -31,6 +31,7 @@ from mayavi.tools.engine_manager import get_engine, show_pipeline, \
         options, set_engine
 from mayavi.tools.show import show
 from mayavi.tools.animator import animate
+from mayavi.tools.movie_export import export_movie
 
 def show_engine():
     """ This function is deprecated, please use show_pipeline.
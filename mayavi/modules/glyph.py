@@ -118,19 +118,32 @@ class Glyph(Module):
             actor.set_lut(lut_mgr.lut)
         elif value == 'color_by_vector':
             lut_mgr = self.module_manager.vector_lut_manager
+            if actor.mapper.is_a('vtkGlyph3DMapper'):
+                # The glyph mapper colors by the vectors themselves.
+                lut_mgr.lut.vector_mode = 'magnitude'
             actor.set_lut(lut_mgr.lut)
         else:
             actor.mapper.scalar_visibility = 0
 
         self.render()
 
+    def _instancing_changed(self, value):
+        # This is a listner for the glyph component's instancing trait
+        # so that the actor renders the glyphs with the right mapper.
+        if self.glyph.update_actor_mapper(self.actor):
+            self._color_mode_changed(self.glyph.color_mode)
+
     def _glyph_changed(self, old, new):
         # Hookup a callback to set the lut appropriately.
         if old is not None:
             old.on_trait_change(self._color_mode_changed,
                                 'color_mode',
                                 remove=True)
+            old.on_trait_change(self._instancing_changed,
+                                'instancing',
+                                remove=True)
         new.on_trait_change(self._color_mode_changed, 'color_mode')
+        new.on_trait_change(self._instancing_changed, 'instancing')
 
         # Set the glyph's module attribute -- this is important!
         new.module = self
@@ -139,6 +152,7 @@ class Glyph(Module):
         actor = self.actor
         if actor is not None:
             actor.inputs = [new]
+            self._instancing_changed(new.instancing)
         self._change_components(old, new)
 
     def _actor_changed(self, old, new):
@@ -148,5 +162,7 @@ class Glyph(Module):
         if g is not None:
             new.inputs = [g]
         self._change_components(old, new)
+        if g is not None:
+            self._instancing_changed(g.instancing)
 
 
@@ -5,6 +5,9 @@
 # Copyright (c) 2005-2015, Enthought, Inc.
 # License: BSD Style.
 
+# Standard library imports.
+import vtk
+
 # Enthought library imports.
 from traits.api import Instance, Bool, on_trait_change
 from traitsui.api import View, Group, Item
@@ -88,6 +91,7 @@ class ImagePlaneWidget(Module):
             raise TypeError(msg)
 
         self.configure_input(self.ipw, input)
+        self._place_on_whole_extent()
         self.setup_lut()
 
     def update_data(self):
@@ -115,11 +119,41 @@ class ImagePlaneWidget(Module):
     ######################################################################
     # Non-public methods.
     ######################################################################
+    def _place_on_whole_extent(self):
+        """Places the widget on the whole extent of its input.
+
+        The widget sizes its plane from the data its input currently
+        holds, which for a streaming source such as
+        `StreamingArraySource` is only the last extent read.
+        """
+        # Ugly, but needed as the pipeline information is not wrapped.
+        reslice = tvtk.to_vtk(self.ipw.reslice)
+        if reslice.GetNumberOfInputConnections(0) == 0:
+            return
+        alg = reslice.GetInputAlgorithm(0, 0)
+        alg.UpdateInformation()
+        info = alg.GetOutputInformation(0)
+        whole = info.Get(vtk.vtkStreamingDemandDrivenPipeline.WHOLE_EXTENT())
+        data = alg.GetOutputDataObject(0)
+        if whole is None or data is None or tuple(data.GetExtent()) == tuple(whole):
+            return
+        origin = info.Get(vtk.vtkDataObject.ORIGIN()) or data.GetOrigin()
+        spacing = info.Get(vtk.vtkDataObject.SPACING()) or data.GetSpacing()
+        # Pad by half a voxel like the widget does for in-memory data.
+        bounds = []
+        for i in range(3):
+            bounds.append(origin[i] + spacing[i]*(whole[2*i] - 0.5))
+            bounds.append(origin[i] + spacing[i]*(whole[2*i + 1] + 0.5))
+        self.ipw.place_widget(bounds)
+
     def _ipw_changed(self, old, new):
         if old is not None:
             old.on_trait_change(self.render, remove=True)
+            old.on_trait_change(self._place_on_whole_extent,
+                                'plane_orientation', remove=True)
             self.widgets.remove(old)
         new.on_trait_change(self.render)
+        new.on_trait_change(self._place_on_whole_extent, 'plane_orientation')
         self.widgets.append(new)
         if old is not None:
             self.update_pipeline()
@@ -131,6 +131,9 @@ class VectorCutPlane(Module):
             actor.set_lut(lut_mgr.lut)
         elif value == 'color_by_vector':
             lut_mgr = self.module_manager.vector_lut_manager
+            if actor.mapper.is_a('vtkGlyph3DMapper'):
+                # The glyph mapper colors by the vectors themselves.
+                lut_mgr.lut.vector_mode = 'magnitude'
             actor.set_lut(lut_mgr.lut)
         else:
             actor.mapper.scalar_visibility = 0
@@ -154,18 +157,32 @@ class VectorCutPlane(Module):
             g.inputs = [new]
         self._change_components(old, new)
 
+    def _instancing_changed(self, value):
+        # This is a listner for the glyph component's instancing trait
+        # so that the actor renders the glyphs with the right mapper.
+        if self.glyph.update_actor_mapper(self.actor) and \
+           self.module_manager is not None:
+            self._color_mode_changed(self.glyph.color_mode)
+
     def _glyph_changed(self, old, new):
         if old is not None:
             old.on_trait_change(self._color_mode_changed,
                                 'color_mode',
                                 remove=True)
+            old.on_trait_change(self._instancing_changed,
+                                'instancing',
+                                remove=True)
         new.module = self
         cutter = self.cutter
         if cutter:
             new.inputs = [cutter]
         new.on_trait_change(self._color_mode_changed,
                             'color_mode')
+        new.on_trait_change(self._instancing_changed,
+                            'instancing')
         self._change_components(old, new)
+        if self.actor is not None:
+            self._instancing_changed(new.instancing)
 
     def _actor_changed(self, old, new):
         new.scene = self.scene
@@ -173,4 +190,6 @@ class VectorCutPlane(Module):
         if glyph is not None:
             new.inputs = [glyph]
         self._change_components(old, new)
+        if glyph is not None:
+            self._instancing_changed(glyph.instancing)
 
@@ -10,14 +10,18 @@ probably with the ImageData based renderers.
 # License: BSD Style.
 
 # Standard imports
+import time
+import weakref
 from math import cos, sqrt, pi
 from vtk.util import vtkConstants
 
 # Enthought library imports.
 from traits.api import Instance, Property, List, ReadOnly, \
-     Str, Button, Tuple
+     Str, Button, Tuple, Bool, Range, Int, Dict, Float, Any
 from traitsui.api import View, Group, Item, InstanceEditor
 from tvtk.api import tvtk
+from tvtk import messenger
+from tvtk.common import configure_connection
 from tvtk.util.gradient_editor import hsva_to_rgba, GradientTable
 from tvtk.util.traitsui_gradient_editor import VolumePropertyEditor
 from tvtk.util.ctf import save_ctfs, load_ctfs, \
@@ -30,10 +34,33 @@ from mayavi.core.module import Module
 from mayavi.core.common import error
 from mayavi.core.trait_defs import DEnum
 from mayavi.core.lut_manager import LUTManager
+from mayavi.core.module_manager import get_data_range
+
+# The multi-resolution pyramids built for the sources, see
+# `get_volume_pyramid`.
+_pyramids = weakref.WeakKeyDictionary()
+
 
 ######################################################################
 # Utility functions.
 ######################################################################
+def get_volume_pyramid(source, n_levels):
+    """Returns a list of `n_levels` image filters successively halving
+    the resolution of the image data produced by the Mayavi `source`.
+
+    The filters are cached with the source, so that the modules of a
+    source share them, and only execute again when the data changes.
+    """
+    levels = _pyramids.setdefault(source, [])
+    while len(levels) < n_levels:
+        levels.append(tvtk.ImageShrink3D(shrink_factors=(2, 2, 2),
+                                         averaging=True))
+        if len(levels) > 1:
+            configure_connection(levels[-1], levels[-2])
+    # The outputs of the source may have changed.
+    configure_connection(levels[0], source)
+    return levels[:n_levels]
+
 def is_volume_pro_available():
     """Returns `True` if there is a volume pro card available.
     """
@@ -202,6 +229,23 @@ class Volume(Module):
     lut_manager = Instance(VolumeLUTManager, args=(), allow_none=False,
                            record=True)
 
+    # Render a downsampled volume while the scene is being interacted
+    # with, and the full resolution one when the interaction ends.
+    # Only supported for ImageData.
+    lod = Bool(False, desc='if a coarse volume is rendered during '\
+                           'interaction')
+
+    # The number of levels of the multi-resolution pyramid, each level
+    # halving the resolution of the previous one.
+    lod_levels = Range(1, 6, 3, desc='the number of downsampled levels')
+
+    # The time budget in seconds for rendering a frame during
+    # interaction.  The finest level expected to render in this time
+    # is used.
+    lod_frame_time = Range(0.001, 10.0, 0.1,
+                           desc='the time budget to render a frame '\
+                                'during interaction')
+
     input_info = PipelineInfo(datasets=['image_data',
                                         'unstructured_grid'],
                               attribute_types=['any'],
@@ -241,6 +285,10 @@ class Volume(Module):
                            resizable=True),
                       label='Volume',
                       show_labels=False),
+                Group(Item(name='lod'),
+                      Item(name='lod_levels', enabled_when='lod'),
+                      Item(name='lod_frame_time', enabled_when='lod'),
+                      label='Level of detail'),
                 Group(Item(name='lut_manager', style='custom',
                            resizable=True),
                       label='Legend',
@@ -267,13 +315,32 @@ class Volume(Module):
     # The opacity values.
     _otf = Instance(PiecewiseFunction)
 
+    # The pyramid level currently rendered, 0 is the full resolution.
+    _lod_level = Int(0)
+
+    # The last frame time measured for each pyramid level.
+    _lod_times = Dict(Int, Float)
+
+    # The time at which the current frame started rendering.
+    _render_start = Float(0.0)
+
+    # Whether the input supports the multi-resolution mode.
+    _lod_supported = Bool(False)
+
+    # The renderer observed to select the level and the ids of its
+    # observers.
+    _lod_renderer = Any
+    _lod_observer_ids = List
+
     ######################################################################
     # `object` interface
     ######################################################################
     def __get_pure_state__(self):
         d = super(Volume, self).__get_pure_state__()
         d['ctf_state'] = save_ctfs(self._volume_property)
-        for name in ('current_range', '_ctf', '_otf'):
+        for name in ('current_range', '_ctf', '_otf', '_lod_level',
+                     '_lod_times', '_render_start', '_lod_supported',
+                     '_lod_observer_ids', '_lod_renderer'):
             d.pop(name, None)
         return d
 
@@ -296,6 +363,7 @@ class Volume(Module):
     def stop(self):
         super(Volume, self).stop()
         self.lut_manager.stop()
+        self._observe_renderer(False)
 
     def setup_pipeline(self):
         """Override this method so that it *creates* the tvtk
@@ -352,10 +420,12 @@ class Volume(Module):
                   'StructuredPoints/ImageData datasets')
             return
 
+        self._lod_supported = dataset.is_a('vtkImageData')
         self._setup_mapper_types()
         self._setup_current_range()
         self._volume_mapper_type_changed(self.volume_mapper_type)
         self._update_ctf_fired()
+        self._observe_renderer(self.lod and self._lod_supported)
         self.pipeline_changed = True
 
     def update_data(self):
@@ -422,7 +492,7 @@ class Volume(Module):
         dataset = mm.source.get_output_dataset()
         sc = dataset.point_data.scalars
         if sc is not None:
-            rng = sc.range
+            rng = get_data_range(sc)[:2]
         else:
             error('No scalars in input data!')
             rng = (0, 255)
@@ -478,6 +548,8 @@ class Volume(Module):
 
         src = mm.source
         self.configure_connection(new_vm, src)
+        self._lod_level = 0
+        self._lod_times.clear()
         self.volume.mapper = new_vm
         new_vm.on_trait_change(self.render)
 
@@ -505,5 +577,81 @@ class Volume(Module):
         self.render()
 
     def _scene_changed(self, old, new):
+        self._observe_renderer(False)
         super(Volume, self)._scene_changed(old, new)
         self.lut_manager.scene = new
+        self._observe_renderer(self.lod and self._lod_supported)
+
+    def _lod_changed(self, value):
+        self._observe_renderer(value and self._lod_supported)
+        if not value:
+            self._set_lod_level(0)
+
+    def _lod_levels_changed(self, value):
+        if self._lod_level > value:
+            self._set_lod_level(0)
+
+    def _observe_renderer(self, observe):
+        """Adds or removes the observers of the renderer used to select
+        the pyramid level to render.  We use the messenger to avoid an
+        uncollectable reference cycle."""
+        ren = self._lod_renderer
+        if ren is not None:
+            for id in self._lod_observer_ids:
+                ren.remove_observer(id)
+            ren_vtk = tvtk.to_vtk(ren)
+            messenger.disconnect(ren_vtk, 'StartEvent',
+                                 self._on_render_start)
+            messenger.disconnect(ren_vtk, 'EndEvent', self._on_render_end)
+            self._lod_observer_ids = []
+            self._lod_renderer = None
+        ren = getattr(self.scene, 'renderer', None)
+        if not observe or ren is None:
+            return
+        self._lod_observer_ids = [ren.add_observer(event, messenger.send)
+                                  for event in ('StartEvent', 'EndEvent')]
+        ren_vtk = tvtk.to_vtk(ren)
+        messenger.connect(ren_vtk, 'StartEvent', self._on_render_start)
+        messenger.connect(ren_vtk, 'EndEvent', self._on_render_end)
+        self._lod_renderer = ren
+
+    def _on_render_start(self, ren_vtk, event):
+        """Renders a coarse level when the render window is asked for
+        the interactive update rate and the full resolution otherwise.
+        """
+        self._render_start = time.time()
+        rw = ren_vtk.GetRenderWindow()
+        iren = rw.GetInteractor() if rw is not None else None
+        level = 0
+        if iren is not None and \
+               rw.GetDesiredUpdateRate() > iren.GetStillUpdateRate():
+            level = self._select_lod_level()
+        self._set_lod_level(level)
+
+    def _on_render_end(self, ren_vtk, event):
+        self._lod_times[self._lod_level] = time.time() - self._render_start
+
+    def _select_lod_level(self):
+        """Returns the finest pyramid level expected to render within
+        `lod_frame_time`."""
+        t = self._lod_times.get(self._lod_level)
+        if t is None:
+            return 1
+        # The render time is roughly proportional to the number of
+        # voxels, which is divided by 8 at each level.
+        for level in range(self.lod_levels + 1):
+            if t*8.0**(self._lod_level - level) <= self.lod_frame_time:
+                return level
+        return self.lod_levels
+
+    def _set_lod_level(self, level):
+        mm = self.module_manager
+        vm = self._volume_mapper
+        if level == self._lod_level or mm is None or vm is None:
+            return
+        if level == 0:
+            self.configure_connection(vm, mm.source)
+        else:
+            pyramid = get_volume_pyramid(mm.source, self.lod_levels)
+            self.configure_connection(vm, pyramid[level - 1])
+        self._lod_level = level
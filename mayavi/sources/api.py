@@ -15,6 +15,7 @@ from .parametric_surface import ParametricSurface
 from .plot3d_reader import PLOT3DReader
 from .point_load import PointLoad
 from .poly_data_reader import PolyDataReader
+from .streaming_array_source import StreamingArraySource
 from .three_ds_importer import ThreeDSImporter
 from .vrml_importer import VRMLImporter
 from .volume_reader import VolumeReader
@@ -105,7 +105,10 @@ class ArraySource(Source):
     # non-contiguous where the data is copied by VTK.  Thus, when the
     # user explicitly requests that transpose_input_array is false
     # then we assume that the array has already been suitably
-    # formatted by the user.
+    # formatted by the user.  Note that Fortran-ordered arrays (as
+    # returned by `numpy.asfortranarray` or read from many file
+    # formats) are already in the order VTK needs and are used without
+    # a copy when the input is transposed.
     transpose_input_array = Bool(True, desc='if input array should be transposed (if on VTK will copy the input data)')
 
     # Information about what this object can produce.
@@ -163,12 +166,71 @@ class ArraySource(Source):
         if self.vector_data is not None:
             pd.vectors.modified()
         self.change_information_filter.update()
-        self.data_changed = True
+        self.fire_data_changed()
+
+    def update_data(self, scalar_data=None, vector_data=None):
+        """Replace the scalar and/or vector data with new arrays.
+
+        When a new array has the same shape and dtype as the current
+        one, its values are copied into the buffer of the existing VTK
+        array: no memory is allocated and the image data is not
+        rebuilt.  Otherwise the array is set as usual.
+
+        Note that the VTK arrays may share their memory with the arrays
+        that were set previously, which are then overwritten too.
+        """
+        pd = self.image_data.point_data
+        in_place = False
+        for name, value, vtk_array in (('scalar_data', scalar_data,
+                                        pd.scalars),
+                                       ('vector_data', vector_data,
+                                        pd.vectors)):
+            if value is None:
+                continue
+            value = numpy.asarray(value)
+            current = getattr(self, name)
+            if current is None or vtk_array is None or \
+                   value.shape != current.shape or \
+                   value.dtype != current.dtype:
+                setattr(self, name, value)
+                continue
+            self._copy_to_vtk_array(vtk_array, value,
+                                    name == 'vector_data')
+            self.trait_setq(**{name: value})
+            in_place = True
+        if in_place:
+            self.image_data.modified()
+            self.change_information_filter.update()
+            self.fire_data_changed()
 
     ######################################################################
     # Non-public interface.
     ######################################################################
 
+    def _get_vtk_order(self, data):
+        """Returns a view of `data` (a scalar array or a vector array
+        with the dimensions inserted by `_vector_data_changed`) whose C
+        order is the order of the points in VTK."""
+        if not self.transpose_input_array:
+            return data
+        if data.ndim == 4:
+            return numpy.transpose(data, (2, 1, 0, 3))
+        return numpy.transpose(data)
+
+    def _copy_to_vtk_array(self, vtk_array, data, vectors=False):
+        """Copies the scalar or vector array `data` into the buffer of
+        the TVTK array `vtk_array` and marks it modified."""
+        if vectors and data.ndim == 3:
+            data = data[:, :, numpy.newaxis, :]
+        buf = vtk_array.to_array()
+        if not numpy.may_share_memory(buf, data):
+            # Setting the shape raises rather than silently copying.
+            buf = buf.view()
+            data = self._get_vtk_order(data)
+            buf.shape = data.shape
+            buf[...] = data
+        vtk_array.modified()
+
     def _image_data_changed(self, value):
         self.configure_input_data(self.change_information_filter, value)
 
@@ -176,7 +238,7 @@ class ArraySource(Source):
         img_data = self.image_data
         if data is None:
             img_data.point_data.scalars = None
-            self.data_changed = True
+            self.fire_data_changed()
             return
         dims = list(data.shape)
         if len(dims) == 2:
@@ -193,10 +255,9 @@ class ArraySource(Source):
         else:
             update_extent = [0, dims[dim0]-1, 0, dims[dim1]-1, 0, dims[dim2]-1]
             self.change_information_filter.set_update_extent(update_extent)
-        if self.transpose_input_array:
-            img_data.point_data.scalars = numpy.ravel(numpy.transpose(data))
-        else:
-            img_data.point_data.scalars = numpy.ravel(data)
+        # This does not copy C-ordered arrays that are not transposed
+        # and Fortran-ordered ones that are.
+        img_data.point_data.scalars = numpy.ravel(self._get_vtk_order(data))
         img_data.point_data.scalars.name = self.scalar_name
         # This is very important and if not done can lead to a segfault!
         typecode = data.dtype
@@ -212,13 +273,13 @@ class ArraySource(Source):
         self.change_information_filter.update()
 
         # Now flush the mayavi pipeline.
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _vector_data_changed(self, data):
         img_data = self.image_data
         if data is None:
             img_data.point_data.vectors = None
-            self.data_changed = True
+            self.fire_data_changed()
             return
         dims = list(data.shape)
         if len(dims) == 3:
@@ -234,12 +295,8 @@ class ArraySource(Source):
             self.change_information_filter.update_information()
             update_extent = [0, dims[0]-1, 0, dims[1]-1, 0, dims[2]-1]
             self.change_information_filter.set_update_extent(update_extent)
-        sz = numpy.size(data)
-        if self.transpose_input_array:
-            data_t = numpy.transpose(data, (2, 1, 0, 3))
-        else:
-            data_t = data
-        img_data.point_data.vectors = numpy.reshape(data_t, (sz/3, 3))
+        data_t = self._get_vtk_order(data)
+        img_data.point_data.vectors = numpy.reshape(data_t, (-1, 3))
         img_data.point_data.vectors.name = self.vector_name
         if is_old_pipeline():
             img_data.update() # This sets up the extents correctly.
@@ -249,17 +306,17 @@ class ArraySource(Source):
         self.change_information_filter.update()
 
         # Now flush the mayavi pipeline.
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _scalar_name_changed(self, value):
         if self.scalar_data is not None:
             self.image_data.point_data.scalars.name = value
-            self.data_changed = True
+            self.fire_data_changed()
 
     def _vector_name_changed(self, value):
         if self.vector_data is not None:
             self.image_data.point_data.vectors.name = value
-            self.data_changed = True
+            self.fire_data_changed()
 
     def _transpose_input_array_changed(self, value):
         if self.scalar_data is not None:
@@ -269,4 +326,4 @@ class ArraySource(Source):
 
     def _information_changed(self):
         self.change_information_filter.update()
-        self.data_changed = True
+        self.fire_data_changed()
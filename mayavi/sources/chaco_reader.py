@@ -79,4 +79,4 @@ class ChacoReader(Source):
         self.reader.update_information()
         self.reader.on_trait_change(self.render)
         self.outputs = [self.reader.output]
-        self.data_changed = True
+        self.fire_data_changed()
@@ -108,4 +108,4 @@ class ParametricSurface(Source):
             old.on_trait_change(self.render, remove=True)
         new.on_trait_change(self.render)
         self.source.update()
-        self.data_changed = True
+        self.fire_data_changed()
@@ -254,7 +254,7 @@ class PLOT3DReader(Source):
         # Fire data_changed just in case the outputs are not
         # really changed.  This can happen if the dataset is of
         # the same type as before.
-        self.data_changed = True
+        self.fire_data_changed()
 
         # Change our name on the tree view
         self.name = self._get_name()
@@ -263,13 +263,13 @@ class PLOT3DReader(Source):
         self.reader.scalar_function_number = self.scalars_name_
         self.reader.modified()
         self.update()
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _vectors_name_changed(self, value):
         self.reader.vector_function_number = self.vectors_name_
         self.reader.modified()
         self.update()
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _update_reader_fired(self):
         self.reader.modified()
@@ -0,0 +1,379 @@
+"""A source that streams sub-extents of a large, typically on-disk,
+numpy-like array as ImageData.  Only the part of the array requested
+by the downstream filters and modules is read.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+# Standard library imports.
+from os.path import basename, splitext
+
+import numpy
+import vtk
+try:
+    from vtk.util.vtkAlgorithm import VTKPythonAlgorithmBase
+except ImportError:
+    # Python algorithms are only available with VTK >= 6.3.
+    VTKPythonAlgorithmBase = object
+
+# Enthought library imports
+from traits.api import Any, Bool, Float, Instance, Int, Str, Tuple
+from traitsui.api import View, Group, Item
+from tvtk.api import tvtk
+from tvtk import array_handler
+
+# Local imports
+from mayavi.core.source import Source
+from mayavi.core.module_manager import RANGE_CHUNK_SIZE
+from mayavi.core.pipeline_info import PipelineInfo
+
+
+######################################################################
+# Utility functions.
+######################################################################
+def open_array(file_name, dtype='float64', shape=None, header_size=0,
+               fortran_order=False, dataset_name=''):
+    """Opens the array stored in `file_name` without reading it.
+
+    `.npy` files are memory mapped using their header.  HDF5 files
+    (`.h5`, `.hdf5`) are supported if h5py is installed; the dataset
+    to use is given by `dataset_name`.  Any other file is memory mapped
+    as raw binary data of the given `dtype` and `shape`, starting after
+    `header_size` bytes, in C or Fortran order.
+
+    The HDF5 file stays open as long as the dataset is used, it is
+    closed with ``dataset.file.close()``.
+    """
+    ext = splitext(file_name)[1].lower()
+    if ext == '.npy':
+        return numpy.load(file_name, mmap_mode='r')
+    elif ext in ('.h5', '.hdf5'):
+        import h5py
+        if len(dataset_name) == 0:
+            raise ValueError('The name of the HDF5 dataset is needed.')
+        h5_file = h5py.File(file_name, 'r')
+        try:
+            return h5_file[dataset_name]
+        except KeyError:
+            h5_file.close()
+            raise
+    if shape is None or len(shape) == 0:
+        raise ValueError('The shape of raw binary data is needed.')
+    order = 'F' if fortran_order else 'C'
+    return numpy.memmap(file_name, dtype=dtype, mode='r',
+                        offset=header_size, shape=tuple(shape),
+                        order=order)
+
+
+######################################################################
+# `_ArrayAlgorithm` class.
+######################################################################
+class _ArrayAlgorithm(VTKPythonAlgorithmBase):
+    """VTK image source producing the update extent requested
+    downstream from a sliceable array indexed as `array[x, y, z]`."""
+
+    def __init__(self):
+        if VTKPythonAlgorithmBase is object:
+            raise ImportError('StreamingArraySource needs VTK 6.3 or '
+                              'later, this is VTK %s.'%
+                              vtk.vtkVersion.GetVTKVersion())
+        VTKPythonAlgorithmBase.__init__(self, nInputPorts=0,
+                                        nOutputPorts=1,
+                                        outputType='vtkImageData')
+        self.array = None
+        self.name = 'scalar'
+        self.spacing = (1.0, 1.0, 1.0)
+        self.origin = (0.0, 0.0, 0.0)
+        self.n_reads = 0
+        self.n_bytes_read = 0
+
+    def get_whole_extent(self):
+        shape = tuple(self.array.shape) + (1,)*(3 - len(self.array.shape))
+        return (0, shape[0] - 1, 0, shape[1] - 1, 0, shape[2] - 1)
+
+    def RequestInformation(self, request, in_info, out_info):
+        info = out_info.GetInformationObject(0)
+        sddp = vtk.vtkStreamingDemandDrivenPipeline
+        if self.array is None:
+            info.Set(sddp.WHOLE_EXTENT(), (0, -1, 0, -1, 0, -1), 6)
+            return 1
+        info.Set(sddp.WHOLE_EXTENT(), self.get_whole_extent(), 6)
+        info.Set(vtk.vtkDataObject.SPACING(), tuple(self.spacing), 3)
+        info.Set(vtk.vtkDataObject.ORIGIN(), tuple(self.origin), 3)
+        info.Set(vtk.vtkAlgorithm.CAN_PRODUCE_SUB_EXTENT(), 1)
+        vtk_type = array_handler.get_vtk_array_type(self.array.dtype)
+        vtk.vtkDataObject.SetPointDataActiveScalarInfo(info, vtk_type, 1)
+        return 1
+
+    def RequestData(self, request, in_info, out_info):
+        info = out_info.GetInformationObject(0)
+        output = info.Get(vtk.vtkDataObject.DATA_OBJECT())
+        if self.array is None:
+            return 1
+        ext = info.Get(vtk.vtkStreamingDemandDrivenPipeline.UPDATE_EXTENT())
+        index = tuple(slice(ext[2*i], ext[2*i + 1] + 1)
+                      for i in range(len(self.array.shape)))
+        slab = numpy.asarray(self.array[index])
+        self.n_reads += 1
+        self.n_bytes_read += slab.nbytes
+        output.SetExtent(ext)
+        scalars = array_handler.array2vtk(numpy.ravel(slab, order='F'))
+        scalars.SetName(self.name)
+        output.GetPointData().SetScalars(scalars)
+        return 1
+
+
+######################################################################
+# 'StreamingArraySource' class.
+######################################################################
+class StreamingArraySource(Source):
+
+    """A source that views a 2D or 3D numpy-like array as ImageData
+    without loading it in memory.
+
+    The array is either given as `scalar_data`, which can be any
+    sliceable array such as a `numpy.memmap` or an HDF5 dataset, or
+    opened from `file_name` (see `open_array`).  It is indexed as
+    `array[x, y, z]`, like the arrays given to `ArraySource`.
+
+    Only the extent requested by the pipeline is read from the array.
+    Modules and filters that request a sub-extent, such as
+    `ImagePlaneWidget` or the `ExtractVOI` filter, only read the slabs
+    they display.  Those that need the whole extent, such as the cutter
+    of `ScalarCutPlane`, read the whole array unless they follow an
+    `ExtractVOI` filter.
+    """
+
+    # The version of this class.  Used for persistence.
+    __version__ = 0
+
+    # The array we view.
+    scalar_data = Any(desc='the sliceable array to view')
+
+    # The file to open the array from.
+    file_name = Str('', desc='the .npy, HDF5 or raw binary file to open')
+
+    # The name of the dataset in an HDF5 file.
+    dataset_name = Str('', desc='the name of the dataset in an HDF5 file')
+
+    # The data type of a raw binary file.
+    raw_dtype = Str('float64', desc='the data type of a raw binary file')
+
+    # The shape of the array in a raw binary file.
+    raw_shape = Tuple(desc='the shape of the array in a raw binary file')
+
+    # The size of the header to skip in a raw binary file.
+    header_size = Int(0, desc='the number of bytes to skip in a raw file')
+
+    # Whether the array in a raw binary file is in Fortran order.
+    fortran_order = Bool(False,
+                         desc='if the raw binary array is in Fortran order')
+
+    # The name of our scalar array.
+    scalar_name = Str('scalar')
+
+    # The spacing of the points in the array.
+    spacing = Tuple(Float(1.0), Float(1.0), Float(1.0),
+                    desc='the spacing between points in array')
+
+    # The origin of the points in the array.
+    origin = Tuple(Float(0.0), Float(0.0), Float(0.0),
+                   desc='the origin of the points in array')
+
+    # The TVTK algorithm producing our image data.
+    reader = Instance(tvtk.Object, allow_none=False)
+
+    # Information about what this object can produce.
+    output_info = PipelineInfo(datasets=['image_data'],
+                               attribute_types=['any'],
+                               attributes=['scalars'])
+
+    # Our view.
+    view = View(Group(Item(name='file_name', style='readonly'),
+                      Item(name='scalar_name'),
+                      Item(name='spacing'),
+                      Item(name='origin'),
+                      show_labels=True)
+                )
+
+    ########################################
+    # Private traits.
+
+    # The VTK algorithm wrapped by `reader`.
+    _algorithm = Any
+
+    # The HDF5 file opened from `file_name`, if any.
+    _h5_file = Any
+
+    # Whether the HDF5 file was closed on `stop` and should be opened
+    # again on `start`.
+    _reopen = Bool(False)
+
+    # The range of the whole array, computed by `get_scalar_range`.
+    _scalar_range = Any
+
+    ######################################################################
+    # `object` interface.
+    ######################################################################
+    def __init__(self, **traits):
+        # Set the data at the end so we pop it here.
+        data = traits.pop('scalar_data', None)
+        file_name = traits.pop('file_name', '')
+        self._algorithm = _ArrayAlgorithm()
+        self.reader = tvtk.to_tvtk(self._algorithm)
+        super(StreamingArraySource, self).__init__(**traits)
+        # The algorithm itself is our output so that the modules and
+        # filters connect to its output port and request the extents
+        # they need.
+        self.outputs = [self.reader]
+        if data is not None:
+            self.scalar_data = data
+        elif len(file_name) > 0:
+            self.file_name = file_name
+
+    def __get_pure_state__(self):
+        d = super(StreamingArraySource, self).__get_pure_state__()
+        for name in ('reader', 'scalar_data'):
+            d.pop(name, None)
+        return d
+
+    def __set_pure_state__(self, state):
+        file_name = state.file_name
+        state.file_name = ''
+        super(StreamingArraySource, self).__set_pure_state__(state)
+        if len(file_name) > 0:
+            self.file_name = file_name
+
+    ######################################################################
+    # `Base` interface
+    ######################################################################
+    def start(self):
+        """This is invoked when this object is added to the mayavi
+        pipeline.
+        """
+        if self.running:
+            return
+        if self._reopen:
+            self._reopen = False
+            self._file_name_changed(self.file_name)
+        super(StreamingArraySource, self).start()
+
+    def stop(self):
+        """Invoked when this object is removed from the mayavi
+        pipeline.  Closes the HDF5 file opened from `file_name`.
+        """
+        if not self.running:
+            return
+        super(StreamingArraySource, self).stop()
+        self._reopen = self._close_file()
+
+    ######################################################################
+    # `PipelineBase` interface.
+    ######################################################################
+    def has_output_port(self):
+        """ Return True as the reader has output port."""
+        return True
+
+    def get_output_object(self):
+        """ Return the reader output port."""
+        return self.reader.output_port
+
+    ######################################################################
+    # `StreamingArraySource` interface.
+    ######################################################################
+    def update(self):
+        """Call this function when the data of the array changed."""
+        self._scalar_range = None
+        self.reader.modified()
+        self._update_output()
+
+    def get_scalar_range(self):
+        """Returns the `(min, max)` range of the whole array ignoring
+        the NaNs, or None if there is no array.  The output only holds
+        the extent read last, so the module managers use this range for
+        their lookup tables.  The array is read a slab at a time, once
+        per change of the data.
+        """
+        data = self._algorithm.array
+        if data is None:
+            return None
+        if self._scalar_range is None:
+            lo, hi = numpy.inf, -numpy.inf
+            row_size = max(1, int(numpy.prod(data.shape[1:])))
+            n = max(1, RANGE_CHUNK_SIZE//row_size)
+            for i in range(0, data.shape[0], n):
+                chunk = numpy.asarray(data[i:i + n]).ravel()
+                if chunk.dtype.kind == 'f':
+                    chunk = chunk[~numpy.isnan(chunk)]
+                if len(chunk) > 0:
+                    lo = min(lo, chunk.min())
+                    hi = max(hi, chunk.max())
+            if lo > hi:
+                lo, hi = numpy.nan, numpy.nan
+            self._scalar_range = (float(lo), float(hi))
+        return self._scalar_range
+
+    def get_read_stats(self):
+        """Returns a dictionary with the number of `reads` of the array
+        done so far and the number of `bytes` read."""
+        alg = self._algorithm
+        return {'reads': alg.n_reads, 'bytes': alg.n_bytes_read}
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _update_output(self):
+        """Updates the pipeline information and reads a first slice of
+        the array, so that the output is not empty."""
+        alg = self._algorithm
+        alg.UpdateInformation()
+        if alg.array is not None:
+            ext = list(alg.get_whole_extent())
+            ext[5] = ext[4]
+            alg.UpdateExtent(ext)
+        self.fire_data_changed()
+
+    def _scalar_data_changed(self, data):
+        if data is not None:
+            assert len(data.shape) in (2, 3), \
+                   "Scalar array must be 2 or 3 dimensional"
+        self._algorithm.array = data
+        self._scalar_range = None
+        self.reader.modified()
+        self._update_output()
+
+    def _close_file(self):
+        """Closes the HDF5 file opened from `file_name`.  Returns True
+        if a file was closed."""
+        h5_file = self._h5_file
+        if h5_file is None:
+            return False
+        self._h5_file = None
+        self._algorithm.array = None
+        h5_file.close()
+        return True
+
+    def _file_name_changed(self, value):
+        self._close_file()
+        if len(value) == 0:
+            return
+        data = open_array(
+            value, dtype=self.raw_dtype, shape=self.raw_shape,
+            header_size=self.header_size, fortran_order=self.fortran_order,
+            dataset_name=self.dataset_name
+        )
+        self.scalar_data = data
+        self._h5_file = getattr(data, 'file', None)
+        self.name = basename(value)
+
+    def _scalar_name_changed(self, value):
+        self._algorithm.name = value
+        self.update()
+
+    def _spacing_changed(self, value):
+        self._algorithm.spacing = value
+        self.update()
+
+    def _origin_changed(self, value):
+        self._algorithm.origin = value
+        self.update()
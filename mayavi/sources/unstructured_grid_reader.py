@@ -110,7 +110,7 @@ class UnstructuredGridReader(FileDataSource):
             self.outputs = [self.reader.output]
 
         if self.outputs == old_outputs:
-            self.data_changed = True
+            self.fire_data_changed()
 
         # Change our name on the tree view
         self.name = self._get_name()
@@ -81,4 +81,4 @@ class VolumeReader(Source):
         self.reader.update_information()
         self.reader.on_trait_change(self.render)
         self.outputs = [self.reader.output]
-        self.data_changed = True
+        self.fire_data_changed()
@@ -21,6 +21,7 @@ from tvtk import messenger
 # Local imports.
 from tvtk.common import is_old_pipeline, configure_input_data
 from mayavi.core.source import Source
+from mayavi.core import dataset_store
 from mayavi.core.common import handle_children_state
 from mayavi.core.trait_defs import DEnum
 from mayavi.core.pipeline_info import (PipelineInfo,
@@ -66,7 +67,8 @@ class VTKDataSource(Source):
 
     """This source manages a VTK dataset given to it.  When this
     source is pickled or persisted, it saves the data given to it in
-    the form of a gzipped string.
+    the form of a gzipped string, or in a binary dataset store when
+    the visualization is saved with `binary=True`.
 
     Note that if the VTK dataset has changed internally and you need
     to notify the mayavi pipeline to flush the data just call the
@@ -160,17 +162,22 @@ class VTKDataSource(Source):
             d.pop('_' + name + '_name', None)
         data = self.data
         if data is not None:
-            sdata = write_dataset_to_string(data)
-            if sys.version_info[0] > 2:
-                z = gzip_string(sdata.encode('ascii'))
-            else:
-                z = gzip_string(sdata)
+            # Use the binary dataset store when saving to one.
+            z = dataset_store.dump_dataset(data)
+            if z is None:
+                sdata = write_dataset_to_string(data)
+                if sys.version_info[0] > 2:
+                    z = gzip_string(sdata.encode('ascii'))
+                else:
+                    z = gzip_string(sdata)
             d['data'] = z
         return d
 
     def __set_pure_state__(self, state):
         z = state.data
-        if z is not None:
+        if z is not None and dataset_store.is_dataset_reference(z):
+            self.data = tvtk.to_tvtk(dataset_store.load_dataset(z))
+        elif z is not None:
             if sys.version_info[0] > 2:
                 d = gunzip_string(z).decode('ascii')
             else:
@@ -229,7 +236,7 @@ class VTKDataSource(Source):
             self.outputs = [aa.output]
         else:
             self.outputs = [self.data]
-        self.data_changed = True
+        self.fire_data_changed()
 
         self.output_info.datasets = \
                 [get_tvtk_dataset_name(self.outputs[0])]
@@ -251,7 +258,7 @@ class VTKDataSource(Source):
 
     def _fire_data_changed(self, *args):
         """Simply fire the `data_changed` event."""
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _set_data_name(self, data_type, attr_type, value):
         if value is None:
@@ -263,7 +270,7 @@ class VTKDataSource(Source):
             d = getattr(dataset, attr_type + '_data')
             method = getattr(d, 'set_active_%s'%data_type)
             method(None)
-            self.data_changed = True
+            self.fire_data_changed()
             return
 
         aa = self._assign_attribute
@@ -285,7 +292,7 @@ class VTKDataSource(Source):
                 aa.output.scalar_type = s.data_type
         aa.update()
         # Fire an event, so the changes propagate.
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _point_scalars_name_changed(self, value):
         self._set_data_name('scalars', 'point', value)
@@ -350,7 +357,7 @@ class VTKDataSource(Source):
         if self._first:
             self._first = False
         # Propagate the data changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _get_name(self):
         """ Gets the name to display on the tree.
@@ -273,7 +273,7 @@ class VTKXMLFileReader(FileDataSource):
         if self._first:
             self._first = False
         # Propagate the data changed event.
-        self.data_changed = True
+        self.fire_data_changed()
 
     def has_output_port(self):
         """ Return True as the reader has output port."""
@@ -334,7 +334,7 @@ class VTKXMLFileReader(FileDataSource):
             d = getattr(reader_output, attr_type + '_data')
             method = getattr(d, 'set_active_%s'%data_type)
             method(None)
-            self.data_changed = True
+            self.fire_data_changed()
             return
 
         aa = self._assign_attribute
@@ -349,7 +349,7 @@ class VTKXMLFileReader(FileDataSource):
         aa.assign(value, data_type.upper(), attr_type.upper() +'_DATA')
         aa.update()
         # Fire an event, so the changes propagate.
-        self.data_changed = True
+        self.fire_data_changed()
 
     def _point_scalars_name_changed(self, value):
         self._set_data_name('scalars', 'point', value)
@@ -369,6 +369,16 @@ class VTKXMLFileReader(FileDataSource):
     def _cell_tensors_name_changed(self, value):
         self._set_data_name('tensors', 'cell', value)
 
+    def _make_reader(self, file_name):
+        """Returns a new reader for `file_name` configured like the
+        current one."""
+        if self.reader is None:
+            return None
+        reader = self.reader.__class__()
+        reader.__setstate__(self.reader.__getstate__())
+        reader.file_name = file_name
+        return reader
+
     def _get_name(self):
         """ Gets the name to display on the tree view.
         """
@@ -140,6 +140,47 @@ class TestArraySource(unittest.TestCase):
         self.assertEqual(numpy.allclose(vec2.flatten(),
                          expect[1].flatten()), True)
 
+    def test_fortran_ordered_data_is_not_copied(self):
+        "Test if Fortran-ordered scalars are used without a copy."
+        d = self.data
+        sc = numpy.asfortranarray(numpy.random.random((3, 4, 5)))
+        d.scalar_data = sc
+        sc1 = d.image_data.point_data.scalars.to_array()
+        self.assertTrue(numpy.may_share_memory(sc1, sc))
+        self.assertTrue(numpy.allclose(sc1, numpy.transpose(sc).flatten()))
+        self.assertEqual(tuple(d.image_data.dimensions), (3, 4, 5))
+
+    def test_update_data(self):
+        "Test if the data can be replaced in place."
+        d = self.data
+        sc, vec = self.make_3d_data()
+        d.scalar_data = sc
+        d.vector_data = vec
+        d.start()
+        pd = d.image_data.point_data
+        scalars, vectors = pd.scalars, pd.vectors
+
+        sc1, vec1 = sc*2, vec*2
+        d.update_data(scalar_data=sc1, vector_data=vec1)
+        self.assertTrue(d.scalar_data is sc1)
+        self.assertTrue(d.vector_data is vec1)
+        pd = d.image_data.point_data
+        self.assertTrue(pd.scalars is scalars)
+        self.assertTrue(pd.vectors is vectors)
+        tps = numpy.transpose
+        self.assertTrue(numpy.allclose(pd.scalars.to_array(),
+                                       tps(sc1).flatten()))
+        self.assertTrue(numpy.allclose(pd.vectors.to_array().flatten(),
+                                       tps(vec1, (2, 1, 0, 3)).flatten()))
+
+        # A different shape replaces the arrays.
+        d.vector_data = None
+        sc2 = numpy.ones((3, 3, 3))
+        d.update_data(scalar_data=sc2)
+        self.assertEqual(tuple(d.image_data.dimensions), (3, 3, 3))
+        self.assertTrue(numpy.allclose(
+            d.image_data.point_data.scalars.to_array(), 1.0))
+
     def test_pickle(self):
         "Test if pickling works."
 
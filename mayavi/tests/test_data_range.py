@@ -0,0 +1,73 @@
+"""
+Tests for the cached data ranges of the module manager.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+
+import numpy as np
+
+from tvtk.api import tvtk
+from mayavi.core import module_manager
+from mayavi.core.module_manager import DataAttributes, get_data_range
+
+
+class TestGetDataRange(unittest.TestCase):
+
+    def setUp(self):
+        self._chunk_size = module_manager.RANGE_CHUNK_SIZE
+        # Use small chunks to exercise the chunked scans.
+        module_manager.RANGE_CHUNK_SIZE = 7
+
+    def tearDown(self):
+        module_manager.RANGE_CHUNK_SIZE = self._chunk_size
+
+    def test_scalar_range(self):
+        a = np.linspace(-1.0, 2.0, 100)
+        arr = tvtk.DoubleArray()
+        arr.from_array(a)
+        self.assertEqual(get_data_range(arr), (-1.0, 2.0, False))
+
+        # NaNs are ignored but reported.
+        a[50] = np.nan
+        arr.modified()
+        self.assertEqual(get_data_range(arr), (-1.0, 2.0, True))
+
+    def test_vector_range(self):
+        v = np.array([[1.0, 0.0, 0.0], [3.0, 4.0, 0.0], [0.0, 2.0, 0.0]])
+        arr = tvtk.DoubleArray()
+        arr.from_array(v)
+        self.assertEqual(get_data_range(arr, vectors=True),
+                         (0.0, 5.0, False))
+
+        v[0] = np.nan
+        arr.modified()
+        self.assertEqual(get_data_range(arr, vectors=True),
+                         (2.0, 5.0, True))
+
+    def test_range_is_cached_until_modified(self):
+        # Given
+        arr = tvtk.FloatArray()
+        arr.from_array(np.arange(10, dtype='f'))
+        rng = get_data_range(arr)
+
+        # When
+        arr.to_array()[0] = -5.0
+
+        # Then
+        self.assertIs(get_data_range(arr), rng)
+        arr.modified()
+        self.assertEqual(get_data_range(arr), (-5.0, 9.0, False))
+
+    def test_data_attributes(self):
+        arr = tvtk.FloatArray()
+        arr.from_array(np.array([np.nan, 1.0, 3.0], dtype='f'))
+        da = DataAttributes()
+        da.compute_scalar(arr)
+        self.assertEqual(da.range, [1.0, 3.0])
+        self.assertEqual(da.name, 'point_scalars')
+
+
+if __name__ == '__main__':
+    unittest.main()
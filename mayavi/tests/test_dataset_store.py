@@ -0,0 +1,234 @@
+"""
+Tests for the binary dataset store.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+import vtk
+from vtk.util import numpy_support
+
+from mayavi.core import dataset_store
+
+
+def _to_array(vtk_arr):
+    return numpy_support.vtk_to_numpy(vtk_arr)
+
+
+class TestDatasetStore(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.fname = os.path.join(self.root, 'test.mv2.data')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _save_and_load(self, data, compress=False, mmap=True):
+        with dataset_store.saving(self.fname, compress=compress):
+            ref = dataset_store.dump_dataset(data)
+        self.assertTrue(dataset_store.is_dataset_reference(ref))
+        with dataset_store.loading(self.root):
+            return dataset_store.load_dataset(ref, mmap=mmap)
+
+    def check_polydata(self, compress, mmap=True):
+        src = vtk.vtkSphereSource()
+        src.Update()
+        data = src.GetOutput()
+        scalars = numpy_support.numpy_to_vtk(
+            numpy.arange(data.GetNumberOfPoints(), dtype=float)
+        )
+        scalars.SetName('index')
+        data.GetPointData().SetScalars(scalars)
+
+        result = self._save_and_load(data, compress, mmap)
+
+        self.assertEqual(result.GetClassName(), 'vtkPolyData')
+        self.assertEqual(result.GetNumberOfPoints(),
+                         data.GetNumberOfPoints())
+        self.assertEqual(result.GetNumberOfPolys(), data.GetNumberOfPolys())
+        self.assertTrue(numpy.allclose(_to_array(result.GetPoints().GetData()),
+                                       _to_array(data.GetPoints().GetData())))
+        cell, expected = vtk.vtkIdList(), vtk.vtkIdList()
+        result.GetCellPoints(10, cell)
+        data.GetCellPoints(10, expected)
+        self.assertEqual([cell.GetId(i) for i in range(cell.GetNumberOfIds())],
+                         [expected.GetId(i)
+                          for i in range(expected.GetNumberOfIds())])
+        pd = result.GetPointData()
+        self.assertEqual(pd.GetScalars().GetName(), 'index')
+        self.assertTrue(numpy.all(_to_array(pd.GetScalars()) ==
+                                  _to_array(scalars)))
+        self.assertTrue(numpy.allclose(_to_array(pd.GetNormals()),
+                                       _to_array(data.GetPointData().GetNormals())))
+
+    def test_polydata(self):
+        self.check_polydata(compress=False)
+
+    def test_polydata_compressed(self):
+        self.check_polydata(compress=True)
+
+    def test_polydata_no_mmap(self):
+        self.check_polydata(compress=False, mmap=False)
+
+    def test_image_data(self):
+        src = vtk.vtkRTAnalyticSource()
+        src.Update()
+        data = src.GetOutput()
+
+        result = self._save_and_load(data)
+
+        self.assertEqual(result.GetClassName(), 'vtkImageData')
+        self.assertEqual(result.GetExtent(), data.GetExtent())
+        self.assertEqual(result.GetSpacing(), data.GetSpacing())
+        self.assertEqual(result.GetOrigin(), data.GetOrigin())
+        self.assertTrue(numpy.all(
+            _to_array(result.GetPointData().GetScalars()) ==
+            _to_array(data.GetPointData().GetScalars())
+        ))
+
+    def test_unstructured_grid(self):
+        src = vtk.vtkSphereSource()
+        app = vtk.vtkAppendFilter()
+        app.SetInputConnection(src.GetOutputPort())
+        app.Update()
+        data = app.GetOutput()
+
+        result = self._save_and_load(data)
+
+        self.assertEqual(result.GetClassName(), 'vtkUnstructuredGrid')
+        self.assertEqual(result.GetNumberOfCells(), data.GetNumberOfCells())
+        self.assertEqual(result.GetCellType(3), data.GetCellType(3))
+        self.assertEqual(result.GetBounds(), data.GetBounds())
+
+    def test_string_and_long_long_arrays(self):
+        src = vtk.vtkRTAnalyticSource()
+        src.Update()
+        data = src.GetOutput()
+        n = data.GetNumberOfPoints()
+        ids = vtk.vtkLongLongArray()
+        ids.SetName('ids')
+        ids.SetNumberOfTuples(n)
+        for i in range(n):
+            ids.SetValue(i, 2**40 + i)
+        data.GetPointData().AddArray(ids)
+        labels = vtk.vtkStringArray()
+        labels.SetName('labels')
+        labels.InsertNextValue('a')
+        labels.InsertNextValue('b')
+        data.GetFieldData().AddArray(labels)
+
+        result = self._save_and_load(data)
+
+        ids1 = result.GetPointData().GetArray('ids')
+        self.assertEqual(ids1.GetDataType(), vtk.VTK_LONG_LONG)
+        self.assertTrue(numpy.all(_to_array(ids1) == _to_array(ids)))
+        labels1 = result.GetFieldData().GetAbstractArray('labels')
+        self.assertEqual(labels1.GetClassName(), 'vtkStringArray')
+        self.assertEqual([labels1.GetValue(i) for i in range(2)],
+                         ['a', 'b'])
+
+    def test_unsupported_arrays_are_not_stored(self):
+        src = vtk.vtkRTAnalyticSource()
+        src.Update()
+        data = src.GetOutput()
+        variants = vtk.vtkVariantArray()
+        variants.SetName('variants')
+        variants.InsertNextValue(vtk.vtkVariant(1))
+        data.GetFieldData().AddArray(variants)
+        with dataset_store.saving(self.fname) as writer:
+            self.assertIsNone(dataset_store.dump_dataset(data))
+            self.assertEqual(writer.nbytes_written, 0)
+
+    def test_save_over_loaded_store(self):
+        src = vtk.vtkRTAnalyticSource()
+        src.Update()
+        data = src.GetOutput()
+        expected = _to_array(data.GetPointData().GetScalars()).copy()
+        with dataset_store.saving(self.fname):
+            ref = dataset_store.dump_dataset(data)
+        with dataset_store.loading(self.root):
+            result = dataset_store.load_dataset(ref)
+
+        # When
+        with dataset_store.saving(self.fname):
+            ref1 = dataset_store.dump_dataset(result)
+
+        # Then
+        self.assertEqual(ref1, ref)
+        self.assertEqual(os.listdir(self.root), ['test.mv2.data'])
+        scalars = result.GetPointData().GetScalars()
+        self.assertTrue(numpy.all(_to_array(scalars) == expected))
+        with dataset_store.loading(self.root):
+            result1 = dataset_store.load_dataset(ref1)
+        self.assertTrue(numpy.all(
+            _to_array(result1.GetPointData().GetScalars()) == expected
+        ))
+
+    def test_failed_save_keeps_store(self):
+        src = vtk.vtkRTAnalyticSource()
+        src.Update()
+        with dataset_store.saving(self.fname):
+            ref = dataset_store.dump_dataset(src.GetOutput())
+
+        # When
+        with self.assertRaises(ValueError):
+            with dataset_store.saving(self.fname):
+                raise ValueError()
+
+        # Then
+        self.assertEqual(os.listdir(self.root), ['test.mv2.data'])
+        with dataset_store.loading(self.root):
+            dataset_store.load_dataset(ref)
+
+    def test_dataset_written_once(self):
+        src = vtk.vtkRTAnalyticSource()
+        src.Update()
+        data = src.GetOutput()
+        with dataset_store.saving(self.fname) as writer:
+            dataset_store.dump_dataset(data)
+            n_arrays = len(writer._arrays)
+            dataset_store.dump_dataset(data)
+            self.assertEqual(len(writer._arrays), n_arrays)
+
+    def test_identical_arrays_are_shared(self):
+        src = vtk.vtkRTAnalyticSource()
+        src.Update()
+        data = src.GetOutput()
+        copy = vtk.vtkImageData()
+        copy.DeepCopy(data)
+        with dataset_store.saving(self.fname) as writer:
+            ref = dataset_store.dump_dataset(data)
+            n_arrays = len(writer._arrays)
+            ref1 = dataset_store.dump_dataset(copy)
+        self.assertEqual(len(writer._arrays), n_arrays)
+        self.assertTrue(writer.nbytes_shared > 0)
+        self.assertEqual(ref, ref1)
+
+        # Identical datasets are shared when loaded together.
+        with dataset_store.loading(self.root):
+            result = dataset_store.load_dataset(ref)
+            result1 = dataset_store.load_dataset(ref1)
+        self.assertTrue(result is result1)
+        with dataset_store.loading(self.root):
+            result2 = dataset_store.load_dataset(ref)
+        self.assertFalse(result2 is result)
+
+    def test_legacy_data_is_not_a_reference(self):
+        self.assertFalse(dataset_store.is_dataset_reference(b'\x1f\x8b\x08'))
+        self.assertIsNone(dataset_store.dump_dataset(vtk.vtkPolyData()))
+
+    def test_invalid_store(self):
+        with open(self.fname, 'wb') as fp:
+            fp.write(b'x'*100)
+        self.assertRaises(IOError, dataset_store.DatasetStoreReader,
+                          self.fname)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ import shutil
 import mock
 
 from mayavi.core.null_engine import NullEngine
+from mayavi.core.file_data_source import get_file_list
 from mayavi.sources.vtk_xml_file_reader import VTKXMLFileReader
 from mayavi.modules.outline import Outline
 from mayavi.tests.common import get_example_data
@@ -181,6 +182,24 @@ class TestFileDataSourceTimestep(unittest.TestCase):
         self.assertEqual(r._max_timestep, 2)
         self.assertEqual(len(r.file_list), 3)
 
+    def test_update_files_rescans_unmodified_directory(self):
+        # Given
+        e = self.engine
+        r = VTKXMLFileReader()
+        r.initialize(self.abc1)
+        e.add_source(r)
+        self.assertEqual(len(r.file_list), 2)
+
+        # When
+        st = os.stat(self.root)
+        shutil.copy(self.abc1, os.path.join(self.root, 'abc_3.vti'))
+        # The modification time of the directory does not change.
+        os.utime(self.root, (st.st_atime, st.st_mtime))
+        r.update_files = True
+
+        # Then
+        self.assertEqual(len(r.file_list), 3)
+
     def test_update_files_updates_all_file_lists(self):
         # Given
         e = self.engine
@@ -209,6 +228,184 @@ class TestFileDataSourceTimestep(unittest.TestCase):
         self.assertEqual(r2._max_timestep, 2)
         self.assertEqual(len(r2.file_list), 3)
 
+    def test_prefetch_caches_timesteps(self):
+        # Given
+        e = self.engine
+        r = VTKXMLFileReader()
+        r.initialize(self.abc1)
+        r.timestep = 0
+        e.add_source(r)
+        o = Outline()
+        e.add_module(o)
+        bounds = o.outline_filter.output.bounds
+
+        # When
+        r.prefetch = 1
+        r.timestep = 1
+        r.timestep = 0
+
+        # Then
+        stats = r.get_cache_stats()
+        self.assertEqual(stats['prefetched'], 1)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 0)
+        self.assertEqual(stats['n_cached'], 1)
+        self.assertTrue(stats['nbytes'] > 0)
+        self.assertEqual(r.reader.file_name, self.abc1)
+        o.outline_filter.update()
+        self.assertEqual(o.outline_filter.output.bounds, bounds)
+
+        # When
+        r.cache_size = 0
+
+        # Then
+        stats = r.get_cache_stats()
+        self.assertEqual(stats['n_cached'], 0)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_failed_prefetch_reads_file_again(self):
+        # Given
+        e = self.engine
+        r = VTKXMLFileReader()
+        r.initialize(self.abc1)
+        r.timestep = 0
+        e.add_source(r)
+        o = Outline()
+        e.add_module(o)
+        bounds = o.outline_filter.output.bounds
+        with open(self.abc2, 'w') as f:
+            f.write('garbage')
+        r.prefetch = 1
+        reader, result = r._pending[self.abc2]
+        result.wait()
+        self.assertFalse(result.successful())
+        shutil.copy(self.cube, self.abc2)
+
+        # When
+        r.timestep = 1
+
+        # Then
+        stats = r.get_cache_stats()
+        self.assertEqual(stats['hits'], 0)
+        self.assertEqual(stats['misses'], 1)
+        self.assertIsNot(r.reader, reader)
+        self.assertEqual(r.reader.file_name, self.abc2)
+        o.outline_filter.update()
+        self.assertEqual(o.outline_filter.output.bounds, bounds)
+
+    def test_cached_timestep_fires_pipeline_changed_once(self):
+        # Given
+        e = self.engine
+        r = VTKXMLFileReader()
+        r.initialize(self.abc1)
+        r.timestep = 0
+        e.add_source(r)
+        r.prefetch = 1
+        r.timestep = 1
+        events = []
+        r.on_trait_change(lambda: events.append(1), 'pipeline_changed')
+
+        # When
+        r.timestep = 0
+
+        # Then
+        self.assertEqual(r.get_cache_stats()['hits'], 2)
+        self.assertEqual(len(events), 1)
+
+    def test_stop_closes_prefetch_threads(self):
+        # Given
+        e = self.engine
+        r = VTKXMLFileReader()
+        r.initialize(self.abc1)
+        r.timestep = 0
+        e.add_source(r)
+        r.prefetch = 1
+        pool = r._pool
+        self.assertIsNotNone(pool)
+
+        # When
+        r.stop()
+
+        # Then
+        self.assertIsNone(r._pool)
+        for worker in pool._pool:
+            self.assertFalse(worker.is_alive())
+
+    def test_play_uses_prefetched_timesteps(self):
+        # Given
+        e = self.engine
+        r = VTKXMLFileReader()
+        r.initialize(self.abc1)
+        r.timestep = 0
+        r.prefetch = 2
+        e.add_source(r)
+        o = Outline()
+        e.add_module(o)
+
+        # When
+        r.play = True
+
+        # Then
+        self.assertEqual(r.timestep, 1)
+        self.assertEqual(r.get_cache_stats()['hits'], 1)
+
+
+class TestGetFileList(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _touch(self, *names):
+        for name in names:
+            open(os.path.join(self.root, name), 'w').close()
+
+    def test_padded_and_unpadded_indices_are_sorted(self):
+        # Given
+        self._touch('abc_1.vtk', 'abc_02.vtk', 'abc_10.vtk', 'abc_3.vtk',
+                    'abc_2s.vtk', 'def_1.vtk')
+
+        # When
+        files = get_file_list(os.path.join(self.root, 'abc_3.vtk'))
+
+        # Then
+        expected = [os.path.join(self.root, x) for x in
+                    ('abc_1.vtk', 'abc_02.vtk', 'abc_3.vtk', 'abc_10.vtk')]
+        self.assertEqual(files, expected)
+
+    def test_new_files_are_found(self):
+        # Given
+        self._touch('abc_1.vtk', 'abc_2.vtk')
+        fname = os.path.join(self.root, 'abc_1.vtk')
+        self.assertEqual(len(get_file_list(fname)), 2)
+
+        # When
+        self._touch('abc_3.vtk')
+        # Make sure the modification time of the directory changes.
+        st = os.stat(self.root)
+        os.utime(self.root, (st.st_atime, st.st_mtime + 10))
+
+        # Then
+        self.assertEqual(len(get_file_list(fname)), 3)
+
+    def test_pvd_file(self):
+        # Given
+        pvd = os.path.join(self.root, 'data.pvd')
+        with open(pvd, 'w') as fp:
+            fp.write('<VTKFile type="Collection"><Collection>'
+                     '<DataSet timestep="1" part="0" file="b.vtu"/>'
+                     '<DataSet timestep="0" part="0" file="a.vtu"/>'
+                     '<DataSet timestep="0" part="1" file="c.vtu"/>'
+                     '</Collection></VTKFile>')
+
+        # When
+        files = get_file_list(pvd)
+
+        # Then
+        expected = [os.path.join(self.root, x) for x in ('a.vtu', 'b.vtu')]
+        self.assertEqual(files, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
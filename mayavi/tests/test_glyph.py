@@ -13,6 +13,7 @@ import unittest
 
 # Local imports.
 from mayavi.core.null_engine import NullEngine
+from mayavi.core.off_screen_engine import OffScreenEngine
 
 # Enthought library imports
 from mayavi.sources.array_source import ArraySource
@@ -158,6 +159,59 @@ class TestGlyph(unittest.TestCase):
         g.glyph.mask_input_points = True
         self.check(mask=True)
 
+    def test_instancing(self):
+        """Test if the glyphs can be rendered by instancing."""
+        g = self.g
+        src = self.scene.children[0]
+        n_output_points = src.outputs[0].number_of_points
+
+        # When
+        g.glyph.instancing = True
+
+        # Then
+        gm = g.glyph.glyph_mapper
+        self.assertIs(g.actor.mapper, gm)
+        self.assertTrue(gm.is_a('vtkGlyph3DMapper'))
+        gm.update()
+        self.assertEqual(gm.input.number_of_points, n_output_points)
+        self.assertEqual(gm.scale_factor, 0.5)
+        self.assertEqual(gm.scale_mode, 'scale_by_magnitude')
+        self.assertEqual(gm.range, g.glyph.glyph.range)
+
+        # Changes to the glyph settings are used by the mapper.
+        g.glyph.glyph.scale_factor = 0.25
+        self.assertEqual(gm.scale_factor, 0.25)
+        g.glyph.scale_mode = 'data_scaling_off'
+        self.assertEqual(gm.scale_mode, 'no_data_scaling')
+
+        # Masking applies to the instanced points.
+        g.glyph.mask_points.random_mode = 0
+        g.glyph.mask_input_points = True
+        gm.update()
+        on_ratio = g.glyph.mask_points.on_ratio
+        self.assertEqual(gm.input.number_of_points,
+                         n_output_points / on_ratio)
+
+        # When
+        g.glyph.instancing = False
+
+        # Then
+        self.assertTrue(g.actor.mapper.is_a('vtkPolyDataMapper'))
+        self.assertEqual(g.glyph.outputs[0], g.glyph.glyph.output_port)
+
+    def test_vector_mode_is_only_set_for_instancing(self):
+        """Test if the vector LUT maps magnitudes only when instancing."""
+        v = self.v
+        lut = v.module_manager.vector_lut_manager.lut
+        self.assertEqual(lut.vector_mode, 'component')
+
+        # When
+        v.glyph.instancing = True
+
+        # Then
+        self.assertIs(v.actor.mapper, v.glyph.glyph_mapper)
+        self.assertEqual(lut.vector_mode, 'magnitude')
+
     def test_components_changed(self):
         """"Test if the modules respond correctly when the components
             are changed."""
@@ -221,5 +275,86 @@ class TestGlyph(unittest.TestCase):
         s.children[:] = sources1
         self.check()
 
+
+class TestGlyphLOD(unittest.TestCase):
+
+    def setUp(self):
+        e = OffScreenEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+        d = ArraySource()
+        d.scalar_data = numpy.arange(1000.0).reshape(10, 10, 10)
+        v = numpy.zeros((10, 10, 10, 3))
+        v[..., 1] = 1.0
+        d.vector_data = v
+        e.add_source(d)
+        g = Glyph()
+        e.add_module(g)
+        g.glyph.lod = True
+        self.src = d
+        self.g = g
+        self.scene = e.current_scene.scene
+
+    def tearDown(self):
+        self.e.stop()
+
+    def render(self, interactive):
+        scene = self.scene
+        rw = scene.render_window
+        if interactive:
+            # Ask for more frames per second than can be rendered.
+            rw.desired_update_rate = 1.0e6
+        else:
+            rw.desired_update_rate = scene.interactor.still_update_rate
+        scene.render()
+
+    def test_lod(self):
+        """Test if the points are subsampled during interaction."""
+        g = self.g
+        n_output_points = self.src.outputs[0].number_of_points
+
+        for instancing, n_points in ((False, 100), (True, 200)):
+            g.glyph.instancing = instancing
+            if instancing:
+                target = g.glyph.glyph_mapper
+            else:
+                target = g.glyph.glyph
+            g.glyph.lod_points = n_points
+
+            # When
+            self.render(interactive=True)
+
+            # Then
+            self.assertEqual(target.input.number_of_points, n_points)
+            # The frame was too slow, so the budget shrinks.
+            self.assertTrue(g.glyph._lod_budget < n_points)
+
+            # When
+            self.render(interactive=True)
+
+            # Then
+            self.assertTrue(target.input.number_of_points < n_points)
+
+            # When
+            self.render(interactive=False)
+
+            # Then
+            self.assertEqual(target.input.number_of_points, n_output_points)
+
+    def test_stop_removes_renderer_observers(self):
+        g = self.g
+        target = g.glyph.glyph
+        n_output_points = self.src.outputs[0].number_of_points
+
+        # When
+        g.glyph.stop()
+        self.render(interactive=True)
+
+        # Then
+        self.assertIsNone(g.glyph._lod_renderer)
+        self.assertEqual(target.input.number_of_points, n_output_points)
+
+
 if __name__ == '__main__':
     unittest.main()
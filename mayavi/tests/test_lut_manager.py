@@ -0,0 +1,76 @@
+"""
+Tests for the lookup table utilities of the LUTManager.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from tvtk.api import tvtk
+from mayavi.core.lut_manager import (LUTManager, get_pylab_lut_table,
+                                     parse_lut_file, pylab_luts,
+                                     read_lut_file, set_lut)
+
+
+class TestLUTManager(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write_lut(self, text):
+        fname = os.path.join(self.root, 'test.lut')
+        with open(fname, 'w') as f:
+            f.write(text)
+        return fname
+
+    def test_read_lut_file(self):
+        fname = self.write_lut('LOOKUP_TABLE test 2\n'
+                               '0.0 0.0 1.0 1.0\n'
+                               '1.0 0.0 0.0 0.5\n')
+        lut = read_lut_file(fname)
+        self.assertEqual(lut.shape, (2, 4))
+        self.assertEqual(parse_lut_file(fname), lut.tolist())
+
+        vtk_lut = set_lut(tvtk.LookupTable(), lut)
+        self.assertEqual(vtk_lut.number_of_colors, 2)
+        self.assertTrue(numpy.allclose(vtk_lut.get_table_value(1),
+                                       (1.0, 0.0, 0.0, 0.5), atol=1.0/255))
+
+        fname = self.write_lut('LOOKUP_TABLE test 2\n0.0 0.0 1.0\n')
+        self.assertRaises(IOError, read_lut_file, fname)
+        fname = self.write_lut('LOOKUP_TABLE test 1\n0.0 a 1.0 1.0\n')
+        self.assertRaises(IOError, read_lut_file, fname)
+
+    @unittest.skipIf(len(pylab_luts) == 0, "No pylab colormaps.")
+    def test_pylab_lut_tables_are_cached(self):
+        table = get_pylab_lut_table('jet', 256)
+        self.assertEqual(table.dtype, numpy.uint8)
+        self.assertEqual(table.shape[1], 4)
+        self.assertTrue(get_pylab_lut_table('jet', 256) is table)
+        reverse = get_pylab_lut_table('jet', 256, reverse=True)
+        self.assertTrue(numpy.all(reverse == table[::-1]))
+
+        lm = LUTManager(lut_mode='jet', number_of_colors=256)
+        self.assertEqual(lm.lut.number_of_colors, len(table))
+        self.assertEqual(tuple(lm.lut.table.to_array()[0]),
+                         tuple(table[0]))
+
+        # The table of the LUT can be modified without changing the
+        # cached table.
+        lut = lm.lut.table.to_array()
+        lut[:, -1] = 0
+        lm.lut.table = lut
+        self.assertEqual(table[0, -1], 255)
+        self.assertFalse(table.flags.writeable)
+
+
+if __name__ == '__main__':
+    unittest.main()
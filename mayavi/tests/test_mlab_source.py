@@ -158,6 +158,36 @@ class TestMGlyphSource(unittest.TestCase):
         self.check_traits()
         self.check_dataset()
 
+    def test_update_data(self):
+        "Test if the data is updated in place."
+        x, y, z, v, s, src = self.get_data()
+        pts = src.dataset.points.to_array()
+        sc = src.dataset.point_data.scalars.to_array()
+        self.x = x = x*2
+        self.s = s = s*3
+        self.v = v = v.copy()
+        v[:,1] = 5.0
+        src.update_data(x=x, v=v[:,1], scalars=s)
+        self.check_traits()
+        self.check_dataset()
+        # The VTK arrays must not have been reallocated.
+        self.assertEqual(N.may_share_memory(pts,
+                                src.dataset.points.to_array()), True)
+        self.assertEqual(N.may_share_memory(sc,
+                                src.dataset.point_data.scalars.to_array()),
+                         True)
+
+        # Changing the size should reset the source.
+        self.x = x = N.ones(20, float)
+        self.y = y = N.ones(20, float)*2.0
+        self.z = z = N.linspace(0, 10, 20)
+        self.v = v = N.ones((20, 3), float)
+        self.s = s = N.ones(20, float)
+        src.update_data(x=x, y=y, z=z, u=v[:,0], v=v[:,1], w=v[:,2],
+                        scalars=s)
+        self.check_traits()
+        self.check_dataset()
+
     def test_strange_shape(self):
         " Test the MGlyphSource with strange shapes for the arguments "
         x, y, z, v, s, src = self.get_data()
@@ -397,6 +427,24 @@ class TestMArraySource(unittest.TestCase):
         self.check_traits()
         self.check_dataset()
 
+    def test_update_data(self):
+        "Test if the data is updated in place."
+        x, y, z, v, s, src = self.get_data()
+        sc = src.dataset.point_data.scalars.to_array()
+        self.s = s = N.random.random(s.shape)
+        self.v = v = v*2
+        src.update_data(u=v[...,0], scalars=s)
+        self.check_traits()
+        self.check_dataset()
+        self.assertEqual(N.may_share_memory(sc,
+                                src.dataset.point_data.scalars.to_array()),
+                         True)
+        # x is not backed by a VTK array but should still be set.
+        self.x = x = x*2
+        src.update_data(x=x)
+        self.check_traits()
+        self.check_dataset()
+
 
 
 ################################################################################
@@ -894,6 +942,24 @@ class TestMTriangularMeshSource(unittest.TestCase):
 
         self.check_traits()
 
+    def test_update_data(self):
+        "Test if the data is updated in place."
+        x, y, z, triangles, s, src = self.get_data()
+        # The scalars default to z and must not be overwritten.
+        src.reset(x=x, y=y, z=z, triangles=triangles, scalars=z)
+        self.s = s = N.array([1.0, 2.0, 3.0])
+        src.update_data(scalars=s)
+        self.check_traits()
+        self.assertEqual(N.alltrue(z == self.z), True)
+        self.assertEqual(N.alltrue(
+            src.dataset.point_data.scalars.to_array() == s), True)
+
+        self.z = z = N.array([1, 2, 3])
+        src.update_data(z=z)
+        self.check_traits()
+        pts = src.dataset.points.to_array()
+        self.assertEqual(N.alltrue(pts[:,2] == z), True)
+
 
 
 if __name__ == '__main__':
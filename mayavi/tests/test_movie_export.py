@@ -0,0 +1,158 @@
+"""
+Tests for the batch movie export.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.core.off_screen_engine import OffScreenEngine
+from mayavi.sources.vtk_xml_file_reader import VTKXMLFileReader
+from mayavi.tests.common import get_example_data
+from mayavi.tools import movie_export
+from mayavi.tools.movie_export import export_movie, get_time_series, \
+     set_frame
+
+
+# The background of each frame rendered by `FrameColor`.
+COLORS = [(1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 0)]
+
+
+class FrameColor(object):
+    """Picklable frame callback setting the background of the scene
+    from the frame number and failing for the frames in `fail`."""
+    def __init__(self, fail=()):
+        self.fail = fail
+
+    def __call__(self, engine, frame):
+        if frame in self.fail:
+            raise ValueError('Frame %d failed'%frame)
+        set_frame(engine, frame)
+        engine.current_scene.scene.background = COLORS[frame]
+
+
+class TestMovieExport(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        cube = get_example_data('cube.vti')
+        for i in range(3):
+            shutil.copy(cube, os.path.join(self.root, 'abc_%d.vti'%i))
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        r = VTKXMLFileReader()
+        r.initialize(os.path.join(self.root, 'abc_0.vti'))
+        e.add_source(r)
+        self.engine = e
+        self.reader = r
+
+    def tearDown(self):
+        self.engine.stop()
+        shutil.rmtree(self.root)
+
+    def test_set_frame(self):
+        e, r = self.engine, self.reader
+        self.assertEqual(get_time_series(e), [r])
+        set_frame(e, 2)
+        self.assertEqual(r.timestep, 2)
+        set_frame(e, 5)
+        self.assertEqual(r.timestep, 2)
+
+    def test_existing_frames_are_not_rendered_again(self):
+        directory = os.path.join(self.root, 'frames')
+        os.makedirs(directory)
+        for i in range(3):
+            with open(os.path.join(directory, 'anim%05d.png'%i), 'w') as f:
+                f.write('frame')
+        calls = []
+        frames = export_movie(self.engine, directory,
+                              progress=lambda *args: calls.append(args))
+        self.assertEqual([os.path.basename(f) for f in frames],
+                         ['anim00000.png', 'anim00001.png', 'anim00002.png'])
+        self.assertEqual(calls, [(3, 3)])
+
+
+class TestParallelExport(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.directory = os.path.join(self.root, 'frames')
+        e = OffScreenEngine()
+        e.start()
+        e.new_scene()
+        self.engine = e
+
+    def tearDown(self):
+        self.engine.stop()
+        shutil.rmtree(self.root)
+
+    def get_color(self, file_name):
+        r = tvtk.PNGReader(file_name=file_name)
+        r.update()
+        pixels = r.output.point_data.scalars.to_array()
+        return tuple(pixels[0][:3]//255)
+
+    def test_export_in_parallel_and_resume(self):
+        # When
+        calls = []
+        self.assertRaises(RuntimeError, export_movie, self.engine,
+                          self.directory, n_frames=4, n_workers=2,
+                          frame_callback=FrameColor(fail=(2,)),
+                          size=(32, 32),
+                          progress=lambda *args: calls.append(args))
+
+        # Then
+        self.assertEqual(calls[-1], (3, 4))
+        names = sorted(os.listdir(self.directory))
+        self.assertEqual(names, ['anim00000.png', 'anim00001.png',
+                                 'anim00003.png'])
+
+        # When
+        calls = []
+        frames = export_movie(self.engine, self.directory, n_frames=4,
+                              n_workers=2, frame_callback=FrameColor(),
+                              size=(32, 32),
+                              progress=lambda *args: calls.append(args))
+
+        # Then
+        self.assertEqual(calls, [(3, 4), (4, 4)])
+        self.assertEqual([self.get_color(f) for f in frames], COLORS)
+
+    def test_failed_save_leaves_no_partial_frame(self):
+        # Given
+        os.makedirs(self.directory)
+        file_name = os.path.join(self.directory, 'anim00000.png')
+
+        def save(name, **kw):
+            with open(name, 'w') as f:
+                f.write('partial')
+            raise IOError('Disk full')
+
+        self.engine.current_scene.scene.save = save
+        movie_export._worker['engine'] = self.engine
+
+        # When
+        try:
+            frame, err = movie_export._render_frame((0, file_name,
+                                                     set_frame, 1))
+        finally:
+            movie_export._worker.clear()
+
+        # Then
+        self.assertEqual(frame, 0)
+        self.assertTrue('Disk full' in err)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_worker_failure_is_raised(self):
+        missing = os.path.join(self.root, 'missing.mv2')
+        self.assertRaises(RuntimeError, export_movie, missing,
+                          self.directory, n_frames=2, n_workers=2)
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the multi-threaded contours and cut planes.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+
+import numpy
+
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.modules.iso_surface import IsoSurface
+from mayavi.modules.scalar_cut_plane import ScalarCutPlane
+from mayavi.sources.array_source import ArraySource
+
+
+def get_output(component):
+    o = component.outputs[0]
+    o.update()
+    return o.output
+
+
+class TestParallelContour(unittest.TestCase):
+
+    def setUp(self):
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+
+        x, y, z = numpy.ogrid[-5:5:20j, -5:5:20j, -5:5:20j]
+        src = ArraySource(scalar_data=x*x + y*y + z*z)
+        e.add_source(src)
+        self.src = src
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_parallel_iso_surface(self):
+        # Given
+        iso = IsoSurface()
+        self.e.add_module(iso)
+        iso.contour.contours = [10.0, 20.0]
+        expected = get_output(iso.contour).number_of_points
+
+        # When
+        iso.contour.parallel = True
+
+        # Then
+        cf = iso.contour.contour_filter
+        self.assertTrue(cf.is_a('vtkFlyingEdges3D'))
+        self.assertIs(iso.contour.outputs[0], cf)
+        self.assertEqual(cf.number_of_contours, 2)
+        self.assertEqual(get_output(iso.contour).number_of_points, expected)
+
+        # Changing the contours updates the parallel filter.
+        iso.contour.contours = [10.0]
+        self.assertEqual(cf.number_of_contours, 1)
+
+        # When
+        iso.contour.parallel = False
+
+        # Then
+        cf = iso.contour.contour_filter
+        self.assertTrue(cf.is_a('vtkContourFilter'))
+        self.assertEqual(cf.number_of_contours, 1)
+
+    def test_parallel_is_ignored_for_filled_contours(self):
+        iso = IsoSurface()
+        self.e.add_module(iso)
+        iso.contour.parallel = True
+        iso.contour.filled_contours = True
+        cf = iso.contour.contour_filter
+        self.assertTrue(cf.is_a('vtkBandedPolyDataContourFilter'))
+
+    def test_parallel_scalar_cut_plane(self):
+        # Given
+        cp = ScalarCutPlane()
+        self.e.add_module(cp)
+        ip = cp.implicit_plane
+        ip.normal = 0, 0, 1
+        ip.origin = 9.5, 9.5, 9.2
+        expected = get_output(cp.cutter)
+        n_points = expected.number_of_points
+
+        # When
+        cp.cutter.parallel = True
+
+        # Then
+        c = cp.cutter.outputs[0]
+        self.assertTrue(c.is_a('vtkPlaneCutter'))
+        self.assertIs(c.plane, ip.plane)
+        output = get_output(cp.cutter)
+        self.assertEqual(output.number_of_points, n_points)
+        r1 = output.point_data.scalars.range
+        r2 = expected.point_data.scalars.range
+        self.assertTrue(numpy.allclose(r1, r2))
+
+        # When
+        cp.cutter.parallel = False
+
+        # Then
+        self.assertIs(cp.cutter.outputs[0], cp.cutter.cutter)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests that the renders requested while data changes propagate through
+the pipeline are coalesced.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+
+import numpy
+from traits.api import HasTraits, Instance, Int, on_trait_change
+
+from mayavi.core.off_screen_engine import OffScreenEngine
+from mayavi.filters.extract_grid import ExtractGrid
+from mayavi.filters.threshold import Threshold
+from mayavi.modules.outline import Outline
+from mayavi.modules.surface import Surface
+from mayavi.sources.array_source import ArraySource
+
+
+class DataListener(HasTraits):
+    src = Instance(ArraySource)
+    n_changes = Int(0)
+
+    @on_trait_change('src.data_changed')
+    def _on_data_changed(self):
+        self.n_changes += 1
+
+
+class TestRenderCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        e = OffScreenEngine()
+        e.start()
+        e.new_scene()
+        self.e = e
+
+        x, y, z = numpy.ogrid[-5:5:10j, -5:5:10j, -5:5:10j]
+        src = ArraySource(scalar_data=x*x + y*y + z*z)
+        self.src = src
+        e.add_source(src)
+        e.add_module(Outline())
+        eg = ExtractGrid()
+        e.add_filter(eg, obj=src)
+        th = Threshold()
+        e.add_filter(th, obj=eg)
+        e.add_module(Surface(), obj=th)
+        e.add_module(Outline(), obj=th)
+        self.scene = e.current_scene.scene
+
+    def tearDown(self):
+        self.e.stop()
+
+    def test_data_changed_renders_once(self):
+        # Given
+        self.scene.reset_render_stats()
+
+        # When
+        self.src.fire_data_changed()
+
+        # Then
+        stats = self.scene.get_render_stats()
+        self.assertEqual(stats['performed'], 1)
+        self.assertTrue(stats['requested'] > 1)
+
+    def test_listeners_of_data_changed(self):
+        # Given
+        listener = DataListener(src=self.src)
+
+        # When
+        self.src.fire_data_changed()
+        self.src.data_changed = True
+
+        # Then
+        self.assertEqual(listener.n_changes, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for mlab.screenshot.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import unittest
+
+import numpy as np
+
+from mayavi import mlab
+from mayavi.core.off_screen_engine import OffScreenEngine
+
+
+class TestScreenshot(unittest.TestCase):
+    def setUp(self):
+        e = OffScreenEngine()
+        e.start()
+        self.e = e
+        self.fig = mlab.figure(engine=e, size=(64, 48))
+        mlab.points3d([0, 1], [0, 1], [0, 1], figure=self.fig)
+
+    def tearDown(self):
+        mlab.close(self.fig)
+        self.e.stop()
+
+    def test_screenshot_into_buffer(self):
+        x, y = self.fig.scene.get_size()
+        for mode, n, dtype in (('rgb', 3, np.uint8),
+                               ('rgba', 4, np.float32),
+                               ('rgba8', 4, np.uint8)):
+            # Given
+            expected = mlab.screenshot(self.fig, mode=mode)
+            buf = np.zeros((y, x, n), dtype=dtype)
+
+            # When
+            result = mlab.screenshot(self.fig, mode=mode, out=buf)
+
+            # Then
+            self.assertIs(result, buf)
+            self.assertEqual(expected.shape, (y, x, n))
+            self.assertTrue(np.allclose(result, expected))
+
+    def test_rgba8_matches_rgba(self):
+        rgba = mlab.screenshot(self.fig, mode='rgba')
+        rgba8 = mlab.screenshot(self.fig, mode='rgba8')
+        self.assertTrue(np.allclose(rgba8/255.0, rgba, atol=1.0/255))
+
+    def test_invalid_buffer(self):
+        x, y = self.fig.scene.get_size()
+        for buf in (np.zeros((y, x, 4), dtype=np.uint8),
+                    np.zeros((y, x, 3), dtype=np.float32),
+                    np.zeros((x, y, 3), dtype=np.uint8),
+                    np.zeros((y, x, 3), dtype=np.uint8, order='F')):
+            self.assertRaises(ValueError, mlab.screenshot, self.fig,
+                              mode='rgb', out=buf)
+
+
+if __name__ == '__main__':
+    unittest.main()
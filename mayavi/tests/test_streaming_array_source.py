@@ -0,0 +1,153 @@
+"""
+Tests for the StreamingArraySource class.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+import vtk
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+from tvtk.api import tvtk
+from mayavi.core.null_engine import NullEngine
+from mayavi.modules.image_plane_widget import ImagePlaneWidget
+from mayavi.sources.streaming_array_source import (StreamingArraySource,
+                                                   open_array)
+
+
+class TestStreamingArraySource(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.data = numpy.random.random((10, 12, 14)).astype('f')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def get_slice(self, src, k):
+        voi = tvtk.ExtractVOI(voi=(0, 9, 0, 11, k, k))
+        voi.set_input_connection(src.get_output_object())
+        voi.update()
+        return voi.output
+
+    def test_only_requested_extent_is_read(self):
+        "Test if only the slab requested downstream is read."
+        data = self.data
+        src = StreamingArraySource(scalar_data=data, spacing=(1, 2, 3))
+        out = self.get_slice(src, 7)
+        self.assertEqual(tuple(out.dimensions), (10, 12, 1))
+        self.assertEqual(tuple(out.spacing), (1, 2, 3))
+        scalars = out.point_data.scalars.to_array()
+        self.assertTrue(numpy.allclose(scalars,
+                                       data[:, :, 7].ravel(order='F')))
+        # The first slice read by the source and the slice requested.
+        stats = src.get_read_stats()
+        self.assertEqual(stats['bytes'], 2*10*12*4)
+
+    def test_image_plane_widget_streams_slices(self):
+        "Test if an ImagePlaneWidget only reads the slices it shows."
+        data = self.data
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        src = StreamingArraySource(scalar_data=data)
+        e.add_source(src)
+        ipw = ImagePlaneWidget()
+        e.add_module(ipw)
+
+        # When
+        reslice = tvtk.to_vtk(ipw.ipw.reslice)
+        reslice.Update()
+
+        # Then
+        # The widget is connected to the source and sees the whole
+        # extent of the array but only reads a slab of it.
+        producer = reslice.GetInputConnection(0, 0).GetProducer()
+        self.assertIs(producer, tvtk.to_vtk(src.reader))
+        info = reslice.GetInputInformation()
+        whole = info.Get(vtk.vtkStreamingDemandDrivenPipeline.WHOLE_EXTENT())
+        self.assertEqual(tuple(whole), (0, 9, 0, 11, 0, 13))
+        self.assertTrue(src.get_read_stats()['bytes'] < 2*data.nbytes/5)
+        # The plane spans the whole array and not only the slab read.
+        for orientation in ('x_axes', 'y_axes', 'z_axes'):
+            ipw.ipw.plane_orientation = orientation
+            w = ipw.ipw
+            bounds = numpy.array([w.origin, w.point1, w.point2])
+            size = bounds.max(axis=0) - bounds.min(axis=0)
+            axis = ['x_axes', 'y_axes', 'z_axes'].index(orientation)
+            size = numpy.delete(size, axis)
+            expect = numpy.delete(numpy.array(data.shape) - 1, axis)
+            self.assertTrue(numpy.all(size >= expect))
+        # The lookup table covers the whole array.
+        lut_mgr = ipw.module_manager.scalar_lut_manager
+        self.assertTrue(numpy.allclose(lut_mgr.data_range,
+                                       [data.min(), data.max()]))
+        e.stop()
+
+    def test_raw_and_npy_files(self):
+        "Test if raw binary and .npy files are memory mapped."
+        data = self.data
+        npy = os.path.join(self.root, 'data.npy')
+        numpy.save(npy, data)
+        raw = os.path.join(self.root, 'data.raw')
+        with open(raw, 'wb') as f:
+            f.write(b'header')
+            data.tofile(f)
+
+        arr = open_array(npy)
+        self.assertTrue(isinstance(arr, numpy.memmap))
+        self.assertTrue(numpy.all(arr == data))
+        self.assertRaises(ValueError, open_array, raw)
+
+        src = StreamingArraySource(file_name=raw, raw_dtype='float32',
+                                   raw_shape=data.shape, header_size=6)
+        self.assertEqual(src.name, 'data.raw')
+        self.assertTrue(isinstance(src.scalar_data, numpy.memmap))
+        out = self.get_slice(src, 3)
+        scalars = out.point_data.scalars.to_array()
+        self.assertTrue(numpy.allclose(scalars,
+                                       data[:, :, 3].ravel(order='F')))
+
+    @unittest.skipIf(h5py is None, "h5py is not installed.")
+    def test_hdf5_file_is_closed_on_stop(self):
+        "Test if the HDF5 file is closed when the source is stopped."
+        data = self.data
+        fname = os.path.join(self.root, 'data.h5')
+        with h5py.File(fname, 'w') as f:
+            f['data'] = data
+        e = NullEngine()
+        e.start()
+        e.new_scene()
+        src = StreamingArraySource(file_name=fname, dataset_name='data')
+        e.add_source(src)
+        h5_file = src.scalar_data.file
+
+        # When
+        src.stop()
+
+        # Then
+        self.assertFalse(h5_file)
+
+        # When
+        src.start()
+
+        # Then
+        self.assertTrue(src.scalar_data.file)
+        out = self.get_slice(src, 3)
+        scalars = out.point_data.scalars.to_array()
+        self.assertTrue(numpy.allclose(scalars,
+                                       data[:, :, 3].ravel(order='F')))
+        e.stop()
+        self.assertFalse(src.scalar_data.file)
+
+
+if __name__ == '__main__':
+    unittest.main()
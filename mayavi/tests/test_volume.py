@@ -6,6 +6,7 @@ from mock import patch
 # Enthought library imports
 from mayavi.tests.common import get_example_data
 from mayavi import mlab
+from mayavi.modules.volume import get_volume_pyramid
 
 
 class TestVolumeWorksWithProbe(unittest.TestCase):
@@ -26,6 +27,25 @@ class TestVolumeWorksWithProbe(unittest.TestCase):
             np.allclose(vol.volume.center, (3.0, 3.0, 1.5)),True
         )
 
+    def test_volume_lod(self):
+        s = np.random.random((16, 16, 16))
+        vol = mlab.pipeline.volume(mlab.pipeline.scalar_field(s))
+        vol.lod = True
+        src = vol.module_manager.source
+        pyramid = get_volume_pyramid(src, 2)
+        pyramid[-1].update()
+        self.assertEqual(tuple(pyramid[-1].output.dimensions), (4, 4, 4))
+        # The pyramid is cached with the source.
+        self.assertTrue(get_volume_pyramid(src, 2)[0] is pyramid[0])
+
+        # Without any measured frame time the first level is used.
+        self.assertEqual(vol._select_lod_level(), 1)
+        vol._set_lod_level(1)
+        vol._lod_times[1] = 0.8
+        vol.lod_frame_time = 0.2
+        self.assertEqual(vol._select_lod_level(), 2)
+        vol.lod = False
+        self.assertEqual(vol._lod_level, 0)
 
 
 if __name__ == '__main__':
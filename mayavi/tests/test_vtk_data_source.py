@@ -4,10 +4,12 @@
 # License: BSD Style.
 
 # Standard library imports.
-from os.path import abspath
+from os.path import abspath, exists, join
 from io import BytesIO
 import copy
 import numpy
+import shutil
+import tempfile
 import unittest
 
 # Enthought library imports
@@ -139,6 +141,76 @@ class TestVTKDataSource(unittest.TestCase):
         self.check()
 
 
+    def test_save_and_restore_binary(self):
+        """Test if saving a visualization with binary datasets works."""
+        engine = self.e
+        scene = self.scene
+        root = tempfile.mkdtemp()
+        try:
+            # Save visualization.
+            fname = join(root, 'test.mv2')
+            engine.save_visualization(fname, binary=True, compress=True)
+            self.assertTrue(exists(fname + '.data'))
+
+            # Remove existing scene.
+            engine.close_scene(scene)
+
+            # Load visualization
+            engine.load_visualization(fname)
+            self.scene = engine.current_scene
+
+            self.check()
+        finally:
+            shutil.rmtree(root)
+
+    def test_save_binary_over_loaded_file(self):
+        """Test if a loaded binary visualization can be saved again to
+        the same file."""
+        engine = self.e
+        root = tempfile.mkdtemp()
+        try:
+            fname = join(root, 'test.mv2')
+            engine.save_visualization(fname, binary=True)
+            engine.close_scene(self.scene)
+            engine.load_visualization(fname)
+            self.scene = engine.current_scene
+
+            # When
+            engine.save_visualization(fname, binary=True)
+            engine.close_scene(self.scene)
+            engine.load_visualization(fname)
+            self.scene = engine.current_scene
+
+            # Then
+            self.check()
+        finally:
+            shutil.rmtree(root)
+
+    def test_save_binary_needs_file_name(self):
+        """Test if saving binary datasets to an unnamed file fails."""
+        self.assertRaises(ValueError, self.e.save_visualization,
+                          BytesIO(), binary=True)
+
+    def test_save_shared_datasets_once(self):
+        """Test if datasets shared by several scenes are saved once."""
+        engine = self.e
+        src = self.scene.children[0]
+        engine.new_scene()
+        engine.add_source(VTKDataSource(data=src.data))
+        root = tempfile.mkdtemp()
+        try:
+            fname = join(root, 'test.mv2')
+            engine.save_visualization(fname, binary=True)
+            for scene in list(engine.scenes):
+                engine.close_scene(scene)
+
+            engine.load_visualization(fname)
+            src1 = engine.scenes[0].children[0]
+            src2 = engine.scenes[1].children[0]
+            self.assertTrue(src1.data is src2.data)
+        finally:
+            shutil.rmtree(root)
+
     def test_deepcopied(self):
         """Test if the MayaVi2 visualization can be deep-copied."""
         ############################################################
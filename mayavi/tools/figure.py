@@ -260,19 +260,41 @@ def sync_camera(reference_figure, target_figure):
             lambda: do_later(target_figure.scene.render))
 
 
-def screenshot(figure=None, mode='rgb', antialiased=False):
+def _flipud_inplace(arr):
+    """Flips the rows of `arr` in place, swapping them pairwise so that
+    only one row is copied at a time."""
+    n = arr.shape[0]
+    row = np.empty_like(arr[0])
+    for i in range(n//2):
+        j = n - 1 - i
+        row[...] = arr[i]
+        arr[i] = arr[j]
+        arr[j] = row
+    return arr
+
+
+def screenshot(figure=None, mode='rgb', antialiased=False, out=None):
     """ Return the current figure pixmap as an array.
 
         **Parameters**
 
         :figure: a figure instance or None, optional
             If specified, the figure instance to capture the view of.
-        :mode: {'rgb', 'rgba'}
-            The color mode of the array captured.
+        :mode: {'rgb', 'rgba', 'rgba8'}
+            The color mode of the array captured.  'rgb' gives uint8
+            values, 'rgba' float values between 0 and 1 and 'rgba8'
+            uint8 RGBA values.
         :antialiased: {True, False}
             Use anti-aliasing for rendering the screenshot.
             Uses the number of aa frames set by
             figure.scene.anti_aliasing_frames
+        :out: a numpy array or None, optional
+            If specified, the pixels are written directly into this
+            C-contiguous array, which must have the shape (height,
+            width, 3 or 4) and dtype of the requested mode, and the
+            array is returned.  No memory is allocated then, which is
+            useful to capture many frames, to feed a video encoder
+            for instance.
 
         **Notes**
 
@@ -294,6 +316,14 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
         >>> pl.axis('off')
         >>> pl.show()
 
+        To capture successive frames into the same buffer:
+
+        >>> x, y = mlab.gcf().scene.get_size()
+        >>> buf = np.empty((y, x, 4), dtype=np.uint8)
+        >>> for i in range(100):
+        ...     mlab.screenshot(mode='rgba8', out=buf)
+        ...     encoder.write(buf)
+
     """
     if figure is None:
         figure = gcf()
@@ -301,36 +331,57 @@ def screenshot(figure=None, mode='rgb', antialiased=False):
 
     # Try to lift the window
     figure.scene._lift()
+    render_window = figure.scene.render_window
     if mode == 'rgb':
-        out = tvtk.UnsignedCharArray()
+        vtk_out = tvtk.UnsignedCharArray()
         shape = (y, x, 3)
-        pixel_getter = figure.scene.render_window.get_pixel_data
-        pg_args = (0, 0, x - 1, y - 1, 1, out)
+        dtype = np.uint8
+        pixel_getter = render_window.get_pixel_data
 
     elif mode == 'rgba':
-        out = tvtk.FloatArray()
+        vtk_out = tvtk.FloatArray()
         shape = (y, x, 4)
-        pixel_getter = figure.scene.render_window.get_rgba_pixel_data
-        pg_args = (0, 0, x - 1, y - 1, 1, out)
+        dtype = np.float32
+        pixel_getter = render_window.get_rgba_pixel_data
+
+    elif mode == 'rgba8':
+        vtk_out = tvtk.UnsignedCharArray()
+        shape = (y, x, 4)
+        dtype = np.uint8
+        pixel_getter = render_window.get_rgba_char_pixel_data
 
     else:
         raise ValueError('mode type not understood')
 
+    if out is not None:
+        if out.shape != shape or out.dtype != dtype or \
+           not out.flags.c_contiguous or not out.flags.writeable:
+            raise ValueError(
+                'out must be a writeable C-contiguous %s array of shape '
+                '%s.'%(np.dtype(dtype).name, shape)
+            )
+        # Make the VTK array use the memory of `out` so that the pixels
+        # are read directly into it.
+        vtk_out.from_array(out.reshape(-1, shape[2]))
+    pg_args = (0, 0, x - 1, y - 1, 1, vtk_out)
+
     if antialiased:
         # save the current aa value to restore it later
-        old_aa = figure.scene.render_window.aa_frames
+        old_aa = render_window.aa_frames
 
-        figure.scene.render_window.aa_frames = figure.scene.anti_aliasing_frames
+        render_window.aa_frames = figure.scene.anti_aliasing_frames
         figure.scene.render()
         pixel_getter(*pg_args)
-        figure.scene.render_window.aa_frames = old_aa
+        render_window.aa_frames = old_aa
         figure.scene.render()
 
     else:
         pixel_getter(*pg_args)
 
-    # Return the array in a way that pylab.imshow plots it right:
-    out = out.to_array()
-    out.shape = shape
-    out = np.flipud(out)
-    return out
+    # Return the array in a way that pylab.imshow plots it right: VTK
+    # gives the rows from the bottom to the top.
+    if out is not None:
+        return _flipud_inplace(out)
+    arr = vtk_out.to_array()
+    arr.shape = shape
+    return np.flipud(arr)
@@ -167,6 +167,10 @@ class ContourModuleFactory(DataModuleFactory):
                     contours. Specifying a list of values will only
                     give the requested contours asked for.""")
 
+    parallel = Bool(False, adapts='contour.parallel',
+                    help="""If True, 3D image data is contoured in
+                    parallel blocks using multiple threads.""")
+
     def _contours_changed(self):
         contour_list = True
         try:
@@ -250,6 +254,12 @@ class VectorsFactory(DataModuleFactory):
                         "to reduce the number of points displayed "
                         "on large datasets")
 
+    instancing = Bool(False, adapts='glyph.instancing',
+                        desc="If True, the glyphs are rendered by "
+                        "instancing a single glyph at each point rather "
+                        "than by building the geometry of every glyph. "
+                        "This uses far less memory on large datasets")
+
     def _resolution_changed(self):
         glyph = self._target.glyph.glyph_source.glyph_source
         if hasattr(glyph, 'theta_resolution'):
@@ -481,6 +491,10 @@ class ScalarCutPlaneFactory(CutPlaneFactory):
     """
     _target = Instance(modules.ScalarCutPlane, ())
 
+    parallel = Bool(False, adapts='cutter.parallel',
+                    help="""If True, the data is cut in parallel
+                    blocks using multiple threads.""")
+
 scalar_cut_plane = make_function(ScalarCutPlaneFactory)
 
 
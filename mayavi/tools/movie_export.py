@@ -0,0 +1,232 @@
+"""
+Batch export of the frames of a movie, rendered in parallel by worker
+processes using off-screen engines.
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import traceback
+from os.path import abspath, exists, getsize, join, splitext
+
+from mayavi.core.file_data_source import FileDataSource
+
+
+# The state of a worker process: its engine, or the error raised while
+# initializing it.
+_worker = {}
+
+# The start of the error message of a worker which failed to start.
+_init_error = 'Initializing the worker failed:\n'
+
+
+################################################################################
+# Utility functions.
+################################################################################
+def get_time_series(engine):
+    """Returns the file data sources of `engine` reading a time series.
+    """
+    sources = []
+    for scene in engine.scenes:
+        for src in scene.children:
+            if isinstance(src, FileDataSource) and len(src.file_list) > 1:
+                sources.append(src)
+    return sources
+
+
+def set_frame(engine, frame):
+    """The default way of setting up a frame: sets the timestep of all
+    the time series of the engine to `frame`.  The series shorter than
+    the movie stay on their last timestep.
+    """
+    for src in get_time_series(engine):
+        src.timestep = min(frame, len(src.file_list) - 1)
+
+
+def _init_worker(file_name, size):
+    """Initializes a worker process with an off-screen engine loading
+    the visualization saved in `file_name`.  Errors are not raised, as
+    the pool would keep on respawning the worker, but reported for each
+    frame by `_render_frame`."""
+    try:
+        from mayavi.core.off_screen_engine import OffScreenEngine
+        engine = OffScreenEngine()
+        engine.start()
+        engine.load_visualization(file_name)
+        if size is not None:
+            for scene in engine.scenes:
+                scene.scene.set_size(size)
+    except Exception:
+        _worker['error'] = _init_error + traceback.format_exc()
+    else:
+        _worker['engine'] = engine
+
+
+def _render_frame(args):
+    """Renders a frame in a worker process.  Returns the frame and
+    the error message if rendering failed, None otherwise."""
+    frame, file_name, frame_callback, magnification = args
+    if 'error' in _worker:
+        return frame, _worker['error']
+    engine = _worker['engine']
+    # Write the frame to a temporary file first so that a failure never
+    # leaves a partial frame behind.
+    root, ext = splitext(file_name)
+    tmp_name = root + '.part' + ext
+    try:
+        frame_callback(engine, frame)
+        scene = engine.current_scene.scene
+        if magnification == 1:
+            scene.save(tmp_name)
+        else:
+            scene.save(tmp_name, magnification=magnification)
+        _replace_file(tmp_name, file_name)
+    except Exception:
+        err = traceback.format_exc()
+        if exists(tmp_name):
+            os.remove(tmp_name)
+        return frame, err
+    return frame, None
+
+
+def _replace_file(src, dst):
+    """Renames `src` to `dst`, replacing `dst` if it exists."""
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # Windows does not rename over an existing file.
+        os.remove(dst)
+        os.rename(src, dst)
+
+
+################################################################################
+# `export_movie` function.
+################################################################################
+def export_movie(visualization, directory, n_frames=None,
+                 filename='anim%05d.png', n_workers=None, frame_callback=None,
+                 size=None, magnification=1, progress=None):
+    """Renders the frames of a movie in parallel and returns the list of
+    their file names, in order.
+
+    Each worker process renders its frames with its own off-screen
+    engine, loaded from a saved copy of the visualization.  Only one
+    scene is exported: the current scene of the loaded visualization,
+    that is its last scene.  The frames are split in contiguous runs
+    between the workers and saved as numbered images in `directory`,
+    so they are in order whichever worker renders them.  Frames already in `directory` are not
+    rendered again: when some frames fail, or the export is
+    interrupted, calling this function again resumes it.
+
+    As the worker processes are spawned on Python 3, scripts calling
+    this function must protect their main code with
+    ``if __name__ == '__main__':``.
+
+    Parameters
+    ----------
+
+    visualization : `Engine` or str
+        The engine whose visualization is rendered, or the name of a
+        file saved with `Engine.save_visualization`.
+    directory : str
+        The directory where the frames are saved.
+    n_frames : int
+        The number of frames.  Defaults to the length of the longest
+        time series of the visualization.
+    filename : str
+        The pattern of the names of the frames.  Its extension sets the
+        image format.
+    n_workers : int
+        The number of worker processes, defaults to the number of CPUs.
+    frame_callback : callable
+        Called with the engine of a worker and the frame number to set
+        up the visualization for this frame.  It must be picklable, for
+        instance a module level function.  Defaults to `set_frame`,
+        which sets the timestep of the time series.
+    size : tuple
+        The size of the frames in pixels, defaults to the saved size.
+    magnification : int
+        The magnification factor of the saved images.
+    progress : callable
+        Called in this process with the number of frames done and the
+        total number of frames each time a frame is rendered.
+
+    Raises a `RuntimeError` listing the frames that failed, once all
+    the other frames are rendered, or right away if the workers could
+    not load the visualization.
+    """
+    if frame_callback is None:
+        frame_callback = set_frame
+    if not exists(directory):
+        os.makedirs(directory)
+
+    if n_frames is None:
+        if isinstance(visualization, str):
+            raise ValueError('The number of frames is needed when '
+                             'exporting a saved visualization.')
+        lengths = [len(src.file_list)
+                   for src in get_time_series(visualization)]
+        n_frames = max(lengths) if lengths else 1
+
+    frames = [abspath(join(directory, filename%i)) for i in range(n_frames)]
+    todo = [(i, frames[i], frame_callback, magnification)
+            for i in range(n_frames)
+            if not exists(frames[i]) or getsize(frames[i]) == 0]
+    n_done = n_frames - len(todo)
+    if progress is not None:
+        progress(n_done, n_frames)
+    if len(todo) == 0:
+        return frames
+
+    tmp_dir = None
+    if isinstance(visualization, str):
+        file_name = abspath(visualization)
+    else:
+        tmp_dir = tempfile.mkdtemp()
+        file_name = join(tmp_dir, 'movie.mv2')
+        visualization.save_visualization(file_name, binary=True)
+
+    failed = {}
+    try:
+        if n_workers is None:
+            n_workers = multiprocessing.cpu_count()
+        n_workers = max(1, min(n_workers, len(todo)))
+        # Large contiguous runs of frames per worker, but small enough
+        # to balance the load.
+        chunksize = max(1, len(todo)//(4*n_workers))
+        # Spawn the workers so that they do not inherit the state of
+        # the rendering contexts of this process.  Python 2 can only
+        # fork them.
+        if hasattr(multiprocessing, 'get_context'):
+            context = multiprocessing.get_context('spawn')
+        else:
+            context = multiprocessing
+        pool = context.Pool(n_workers, initializer=_init_worker,
+                            initargs=(file_name, size))
+        try:
+            for frame, err in pool.imap_unordered(_render_frame, todo,
+                                                  chunksize):
+                if err is None:
+                    n_done += 1
+                    if progress is not None:
+                        progress(n_done, n_frames)
+                else:
+                    failed[frame] = err
+                    if err.startswith(_init_error):
+                        raise RuntimeError(err)
+        finally:
+            pool.terminate()
+            pool.join()
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir)
+
+    if failed:
+        first = min(failed)
+        msg = 'Rendering %d frames failed, call export_movie again to '\
+              'resume.  Frame %d failed with:\n%s'%(len(failed), first,
+                                                    failed[first])
+        raise RuntimeError(msg)
+    return frames
@@ -21,7 +21,7 @@ from . import tools
 from .engine_manager import get_null_engine, engine_manager
 
 __all__ = ['vector_scatter', 'vector_field', 'scalar_scatter',
-    'scalar_field', 'line_source', 'array2d_source', 'grid_source',
+    'scalar_field', 'streaming_scalar_field', 'line_source', 'array2d_source', 'grid_source',
     'open', 'triangular_mesh_source', 'vertical_vectors_source',
 ]
 
@@ -68,11 +68,7 @@ class MlabSource(HasTraits):
         """
         if not self._disable_update:
             self.dataset.modified()
-            md = self.m_data
-            if md is not None:
-                if hasattr(md, '_assign_attribute'):
-                    md._assign_attribute.update()
-                md.data_changed = True
+            self._data_changed()
 
     def set(self, trait_change_notify=True, **traits):
         """Shortcut for setting object trait attributes.
@@ -105,6 +101,50 @@ class MlabSource(HasTraits):
             self.update()
         return self
 
+    def update_data(self, **traits):
+        """Update the data arrays in place.
+
+        This is meant for streaming data of a fixed size, for instance
+        to animate a field.  When the new arrays have the same shape as
+        the current ones, their values are copied directly into the
+        buffers of the existing VTK arrays: no new arrays are created
+        and only the arrays that changed are marked as modified.  The
+        arrays that cannot be updated in place are set with `set`, and
+        if any array changes shape, `reset` is called instead.
+
+        Note that the VTK arrays may share their memory with the arrays
+        the source was created with, which are then modified as well.
+
+        Parameters
+        ----------
+        traits : list of key/value pairs
+            The array traits and their new values.
+
+        Returns
+        -------
+        self
+            The method returns this object, after updating the data.
+        """
+        if self.dataset is None:
+            self.reset(**traits)
+            return self
+        for name, value in traits.items():
+            current = getattr(self, name)
+            if current is None or np.shape(value) != current.shape:
+                self.reset(**traits)
+                return self
+
+        others = {}
+        for name, value in traits.items():
+            value = np.asarray(value)
+            if not self._update_in_place(name, value):
+                others[name] = value
+        if others:
+            self.set(**others)
+        else:
+            self._data_changed()
+        return self
+
     ######################################################################
     # Non-public interface.
     ######################################################################
@@ -113,6 +153,101 @@ class MlabSource(HasTraits):
             ds.add_trait('mlab_source', Instance(MlabSource))
         ds.mlab_source = self
 
+    def _data_changed(self):
+        """Tells the Mayavi pipeline that the data has changed."""
+        md = self.m_data
+        if md is not None:
+            if hasattr(md, '_assign_attribute'):
+                md._assign_attribute.update()
+            md.fire_data_changed()
+
+    def _update_in_place(self, name, value):
+        """Copies `value` into the VTK array backing the trait `name`
+        and updates the trait.  Returns False if this trait cannot be
+        updated in place.
+
+        The default implementation handles the points, scalars and
+        vectors of the point set datasets.
+        """
+        ds = self.dataset
+        pd = ds.point_data
+        if name in ('x', 'y', 'z'):
+            self._copy_component(self.points, ds.points,
+                                 'xyz'.index(name), value)
+        elif name in ('u', 'v', 'w'):
+            if pd.vectors is None:
+                return False
+            self._copy_component(self.vectors, pd.vectors,
+                                 'uvw'.index(name), value)
+        elif name in ('points', 'vectors'):
+            vtk_array = ds.points if name == 'points' else pd.vectors
+            if vtk_array is None:
+                return False
+            array = getattr(self, name)
+            array[...] = value
+            self._copy_array(vtk_array, array)
+            return True
+        elif name == 'scalars':
+            # The scalars are often the z array: do not overwrite it.
+            if pd.scalars is None or \
+                    self._shares_memory(pd.scalars, ('x', 'y', 'z')):
+                return False
+            self._copy_array(pd.scalars, value)
+        else:
+            return False
+        self.trait_setq(**{name: value})
+        return True
+
+    def _shares_memory(self, vtk_array, names):
+        """Returns True if the buffer of the TVTK array `vtk_array`
+        overlaps with any of the array traits in `names`."""
+        buf = vtk_array.to_array()
+        for name in names:
+            array = getattr(self, name, None)
+            if isinstance(array, np.ndarray) and \
+                    np.may_share_memory(buf, array):
+                return True
+        return False
+
+    def _copy_component(self, array, vtk_array, component, value):
+        """Copies `value` into the column `component` of the (N, 3)
+        `array` and of the TVTK array `vtk_array` and marks the latter
+        modified."""
+        value = np.ravel(value)
+        array[:, component] = value
+        buf = vtk_array.to_array()
+        if not np.may_share_memory(buf, array):
+            buf[:, component] = value
+        vtk_array.modified()
+
+    def _copy_array(self, vtk_array, value):
+        """Copies `value` into the buffer of the TVTK array `vtk_array`
+        and marks it modified."""
+        buf = vtk_array.to_array()
+        if not np.may_share_memory(buf, value):
+            buf[...] = np.reshape(value, buf.shape)
+        vtk_array.modified()
+
+    def _copy_image_array(self, vtk_array, value, component=None):
+        """Copies the array `value` into the buffer of the TVTK array
+        `vtk_array` of the image data of an `ArraySource`, taking care
+        of the transposition done by the source.  If `component` is not
+        None, `value` is copied into this component of the vectors.
+        """
+        buf = vtk_array.to_array()
+        if self.m_data.transpose_input_array:
+            if value.ndim == 4:
+                value = np.transpose(value, (2, 1, 0, 3))
+            else:
+                value = value.T
+        if component is not None:
+            buf = buf[:, component]
+        # Setting the shape raises rather than silently copying.
+        buf = buf.view()
+        buf.shape = value.shape
+        buf[...] = value
+        vtk_array.modified()
+
 
 ###############################################################################
 # `MGlyphSource` class.
@@ -304,6 +439,18 @@ class MVerticalGlyphSource(MGlyphSource):
                                   s])
         self.update()
 
+    def _update_in_place(self, name, value):
+        if name != 'scalars' or self.vectors is None:
+            return super(MVerticalGlyphSource, self)._update_in_place(
+                name, value)
+        pd = self.dataset.point_data
+        if pd.scalars is None or pd.vectors is None:
+            return False
+        self._copy_array(pd.scalars, value)
+        self._copy_component(self.vectors, pd.vectors, 2, value)
+        self.trait_setq(scalars=value, w=value)
+        return True
+
 
 ###############################################################################
 # `MArraySource` class.
@@ -428,6 +575,25 @@ class MArraySource(MlabSource):
     def _vectors_changed(self, v):
         self.m_data.vector_data = v
 
+    def _update_in_place(self, name, value):
+        md = self.m_data
+        pd = self.dataset.point_data
+        if name == 'scalars' and pd.scalars is not None:
+            self._copy_image_array(pd.scalars, value)
+            md.trait_setq(scalar_data=value)
+        elif name in ('u', 'v', 'w') and pd.vectors is not None:
+            self.vectors[..., 'uvw'.index(name)] = value
+            self._copy_image_array(pd.vectors, value, 'uvw'.index(name))
+        elif name == 'vectors' and pd.vectors is not None:
+            self.vectors[...] = value
+            self._copy_image_array(pd.vectors, self.vectors)
+            return True
+        else:
+            # The x, y and z arrays only set the origin and spacing.
+            return False
+        self.trait_setq(**{name: value})
+        return True
+
 
 ###############################################################################
 # `MLineSource` class.
@@ -634,6 +800,17 @@ class MArray2DSource(MlabSource):
         if s is old:
             self.m_data._scalar_data_changed(s)
 
+    def _update_in_place(self, name, value):
+        pd = self.dataset.point_data
+        mask = self.mask
+        if name != 'scalars' or pd.scalars is None or \
+                (mask is not None and len(mask) > 0):
+            return False
+        self._copy_image_array(pd.scalars, value)
+        self.m_data.trait_setq(scalar_data=value)
+        self.trait_setq(scalars=value)
+        return True
+
 
 ##############################################################################
 # `MGridSource` class.
@@ -750,6 +927,12 @@ class MGridSource(MlabSource):
         self.dataset.point_data.scalars.name = 'scalars'
         self.update()
 
+    def _update_in_place(self, name, value):
+        mask = self.mask
+        if name == 'scalars' and mask is not None and len(mask) > 0:
+            return False
+        return super(MGridSource, self)._update_in_place(name, value)
+
 
 ###############################################################################
 # `MTriangularMeshSource` class.
@@ -1143,6 +1326,62 @@ def scalar_field(*args, **kwargs):
     return tools.add_dataset(data_source.m_data, name, **kwargs)
 
 
+def streaming_scalar_field(s, **kwargs):
+    """
+    Creates a scalar field from a large array that is not loaded in
+    memory: only the parts of the array displayed are read.
+
+    **Function signatures**::
+
+        streaming_scalar_field(s, ...)
+        streaming_scalar_field(filename, ...)
+
+    The array s can be any sliceable array, such as a `numpy.memmap` or
+    an HDF5 dataset.  A filename can point to a `.npy` file, an HDF5
+    file or a raw binary file.  The x, y and z coordinates are made
+    from the indices of the array and the given spacing and origin.
+
+    **Keyword arguments**:
+
+        :name: the name of the vtk object created.
+
+        :spacing: the spacing between the points of the array.
+
+        :origin: the position of the first point of the array.
+
+        :dataset_name: the name of the dataset in an HDF5 file.
+
+        :raw_dtype: the data type of a raw binary file.
+
+        :raw_shape: the shape of the array in a raw binary file.
+
+        :header_size: the number of bytes to skip in a raw binary file.
+
+        :fortran_order: if the array in a raw binary file is in Fortran
+                        order.
+
+        :figure: optionally, the figure on which to add the data source.
+                 If None, the source is not added to any figure, and will
+                 be added automatically by the modules or
+                 filters. If False, no figure will be created by modules
+                 or filters applied to the source: the source can only
+                 be used for testing, or numerical algorithms, not
+                 visualization."""
+    traits = dict((key, kwargs.pop(key)) for key in list(kwargs)
+                  if key in ('spacing', 'origin', 'dataset_name',
+                             'raw_dtype', 'raw_shape', 'header_size',
+                             'fortran_order'))
+    if isinstance(s, str):
+        traits['file_name'] = s
+    else:
+        traits['scalar_data'] = s
+    # Imported here as it needs a recent VTK, see StreamingArraySource.
+    from mayavi.sources.streaming_array_source import StreamingArraySource
+    data_source = StreamingArraySource(**traits)
+    name = kwargs.pop('name', 'StreamingScalarField')
+    return tools.add_dataset(data_source, name, **kwargs)
+
+
 def line_source(*args, **kwargs):
     """
     Creates line data.
@@ -13,6 +13,7 @@ seems no unique one-to-one VTK data array type to map it to.
 # Copyright (c) 2004-2015,  Enthought, Inc.
 # License: BSD Style.
 
+import itertools
 import sys
 
 import vtk
@@ -55,20 +56,59 @@ def getbuffer(array):
 ######################################################################
 # The array cache.
 ######################################################################
+def _get_data_pointer(vtk_arr):
+    """Internal function that returns the address of the data of the
+    given VTK array as an integer."""
+    ptr = vtk_arr.GetVoidPointer(0)
+    if isinstance(ptr, (unicode, str)):
+        # Pointers are returned as strings of the form '_hex_p_void'.
+        return int(ptr[1:].split('_', 1)[0], 16)
+    return int(ptr)
+
+
 class ArrayCache(object):
 
     """Caches references to numpy arrays that are not copied but views
     of which are converted to VTK arrays.  The caching prevents the user
     from deleting or resizing the numpy array after it has been sent
     down to VTK.  The cached arrays are automatically removed when the
-    VTK array destructs."""
+    VTK array destructs.
+
+    The cache also records whether each cached array aliases the
+    memory of the array the user passed in or is a private copy made
+    during conversion.  Cumulative statistics are available via
+    `get_stats`.
+
+    The number of bytes pinned by the cache is tracked and can be
+    inspected with `summary`.  Callbacks may be registered with
+    `add_high_water_callback` to be notified when the pinned memory
+    crosses a threshold.  Entries whose VTK array no longer uses the
+    cached memory (because the VTK array has been resized or given
+    other data) are released by `release_stale`.  This is done
+    automatically whenever the pinned memory exceeds `max_bytes`.
+    Entries still used by VTK are never released since that would
+    leave VTK with a dangling pointer."""
 
     ######################################################################
     # `object` interface.
     ######################################################################
-    def __init__(self):
+    def __init__(self, max_bytes=None):
         # The cache.
         self._cache = {}
+        # Bookkeeping information for each cached array.
+        self._info = {}
+        # Keys of the VTK arrays we have a DeleteEvent observer on.
+        self._observed = set()
+        # Registered (threshold, callback) pairs and the thresholds
+        # currently exceeded.
+        self._high_water_callbacks = []
+        self._exceeded = set()
+        self._nbytes = 0
+        self._peak_bytes = 0
+        # If not None, stale entries are released when the pinned
+        # memory exceeds this many bytes.
+        self.max_bytes = max_bytes
+        self.reset_stats()
 
     def __len__(self):
         return len(self._cache)
@@ -80,9 +120,16 @@ class ArrayCache(object):
     ######################################################################
     # `ArrayCache` interface.
     ######################################################################
-    def add(self, vtk_arr, np_arr):
+    def add(self, vtk_arr, np_arr, copy_reason=None, owner=None):
         """Add numpy array corresponding to the vtk array to the
-        cache."""
+        cache.
+
+        If `np_arr` is a copy of the user's data rather than a view
+        of it, `copy_reason` should be a short string describing why
+        the copy was necessary.  `owner` is a label used to group
+        entries in `summary`, it defaults to the class name of the
+        VTK array.
+        """
         key = vtk_arr.__this__
         cache = self._cache
 
@@ -91,27 +138,190 @@ class ArrayCache(object):
         # `lambda` function is necessary because the callback will not
         # receive the object (it will receive `None`) and thus there
         # is no way to know which array reference one has to remove.
-        vtk_arr.AddObserver('DeleteEvent', lambda o, e, key=key: \
-                            self._remove_array(key))
+        # The observer is only added once even if the VTK array is
+        # assigned new data several times.
+        if key not in self._observed:
+            vtk_arr.AddObserver('DeleteEvent', lambda o, e, key=key: \
+                                self._remove_array(key))
+            self._observed.add(key)
+
+        # Release any previously cached array for this VTK array.
+        self._release(key)
 
         # Cache the array
         cache[key] = np_arr
+        if owner is None:
+            owner = vtk_arr.GetClassName()
+        self._info[key] = {'nbytes': np_arr.nbytes,
+                           'dtype': np_arr.dtype.name,
+                           'owner': owner,
+                           'copy_reason': copy_reason}
+        self._nbytes += np_arr.nbytes
+        self._peak_bytes = max(self._peak_bytes, self._nbytes)
+
+        # Update the statistics.
+        stats = self._stats
+        if copy_reason is None:
+            stats['aliased'] += 1
+            stats['aliased_bytes'] += np_arr.nbytes
+        else:
+            stats['copied'] += 1
+            stats['copied_bytes'] += np_arr.nbytes
+            reasons = stats['copy_reasons']
+            reasons[copy_reason] = reasons.get(copy_reason, 0) + 1
+
+        if self.max_bytes is not None and self._nbytes > self.max_bytes:
+            self.release_stale()
+        self._check_high_water()
 
     def get(self, vtk_arr):
         """Return the cached numpy array given a VTK array."""
         key = vtk_arr.__this__
         return self._cache[key]
 
+    def is_copy(self, vtk_arr):
+        """Return True if the numpy array cached for the given VTK
+        array is a private copy rather than a view of the user's
+        data."""
+        return self.get_copy_reason(vtk_arr) is not None
+
+    def get_copy_reason(self, vtk_arr):
+        """Return the reason the cached array for the given VTK array
+        was copied, or `None` if it aliases the user's data."""
+        info = self._info.get(vtk_arr.__this__)
+        if info is None:
+            return None
+        return info['copy_reason']
+
+    def get_stats(self):
+        """Return a dictionary of cumulative conversion statistics.
+
+        The keys are `aliased` and `copied` (number of arrays cached
+        without and with a copy), `aliased_bytes` and `copied_bytes`
+        (the corresponding data sizes) and `copy_reasons` (a
+        dictionary mapping the reason for a copy to its count).
+        """
+        stats = dict(self._stats)
+        stats['copy_reasons'] = dict(stats['copy_reasons'])
+        return stats
+
+    def reset_stats(self):
+        """Reset the cumulative statistics returned by `get_stats`."""
+        self._stats = {'aliased': 0, 'copied': 0,
+                       'aliased_bytes': 0, 'copied_bytes': 0,
+                       'copy_reasons': {}}
+
+    def get_nbytes(self):
+        """Return the number of bytes currently pinned by the cache."""
+        return self._nbytes
+
+    def get_peak_bytes(self):
+        """Return the largest number of bytes pinned by the cache at
+        any one time since creation or the last `reset_peak`."""
+        return self._peak_bytes
+
+    def reset_peak(self):
+        """Reset the peak to the current number of pinned bytes."""
+        self._peak_bytes = self._nbytes
+
+    def summary(self, n_largest=5):
+        """Return a dictionary summarizing the memory pinned by the
+        cache.
+
+        The keys are `n_arrays`, `nbytes`, `peak_bytes`, `by_dtype`
+        and `by_owner` (dictionaries mapping the dtype name/owner to
+        a `(count, nbytes)` tuple) and `largest`, a list of
+        `(owner, dtype, nbytes)` tuples for the `n_largest` biggest
+        entries in decreasing order of size.
+        """
+        by_dtype = {}
+        by_owner = {}
+        for info in self._info.values():
+            nbytes = info['nbytes']
+            for d, k in ((by_dtype, info['dtype']),
+                         (by_owner, info['owner'])):
+                count, total = d.get(k, (0, 0))
+                d[k] = (count + 1, total + nbytes)
+        largest = sorted(self._info.values(), key=lambda x: x['nbytes'],
+                         reverse=True)[:n_largest]
+        return {'n_arrays': len(self._cache),
+                'nbytes': self._nbytes,
+                'peak_bytes': self._peak_bytes,
+                'by_dtype': by_dtype,
+                'by_owner': by_owner,
+                'largest': [(x['owner'], x['dtype'], x['nbytes'])
+                            for x in largest]}
+
+    def add_high_water_callback(self, nbytes, callback):
+        """Call `callback(cache, pinned_bytes)` whenever the memory
+        pinned by the cache rises above `nbytes`.  The callback is
+        called again only after the pinned memory has dropped back
+        to `nbytes` or below."""
+        self._high_water_callbacks.append((nbytes, callback))
+        self._check_high_water()
+
+    def remove_high_water_callback(self, callback):
+        """Remove all high water mark registrations of `callback`."""
+        entries = self._high_water_callbacks
+        for entry in [x for x in entries if x[1] == callback]:
+            entries.remove(entry)
+            self._exceeded.discard(id(entry))
+
+    def release_stale(self):
+        """Release the cached arrays that are no longer used by their
+        VTK arrays because the VTK array has since been resized or
+        assigned new data.  Entries of destroyed VTK arrays are
+        already released by their DeleteEvent observer.  Returns the
+        number of bytes released."""
+        released = 0
+        for key, info in list(self._info.items()):
+            if key in self._observed:
+                # The VTK array is alive, even if its Python wrapper
+                # has been collected, since the DeleteEvent observer
+                # has not fired.  Wrap it again from its address to
+                # check which data it uses.
+                np_arr = self._cache[key]
+                if np_arr.size == 0 or \
+                   _get_data_pointer(vtk.vtkDataArray(key)) == \
+                   np_arr.__array_interface__['data'][0]:
+                    continue
+            released += info['nbytes']
+            self._release(key)
+        self._check_high_water()
+        return released
+
     ######################################################################
     # Non-public interface.
     ######################################################################
     def _remove_array(self, key):
         """Private function that removes the cached array.  Do not
         call this unless you know what you are doing."""
+        self._release(key)
+        self._observed.discard(key)
+
+    def _release(self, key):
+        """Drop the cached array for the given key and update the
+        memory accounting."""
         try:
             del self._cache[key]
         except KeyError:
             pass
+        info = self._info.pop(key, None)
+        if info is not None:
+            self._nbytes -= info['nbytes']
+
+    def _check_high_water(self):
+        """Call the high water mark callbacks whose thresholds have
+        just been crossed."""
+        nbytes = self._nbytes
+        for entry in list(self._high_water_callbacks):
+            threshold, callback = entry
+            if nbytes > threshold:
+                if id(entry) not in self._exceeded:
+                    self._exceeded.add(id(entry))
+                    callback(self, nbytes)
+            else:
+                self._exceeded.discard(id(entry))
 
 
 ######################################################################
@@ -223,7 +433,25 @@ def create_vtk_array(vtk_arr_type):
     return tmp
 
 
-def array2vtk(num_array, vtk_array=None):
+def _get_copy_reason(num_array, z, arr_dtype):
+    """Internal function that returns a short string describing why
+    the data of `num_array` (whose array form is `z`) cannot be handed
+    to VTK as an array of type `arr_dtype` without a copy.  Returns
+    `None` if no copy is needed.
+    """
+    if not isinstance(num_array, numpy.ndarray):
+        return 'sequence'
+    if not z.flags.c_contiguous:
+        return 'non-contiguous'
+    if not z.dtype.isnative:
+        return 'byte order'
+    if z.dtype.kind != arr_dtype.kind or \
+       z.dtype.itemsize != arr_dtype.itemsize:
+        return 'dtype'
+    return None
+
+
+def array2vtk(num_array, vtk_array=None, copy=None):
     """Converts a real numpy Array (or a Python list) to a VTK array
     object.
 
@@ -250,6 +478,12 @@ def array2vtk(num_array, vtk_array=None):
        4. The types of the `vtk_array` and the `num_array` are not
           equivalent to each other.  For example if one is an integer
           array and the other a float.
+       5. The numpy array is not in native byte order.
+
+      Any C-contiguous array whose dtype has the same kind and item
+      size as the VTK array type is used as is.  Whether a copy was
+      made is recorded in the array cache, see
+      `ArrayCache.get_stats` and `ArrayCache.is_copy`.
 
 
     - vtk_array : `vtkDataArray` (default: `None`)
@@ -258,6 +492,14 @@ def array2vtk(num_array, vtk_array=None):
       then a new array is not created and returned.  The passed array
       is itself returned.
 
+    - copy : `bool` or `None` (default: `None`)
+
+      If `None`, the data is copied only when one of the above
+      conditions requires it.  If `False`, a `ValueError` is raised
+      instead of making a copy.  If `True`, the data is always
+      copied so that later changes to `num_array` are not seen by
+      VTK.
+
     """
 
     z = numpy.asarray(num_array)
@@ -292,12 +534,23 @@ def array2vtk(num_array, vtk_array=None):
 
     result_array.SetNumberOfTuples(shape[0])
 
-    # Ravel the array appropriately.
-    arr_dtype = get_numeric_array_type(vtk_typecode)
-    if numpy.issubdtype(z.dtype, arr_dtype):
-        z_flat = numpy.ravel(z)
+    # Ravel the array appropriately, copying only when VTK cannot use
+    # the memory of the passed array directly.
+    arr_dtype = numpy.dtype(get_numeric_array_type(vtk_typecode))
+    if bit_array:
+        copy_reason = 'bit array'
+    else:
+        copy_reason = _get_copy_reason(num_array, z, arr_dtype)
+    if copy_reason is not None and copy is False:
+        raise ValueError("Cannot convert array to VTK without a copy "\
+                         "(reason: %s)."%copy_reason)
+    if copy_reason is None and copy:
+        copy_reason = 'requested'
+
+    if copy_reason is None:
+        z_flat = z.reshape(-1)
     else:
-        z_flat = numpy.ravel(z).astype(arr_dtype)
+        z_flat = numpy.array(z, dtype=arr_dtype, order='C').reshape(-1)
 
     # Point the VTK array to the numpy data.  The last argument (1)
     # tells the array not to deallocate.
@@ -318,7 +571,7 @@ def array2vtk(num_array, vtk_array=None):
         # and getting into serious trouble.  This is only done for
         # non-bit array cases where the data is not copied.
         global _array_cache
-        _array_cache.add(result_array, z_flat)
+        _array_cache.add(result_array, z_flat, copy_reason)
 
     return result_array
 
@@ -443,7 +696,8 @@ def array2vtkCellArray(num_array, vtk_array=None):
     An alternative and more efficient way to build the connectivity
     list is to create a vtkIdTypeArray having data of the form
     (npts,p0,p1,...p(npts-1), repeated for each cell) and then call
-    <vtkCellArray_instance>.SetCells(n_cell, id_list).
+    <vtkCellArray_instance>.SetCells(n_cell, id_list).  For cells of
+    mixed sizes, `offsets2vtkCellArray` is the most efficient option.
 
     Parameters
     ----------
@@ -453,8 +707,8 @@ def array2vtkCellArray(num_array, vtk_array=None):
       Valid values are:
 
         1. A Python list of 1D lists.  Each 1D list can contain one
-           cell connectivity list.  This is very slow and is to be
-           used only when efficiency is of no consequence.
+           cell connectivity list.  This is slower than the other
+           options since the lists have to be traversed in Python.
 
         2. A 2D numpy array with the cell connectivity list.
 
@@ -491,14 +745,16 @@ def array2vtkCellArray(num_array, vtk_array=None):
 
     ########################################
     # Internal functions.
-    def _slow_array2cells(z, cells):
-        cells.Reset()
-        vtk_ids = vtk.vtkIdList()
-        for i in z:
-            vtk_ids.Reset()
-            for j in i:
-                vtk_ids.InsertNextId(j)
-            cells.InsertNextCell(vtk_ids)
+    def _list2cells(z, cells):
+        # Flatten the nested list into offsets and connectivity arrays
+        # without any VTK calls per cell.
+        n_cells = len(z)
+        offsets = numpy.zeros((n_cells + 1,), ID_TYPE_CODE)
+        numpy.cumsum(numpy.fromiter((len(i) for i in z), ID_TYPE_CODE,
+                                    n_cells), out=offsets[1:])
+        connectivity = numpy.fromiter(itertools.chain.from_iterable(z),
+                                      ID_TYPE_CODE, offsets[-1])
+        offsets2vtkCellArray(offsets, connectivity, cells)
 
     def _get_tmp_array(arr):
         try:
@@ -520,7 +776,7 @@ def array2vtkCellArray(num_array, vtk_array=None):
         assert len(num_array[0]) > 0, "Input array must be 2D."
         tp = type(num_array[0])
         if issubclass(tp, list): # Pure Python list.
-            _slow_array2cells(num_array, cells)
+            _list2cells(num_array, cells)
             return cells
         elif issubclass(tp, numpy.ndarray):  # List of arrays.
             # Check shape of array and find total size.
@@ -558,7 +814,84 @@ def array2vtkCellArray(num_array, vtk_array=None):
         raise TypeError(msg)
 
 
-def array2vtkPoints(num_array, vtk_points=None):
+def offsets2vtkCellArray(offsets, connectivity, vtk_array=None):
+    """Given the cell offsets and connectivity as numpy arrays or
+    Python lists, this function creates a vtkCellArray instance and
+    returns it.
+
+    This is the most efficient way to create cells of mixed sizes
+    (for example a mesh of tetrahedra, prisms and hexahedra) since no
+    work is done per cell in Python.  With VTK 9 and later the arrays
+    are handed to the cell array directly, with older versions they
+    are converted to the legacy (npts, p0, p1, ...) layout using
+    vectorized numpy operations.
+
+    Parameters
+    ----------
+
+    - offsets : numpy array or Python list/tuple
+
+      A 1D array with the index into `connectivity` of the first
+      point of each cell.  It may either have one entry per cell or
+      an additional final entry equal to `len(connectivity)`.
+
+    - connectivity : numpy array or Python list/tuple
+
+      A 1D array with the point ids of all the cells, one after the
+      other.
+
+    - vtk_array : `vtkCellArray` (default: `None`)
+
+      If an optional `vtkCellArray` instance, is passed as an argument
+      then a new array is not created and returned.  The passed array
+      is itself modified and returned.
+
+    Example
+    -------
+
+       >>> offsets = [0, 4, 10, 18]  # A tet, a prism and a hex.
+       >>> connectivity = numpy.arange(18)
+       >>> cells = array_handler.offsets2vtkCellArray(offsets,
+       ...                                            connectivity)
+
+    """
+    if vtk_array:
+        cells = vtk_array
+    else:
+        cells = vtk.vtkCellArray()
+    assert cells.GetClassName() == 'vtkCellArray', \
+           'Third argument must be a `vtkCellArray` instance.'
+
+    conn = numpy.ascontiguousarray(connectivity, ID_TYPE_CODE)
+    off = numpy.ascontiguousarray(offsets, ID_TYPE_CODE)
+    assert len(conn.shape) == 1, "Connectivity array must be 1D."
+    assert len(off.shape) == 1, "Offsets array must be 1D."
+    if len(off) == 0 or off[-1] != len(conn):
+        off = numpy.append(off, ID_TYPE_CODE(len(conn)))
+    assert off[0] == 0, "The first offset must be zero."
+    assert numpy.all(off[1:] >= off[:-1]), \
+           "Offsets must be non-decreasing."
+    n_cells = len(off) - 1
+
+    if hasattr(cells, 'GetOffsetsArray'):
+        # VTK >= 9 stores cells as offsets and connectivity.
+        cells.SetData(array2vtk(off, vtk.vtkIdTypeArray()),
+                      array2vtk(conn, vtk.vtkIdTypeArray()))
+    else:
+        # Interleave the cell sizes with the connectivity.
+        id_typ_arr = numpy.empty((n_cells + len(conn),), ID_TYPE_CODE)
+        starts = off[:-1] + numpy.arange(n_cells, dtype=ID_TYPE_CODE)
+        id_typ_arr[starts] = numpy.diff(off)
+        mask = numpy.ones(id_typ_arr.shape, bool)
+        mask[starts] = False
+        id_typ_arr[mask] = conn
+        vtk_arr = vtk.vtkIdTypeArray()
+        array2vtk(id_typ_arr, vtk_arr)
+        cells.SetCells(n_cells, vtk_arr)
+    return cells
+
+
+def array2vtkPoints(num_array, vtk_points=None, copy=None):
     """Converts a numpy array/Python list to a vtkPoints object.
 
     Unless a Python list/tuple or a non-contiguous array is given, no
@@ -577,6 +910,10 @@ def array2vtkPoints(num_array, vtk_points=None):
       then a new array is not created and returned.  The passed array
       is itself modified and returned.
 
+    - copy : `bool` or `None` (default: `None`)
+
+      Passed on to `array2vtk`.
+
     """
     if vtk_points:
         points  = vtk_points
@@ -586,7 +923,7 @@ def array2vtkPoints(num_array, vtk_points=None):
     arr = numpy.asarray(num_array)
     assert len(arr.shape) == 2, "Points array must be 2 dimensional."
     assert arr.shape[1] == 3, "Incorrect shape: shape[1] must be 3."
-    vtk_array = array2vtk(arr)
+    vtk_array = array2vtk(arr, copy=copy)
     points.SetData(vtk_array)
     return points
 
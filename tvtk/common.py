@@ -120,6 +120,24 @@ def configure_source_data(obj, data):
         else:
             obj.set_source_data(data)
 
+def enable_smp(n_threads=0):
+    """Enable the threaded backend of VTK's SMP tools, used by the
+    filters that process their input in parallel blocks (for example
+    vtkFlyingEdges3D and vtkPlaneCutter).
+
+    If VTK was built with the sequential backend as its default, the
+    STDThread backend is selected instead.  `n_threads` is the number
+    of threads to use, 0 lets VTK choose.  Returns True if a threaded
+    backend is in use.
+    """
+    smp = getattr(vtk, 'vtkSMPTools', None)
+    if smp is None or not hasattr(smp, 'GetBackend'):
+        return False
+    if smp.GetBackend() == 'Sequential' and hasattr(smp, 'SetBackend'):
+        smp.SetBackend('STDThread')
+    smp.Initialize(n_threads)
+    return smp.GetBackend() != 'Sequential'
+
 class _Camel2Enthought:
     """Simple functor class to convert names from CamelCase to
     Enthought compatible names.
@@ -51,12 +51,18 @@ shows how disconnection works.
 # License: BSD Style.
 
 __all__ = ['Messenger', 'MessengerError',
-           'connect', 'disconnect', 'send']
+           'connect', 'disconnect', 'send',
+           'get_stats', 'reset_stats', 'set_profiling']
 
+import inspect
 import types
 import sys
+import time
 import weakref
 
+# The most precise timer available.
+_timer = getattr(time, 'perf_counter', time.time)
+
 
 #################################################################
 # This code makes the module reload-safe.
@@ -72,6 +78,18 @@ for name in ['messenger', 'tvtk.messenger']:
         break
 
 
+#################################################################
+# Utility functions.
+#################################################################
+
+def _late_bound(name):
+    """Returns a function calling the method `name` of its first
+    argument, looked up on each call."""
+    def call(inst, *args, **kw_args):
+        return getattr(inst, name)(*args, **kw_args)
+    return call
+
+
 #################################################################
 # `MessengerError` class for exceptions raised by Messenger.
 #################################################################
@@ -96,6 +114,17 @@ class Messenger:
     between objects.  The class is Borg.  Rather than use this class,
     please use the 'connect' and 'disconnect' functions.
 
+    For speed, `send` uses a dispatch table mapping each (object,
+    event) pair to the list of callbacks to invoke, including the
+    catch-all ones.  The table is built on the first send and
+    invalidated when the connections of the object change.  Method
+    callbacks whose instance is garbage collected are removed as soon
+    as that happens.
+
+    The messenger counts the events it sends.  If profiling is turned
+    on with `set_profiling`, the time spent in each callback is also
+    recorded.  See `get_stats`.
+
     """
 
     _shared_data = _saved
@@ -112,6 +141,12 @@ class Messenger:
             # First instantiation.
             self._signals = {}
             self._catch_all = ['AnyEvent', 'all']
+        if not hasattr(self, '_dispatch'):
+            # Maps hash(obj) to a dict mapping events to a tuple of
+            # (weakref_or_None, function, label) callback entries.
+            self._dispatch = {}
+            self._profile = False
+            self.reset_stats()
 
     #################################################################
     # 'Messenger' interface.
@@ -158,7 +193,8 @@ class Messenger:
         if typ is types.FunctionType:
             slots[callback_key] = (None, callback)
         elif typ is types.MethodType:
-            obj = weakref.ref(callback.__self__)
+            obj = weakref.ref(callback.__self__,
+                              self._make_remover(key, event, callback_key))
             name = callback.__name__
             slots[callback_key] = (obj, name)
         else:
@@ -166,6 +202,7 @@ class Messenger:
                 "Callback must be a function or method. "\
                 "You passed a %s."%(str(callback))
             )
+        self._dispatch.pop(key, None)
 
     def disconnect(self, obj, event=None, callback=None, obj_is_hash=False):
         """Disconnects the object and its event handlers.
@@ -203,6 +240,7 @@ class Messenger:
             key = hash(obj)
         if not key in signals:
             return
+        self._dispatch.pop(key, None)
         if callback is None:
             if event is None:
                 del signals[key]
@@ -232,27 +270,24 @@ class Messenger:
           or 'all', then any event will invoke these.
 
         """
+        self._n_events += 1
+        key = hash(source)
         try:
-            sigs = self._get_signals(source)
-        except (MessengerError, KeyError):
+            callbacks = self._dispatch[key][event]
+        except KeyError:
+            callbacks = self._build_dispatch(key, event)
+            if callbacks is None:
+                return
+        if self._profile:
+            self._send_profiled(callbacks, source, event, args, kw_args)
             return
-        events = self._catch_all[:]
-        if event not in events:
-            events.append(event)
-        for evt in events:
-            if evt in sigs:
-                slots = sigs[evt]
-                for key in list(slots.keys()):
-                    obj, meth = slots[key]
-                    if obj: # instance method
-                        inst = obj()
-                        if inst:
-                            getattr(inst, meth)(source, event, *args, **kw_args)
-                        else:
-                            # Oops, dead reference.
-                            del slots[key]
-                    else: # normal function
-                        meth(source, event, *args, **kw_args)
+        for obj, func, label in callbacks:
+            if obj is None: # normal function
+                func(source, event, *args, **kw_args)
+            else: # instance method
+                inst = obj()
+                if inst is not None:
+                    func(inst, source, event, *args, **kw_args)
 
     def is_registered(self, obj):
         """Returns if the given object has registered itself with the
@@ -273,10 +308,119 @@ class Messenger:
         """
         return list(self._get_signals(obj).keys())
 
+    def set_profiling(self, profile):
+        """Turn on or off the timing of the callbacks in `send`."""
+        self._profile = bool(profile)
+
+    def get_stats(self):
+        """Returns a dictionary with the statistics collected since
+        the messenger was created or `reset_stats` was called.
+
+        The keys are `events` (the number of events sent), `elapsed`
+        (the time in seconds over which they were counted),
+        `events_per_second` and `callbacks`, a dictionary mapping a
+        callback's name to a `(calls, total_time)` tuple.  The
+        callbacks are only timed when profiling is on.
+
+        """
+        elapsed = _timer() - self._stats_start
+        if elapsed > 0:
+            rate = self._n_events/elapsed
+        else:
+            rate = 0.0
+        return {'events': self._n_events,
+                'elapsed': elapsed,
+                'events_per_second': rate,
+                'callbacks': dict((k, tuple(v)) for k, v in
+                                  self._callback_stats.items())}
+
+    def reset_stats(self):
+        """Resets the statistics returned by `get_stats`."""
+        self._n_events = 0
+        self._stats_start = _timer()
+        self._callback_stats = {}
+
     #################################################################
     # Non-public interface.
     #################################################################
 
+    def _build_dispatch(self, key, event):
+        """Builds and caches the tuple of callbacks to invoke when the
+        object with hash `key` sends `event`.  Returns `None` if the
+        object is not registered.
+
+        """
+        sigs = self._signals.get(key)
+        if sigs is None:
+            return None
+        events = self._catch_all[:]
+        if event not in events:
+            events.append(event)
+        callbacks = []
+        for evt in events:
+            slots = sigs.get(evt)
+            if not slots:
+                continue
+            for callback_key, (obj, meth) in list(slots.items()):
+                if obj is None: # normal function
+                    label = '%s.%s'%(meth.__module__, meth.__name__)
+                    callbacks.append((None, meth, label))
+                    continue
+                inst = obj()
+                if inst is None:
+                    # Oops, dead reference.
+                    del slots[callback_key]
+                    continue
+                # Resolve the method from the instance so that class
+                # methods, bound to the class, work too.
+                bound = getattr(inst, meth)
+                func = getattr(bound, '__func__', None)
+                if func is None or \
+                   getattr(bound, '__self__', None) is not inst:
+                    func = _late_bound(meth)
+                klass = inst if inspect.isclass(inst) else inst.__class__
+                label = '%s.%s'%(klass.__name__, meth)
+                callbacks.append((obj, func, label))
+        callbacks = tuple(callbacks)
+        self._dispatch.setdefault(key, {})[event] = callbacks
+        return callbacks
+
+    def _send_profiled(self, callbacks, source, event, args, kw_args):
+        """Same as the dispatch in `send` but records the time spent
+        in each callback."""
+        stats = self._callback_stats
+        for obj, func, label in callbacks:
+            if obj is None:
+                t0 = _timer()
+                func(source, event, *args, **kw_args)
+            else:
+                inst = obj()
+                if inst is None:
+                    continue
+                t0 = _timer()
+                func(inst, source, event, *args, **kw_args)
+            dt = _timer() - t0
+            entry = stats.get(label)
+            if entry is None:
+                stats[label] = [1, dt]
+            else:
+                entry[0] += 1
+                entry[1] += dt
+
+    def _make_remover(self, key, event, callback_key):
+        """Returns a weakref callback that removes the given slot when
+        the instance of a method callback is garbage collected."""
+        # Messenger instances are transient (the class is Borg), so
+        # refer to the shared dictionaries instead of `self`.
+        signals, dispatch = self._signals, self._dispatch
+        def remove(ref):
+            slots = signals.get(key, {}).get(event)
+            if slots is not None and callback_key in slots and \
+               slots[callback_key][0] is ref:
+                del slots[callback_key]
+                dispatch.pop(key, None)
+        return remove
+
     def _get_signals(self, obj):
         """Given an object `obj` it returns the signals of that
         object.
@@ -303,11 +447,23 @@ def connect(obj, event, callback):
 connect.__doc__ = _messenger.connect.__doc__
 
 def disconnect(obj, event=None, callback=None, obj_is_hash=False):
-    _messenger.disconnect(obj, event, callback)
+    _messenger.disconnect(obj, event, callback, obj_is_hash)
 disconnect.__doc__ = _messenger.disconnect.__doc__
 
 def send(obj, event, *args, **kw_args):
     _messenger.send(obj, event, *args, **kw_args)
 send.__doc__ = _messenger.send.__doc__
 
+def get_stats():
+    return _messenger.get_stats()
+get_stats.__doc__ = _messenger.get_stats.__doc__
+
+def reset_stats():
+    _messenger.reset_stats()
+reset_stats.__doc__ = _messenger.reset_stats.__doc__
+
+def set_profiling(profile):
+    _messenger.set_profiling(profile)
+set_profiling.__doc__ = _messenger.set_profiling.__doc__
+
 del _saved
@@ -0,0 +1,109 @@
+"""Writes images in background threads so that encoding and writing
+them to disk overlaps with rendering.
+
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import threading
+
+from tvtk.api import tvtk
+from tvtk.common import configure_input_data
+
+
+######################################################################
+# `AsyncImageWriter` class.
+######################################################################
+class AsyncImageWriter(object):
+    """Runs TVTK image writers in a pool of background threads.
+
+    The VTK writers release the GIL while they encode and write an
+    image, so the caller can go on rendering meanwhile.  At most
+    `max_pending` images are queued or being written at any time:
+    `submit` blocks when the queue is full, which bounds the memory
+    used by the pending images.
+
+    This needs `concurrent.futures`, which on Python 2 is provided by
+    the `futures` package.
+
+    """
+
+    def __init__(self, n_threads=2, max_pending=8):
+        # Imported here so that scenes do not need concurrent.futures
+        # unless images are saved asynchronously.
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            raise ImportError('Saving images asynchronously needs the '
+                              '`futures` package on Python 2.')
+        self._executor = ThreadPoolExecutor(max_workers=n_threads)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._done = threading.Condition()
+        self._n_pending = 0
+        self._errors = []
+
+    def submit(self, writer, image):
+        """Writes the `image` (an `ImageData`) with the given `writer`,
+        whose file name and options must be set, in a background
+        thread.  Returns a `concurrent.futures.Future` whose result is
+        the name of the written file.
+
+        Neither the writer nor the image should be used until the
+        future is done.
+        """
+        self._slots.acquire()
+        with self._done:
+            self._n_pending += 1
+        try:
+            configure_input_data(writer, image)
+            return self._executor.submit(self._write, tvtk.to_vtk(writer))
+        except Exception:
+            self._finish()
+            raise
+
+    def wait(self):
+        """Waits until all the submitted images are written.  Raises
+        the first error met while writing them since the last call, if
+        any."""
+        with self._done:
+            while self._n_pending > 0:
+                self._done.wait()
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def shutdown(self, wait=True):
+        """Stops the threads once the pending images are written, if
+        `wait` is True.  No image can be submitted afterwards."""
+        self._executor.shutdown(wait=wait)
+
+    @property
+    def n_pending(self):
+        """The number of images queued or being written."""
+        with self._done:
+            return self._n_pending
+
+    ######################################################################
+    # Non-public interface.
+    ######################################################################
+    def _write(self, writer):
+        """Writes with the given VTK writer and returns the file name.
+        Only the VTK object is used here, so that no trait notification
+        happens in the writing thread."""
+        try:
+            writer.Write()
+            if writer.GetErrorCode() != 0:
+                raise IOError('Unable to write %r.'%writer.GetFileName())
+            return writer.GetFileName()
+        except Exception as e:
+            with self._done:
+                self._errors.append(e)
+            raise
+        finally:
+            self._finish()
+
+    def _finish(self):
+        with self._done:
+            self._n_pending -= 1
+            self._done.notify_all()
+        self._slots.release()
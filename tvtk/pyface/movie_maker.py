@@ -12,17 +12,24 @@ class MovieMaker(HasTraits):
     directory = Directory
     filename = Str('anim%05d.png')
     anti_alias = Bool(True, desc='if the saved images should be anti-aliased')
+    asynchronous = Bool(
+        False, desc='if the images are encoded and written in the background'
+    )
 
     ##################
     # Private traits
     _subdir = Str
     _count = Int(0)
 
+    # The extensions of the images that can be saved asynchronously.
+    _raster_formats = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.ps')
+
     def default_traits_view(self):
         from traitsui.api import Item, View
         view = View(
             Item('record'),
             Item('anti_alias'),
+            Item('asynchronous'),
             Item('filename'),
             Item('directory'),
         )
@@ -40,7 +47,8 @@ class MovieMaker(HasTraits):
             self._save_scene(self._count)
 
     def animation_stop(self):
-        pass
+        if self.record and self.asynchronous:
+            self.scene.wait_for_saves()
 
     @contextmanager
     def record_movie(self):
@@ -74,7 +82,11 @@ class MovieMaker(HasTraits):
         fname = os.path.join(dir, self.filename%count)
         if not self.anti_alias:
             orig_aa = self.scene.anti_aliasing_frames
-        self.scene.save(fname)
+        if self.asynchronous and \
+           os.path.splitext(fname)[1].lower() in self._raster_formats:
+            self.scene.save(fname, asynchronous=True)
+        else:
+            self.scene.save(fname)
         if not self.anti_alias:
             self.scene.anti_aliasing_frames = orig_aa
 
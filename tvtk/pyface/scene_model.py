@@ -113,10 +113,8 @@ class SceneModel(TVTKScene):
     ######################################################################
     # TVTKScene API.
     ######################################################################
-    def render(self):
-        """ Force the scene to be rendered. Nothing is done if the
-        `disable_render` trait is set to True."""
-
+    def _do_render(self):
+        """ Ask the scene editor to render the scene."""
         self.do_render = True
 
     def add_actors(self, actors):
@@ -178,35 +176,43 @@ class SceneModel(TVTKScene):
         image format's save method.
         """
         self._check_scene_editor()
-        self.scene_editor.save(file_name, size, **kw_args)
+        return self.scene_editor.save(file_name, size, **kw_args)
 
-    def save_ps(self, file_name):
+    def save_ps(self, file_name, asynchronous=False):
         """Saves the rendered scene to a rasterized PostScript image.
-        For vector graphics use the save_gl2ps method."""
+        For vector graphics use the save_gl2ps method.  See `save_png`
+        for the `asynchronous` argument."""
         self._check_scene_editor()
-        self.scene_editor.save_ps(file_name)
+        return self.scene_editor.save_ps(file_name, asynchronous)
 
-    def save_bmp(self, file_name):
-        """Save to a BMP image file."""
+    def save_bmp(self, file_name, asynchronous=False):
+        """Save to a BMP image file.  See `save_png` for the
+        `asynchronous` argument."""
         self._check_scene_editor()
-        self.scene_editor.save_bmp(file_name)
+        return self.scene_editor.save_bmp(file_name, asynchronous)
 
-    def save_tiff(self, file_name):
-        """Save to a TIFF image file."""
+    def save_tiff(self, file_name, asynchronous=False):
+        """Save to a TIFF image file.  See `save_png` for the
+        `asynchronous` argument."""
         self._check_scene_editor()
-        self.scene_editor.save_tiff(file_name)
+        return self.scene_editor.save_tiff(file_name, asynchronous)
 
-    def save_png(self, file_name):
-        """Save to a PNG image file."""
+    def save_png(self, file_name, asynchronous=False):
+        """Save to a PNG image file.  If `asynchronous` is True, the
+        image is written in the background and a future is returned."""
         self._check_scene_editor()
-        self.scene_editor.save_png(file_name)
+        return self.scene_editor.save_png(file_name, asynchronous)
 
-    def save_jpg(self, file_name, quality=None, progressive=None):
+    def save_jpg(self, file_name, quality=None, progressive=None,
+                 asynchronous=False):
         """Arguments: file_name if passed will be used, quality is the
         quality of the JPEG(10-100) are valid, the progressive
-        arguments toggles progressive jpegs."""
+        arguments toggles progressive jpegs.  If `asynchronous` is
+        True, the image is written in the background and a future is
+        returned."""
         self._check_scene_editor()
-        self.scene_editor.save_jpg(file_name, quality, progressive)
+        return self.scene_editor.save_jpg(file_name, quality, progressive,
+                                          asynchronous)
 
     def save_iv(self, file_name):
         """Save to an OpenInventor file."""
@@ -282,6 +288,11 @@ class SceneModel(TVTKScene):
         self._check_scene_editor()
         self.scene_editor.save_x3d(file_name)
 
+    def wait_for_saves(self):
+        """Waits until all the images saved asynchronously are written."""
+        self._check_scene_editor()
+        self.scene_editor.wait_for_saves()
+
     def get_size(self):
         """Return size of the render window."""
         self._check_scene_editor()
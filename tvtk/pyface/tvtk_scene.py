@@ -15,6 +15,7 @@ from __future__ import print_function
 
 import os
 import os.path
+from contextlib import contextmanager
 
 from apptools.persistence import state_pickler
 from tvtk.api import tvtk
@@ -26,6 +27,7 @@ from traits.api import HasPrivateTraits, HasTraits, Any, Int, \
      Property, Instance, Event, Range, Bool, Trait, Str
 
 from tvtk.pyface import light_manager
+from tvtk.pyface.image_writer import AsyncImageWriter
 
 
 VTK_VER = tvtk.Version().vtk_version
@@ -193,6 +195,15 @@ class TVTKScene(HasPrivateTraits):
     _interactor = Instance(tvtk.RenderWindowInteractor)
     _camera = Instance(tvtk.Camera)
     _busy_count = Int(0)
+    # The background writer of the images saved asynchronously.
+    _image_writer = Any(transient=True)
+    # The nesting depth of `coalesce_renders` blocks, and whether a
+    # render was requested inside them.
+    _render_hold = Int(0)
+    _render_pending = Bool(False)
+    # The number of renders requested and performed.
+    _n_render_requests = Int(0)
+    _n_renders = Int(0)
 
     ###########################################################################
     # 'object' interface.
@@ -217,7 +228,9 @@ class TVTKScene(HasPrivateTraits):
         for x in ['control', '_renwin', '_interactor', '_camera',
                   '_busy_count', '__sync_trait__', 'recorder',
                   '_last_camera_state', '_camera_observer_id',
-                  '_script_id', '__traits_listener__']:
+                  '_script_id', '_image_writer', '_render_hold',
+                  '_render_pending', '_n_render_requests', '_n_renders',
+                  '__traits_listener__']:
             d.pop(x, None)
         # Additionally pickle these.
         d['camera'] = self.camera
@@ -238,6 +251,9 @@ class TVTKScene(HasPrivateTraits):
     # 'event' interface.
     ###########################################################################
     def _closed_fired(self):
+        if self._image_writer is not None:
+            self._image_writer.shutdown()
+            self._image_writer = None
         self.light_manager = None
         self._interactor = None
         self.movie_maker = None
@@ -247,9 +263,56 @@ class TVTKScene(HasPrivateTraits):
     ###########################################################################
     def render(self):
         """ Force the scene to be rendered. Nothing is done if the
-        `disable_render` trait is set to True."""
-        if not self.disable_render:
-            self._renwin.render()
+        `disable_render` trait is set to True.  While the renders are
+        held, see `hold_renders`, the render is deferred."""
+        self._n_render_requests += 1
+        if self._render_hold > 0:
+            self._render_pending = True
+        else:
+            self._n_renders += 1
+            self._do_render()
+
+    def hold_renders(self):
+        """Defers the renders requested with `render` until the
+        matching call to `release_renders`.  Calls may be nested."""
+        self._render_hold += 1
+
+    def release_renders(self):
+        """Ends a `hold_renders` call.  When the outermost hold is
+        released, the scene is rendered once if any render was
+        requested meanwhile."""
+        self._render_hold -= 1
+        if self._render_hold == 0 and self._render_pending:
+            self._render_pending = False
+            self._n_renders += 1
+            self._do_render()
+
+    @contextmanager
+    def coalesce_renders(self):
+        """Context manager deferring the renders requested in the
+        block to a single render when the outermost such block exits.
+
+        The Mayavi pipeline holds the renders while a `data_changed`
+        event propagates, so that the filters and modules updated by
+        one change of the data render the scene only once.
+        """
+        self.hold_renders()
+        try:
+            yield self
+        finally:
+            self.release_renders()
+
+    def get_render_stats(self):
+        """Returns a dictionary with the number of renders `requested`
+        with `render` and the number actually `performed`, since the
+        scene was created or `reset_render_stats` was called."""
+        return {'requested': self._n_render_requests,
+                'performed': self._n_renders}
+
+    def reset_render_stats(self):
+        """Resets the counters returned by `get_render_stats`."""
+        self._n_render_requests = 0
+        self._n_renders = 0
 
     def add_actors(self, actors):
         """ Adds a single actor or a tuple or list of actors to the
@@ -394,7 +457,9 @@ class TVTKScene(HasPrivateTraits):
         image that does not reflect what is seen on screen.
 
         Any extra keyword arguments are passed along to the respective
-        image format's save method.
+        image format's save method.  For instance, raster images are
+        saved in the background when `asynchronous=True` is passed, see
+        `save_png`.
         """
         ext = os.path.splitext(file_name)[1]
         meth_map = {'.ps': 'ps', '.bmp': 'bmp', '.tiff': 'tiff',
@@ -411,84 +476,73 @@ class TVTKScene(HasPrivateTraits):
         if size is not None:
             orig_size = self.get_size()
             self.set_size(size)
-            meth(file_name, **kw_args)
+            result = meth(file_name, **kw_args)
             self.set_size(orig_size)
             self._record_methods('save(%r, %r)'%(file_name, size))
         else:
-            meth(file_name, **kw_args)
+            result = meth(file_name, **kw_args)
             self._record_methods('save(%r)'%(file_name))
+        return result
 
-    def save_ps(self, file_name):
+    def save_ps(self, file_name, asynchronous=False):
         """Saves the rendered scene to a rasterized PostScript image.
-        For vector graphics use the save_gl2ps method."""
+        For vector graphics use the save_gl2ps method.  See `save_png`
+        for the `asynchronous` argument."""
         if len(file_name) != 0:
-            w2if = tvtk.WindowToImageFilter(read_front_buffer=
-                                              not self.off_screen_rendering)
-            w2if.magnification = self.magnification
-            self._lift()
-            w2if.input = self._renwin
             ex = tvtk.PostScriptWriter()
             ex.file_name = file_name
-            configure_input(ex, w2if)
-            self._exporter_write(ex)
+            return self._save_image(ex, asynchronous)
 
-    def save_bmp(self, file_name):
-        """Save to a BMP image file."""
+    def save_bmp(self, file_name, asynchronous=False):
+        """Save to a BMP image file.  See `save_png` for the
+        `asynchronous` argument."""
         if len(file_name) != 0:
-            w2if = tvtk.WindowToImageFilter(read_front_buffer=
-                                              not self.off_screen_rendering)
-            w2if.magnification = self.magnification
-            self._lift()
-            w2if.input = self._renwin
             ex = tvtk.BMPWriter()
             ex.file_name = file_name
-            configure_input(ex, w2if)
-            self._exporter_write(ex)
+            return self._save_image(ex, asynchronous)
 
-    def save_tiff(self, file_name):
-        """Save to a TIFF image file."""
+    def save_tiff(self, file_name, asynchronous=False):
+        """Save to a TIFF image file.  See `save_png` for the
+        `asynchronous` argument."""
         if len(file_name) != 0:
-            w2if = tvtk.WindowToImageFilter(read_front_buffer=
-                                              not self.off_screen_rendering)
-            w2if.magnification = self.magnification
-            self._lift()
-            w2if.input = self._renwin
             ex = tvtk.TIFFWriter()
             ex.file_name = file_name
-            configure_input(ex, w2if)
-            self._exporter_write(ex)
+            return self._save_image(ex, asynchronous)
+
+    def save_png(self, file_name, asynchronous=False):
+        """Save to a PNG image file.
 
-    def save_png(self, file_name):
-        """Save to a PNG image file."""
+        If `asynchronous` is True, the rendered image is grabbed and
+        then encoded and written in a background thread, and a
+        `concurrent.futures.Future` whose result is the file name is
+        returned.  Use `wait_for_saves` to wait until all such images
+        are written.
+        """
         if len(file_name) != 0:
-            w2if = tvtk.WindowToImageFilter(read_front_buffer=
-                                              not self.off_screen_rendering)
-            w2if.magnification = self.magnification
-            self._lift()
-            w2if.input = self._renwin
             ex = tvtk.PNGWriter()
             ex.file_name = file_name
-            configure_input(ex, w2if)
-            self._exporter_write(ex)
+            return self._save_image(ex, asynchronous)
 
-    def save_jpg(self, file_name, quality=None, progressive=None):
+    def save_jpg(self, file_name, quality=None, progressive=None,
+                 asynchronous=False):
         """Arguments: file_name if passed will be used, quality is the
         quality of the JPEG(10-100) are valid, the progressive
-        arguments toggles progressive jpegs."""
+        arguments toggles progressive jpegs.  See `save_png` for the
+        `asynchronous` argument."""
         if len(file_name) != 0:
             if not quality and not progressive:
                 quality, progressive = self.jpeg_quality, self.jpeg_progressive
-            w2if = tvtk.WindowToImageFilter(read_front_buffer=
-                                              not self.off_screen_rendering)
-            w2if.magnification = self.magnification
-            self._lift()
-            w2if.input = self._renwin
             ex = tvtk.JPEGWriter()
             ex.quality = quality
             ex.progressive = progressive
             ex.file_name = file_name
-            configure_input(ex, w2if)
-            self._exporter_write(ex)
+            return self._save_image(ex, asynchronous)
+
+    def wait_for_saves(self):
+        """Waits until all the images saved asynchronously are written.
+        Raises the first error met while writing them, if any."""
+        if self._image_writer is not None:
+            self._image_writer.wait()
 
     def save_iv(self, file_name):
         """Save to an OpenInventor file."""
@@ -844,19 +898,57 @@ class TVTKScene(HasPrivateTraits):
         image."""
         return
 
+    def _do_render(self):
+        """Actually renders the scene, unless `disable_render` is set.
+        Override this rather than `render` in toolkit specific
+        scenes."""
+        if not self.disable_render:
+            self._renwin.render()
+
     def _exporter_write(self, ex):
         """Abstracts the exporter's write method."""
+        with self._anti_aliased():
+            ex.update()
+            ex.write()
+
+    @contextmanager
+    def _anti_aliased(self):
+        """Renders the scene anti-aliased while an image is saved."""
         # Bumps up the anti-aliasing frames when the image is saved so
         # that the saved picture looks nicer.
         rw = self.render_window
         aa_frames = rw.aa_frames
         rw.aa_frames = self.anti_aliasing_frames
         rw.render()
-        ex.update()
-        ex.write()
-        # Set the frames back to original setting.
-        rw.aa_frames = aa_frames
-        rw.render()
+        try:
+            yield
+        finally:
+            # Set the frames back to original setting.
+            rw.aa_frames = aa_frames
+            rw.render()
+
+    def _save_image(self, ex, asynchronous=False):
+        """Saves the rendered scene with the image writer `ex`.  If
+        `asynchronous` is True, only the pixels are grabbed here and
+        a future for the background write is returned."""
+        w2if = tvtk.WindowToImageFilter(read_front_buffer=
+                                          not self.off_screen_rendering)
+        w2if.magnification = self.magnification
+        self._lift()
+        w2if.input = self._renwin
+        if not asynchronous:
+            configure_input(ex, w2if)
+            self._exporter_write(ex)
+            return None
+        with self._anti_aliased():
+            w2if.update()
+        # Detach the pixels from the filter so that the writing thread
+        # never executes it.
+        image = tvtk.ImageData()
+        image.shallow_copy(w2if.output)
+        if self._image_writer is None:
+            self._image_writer = AsyncImageWriter()
+        return self._image_writer.submit(ex, image)
 
     def _update_view(self, x, y, z, vx, vy, vz):
         """Used internally to set the view."""
@@ -341,12 +341,6 @@ class Scene(TVTKScene, Widget):
     ###########################################################################
     # 'Scene' interface.
     ###########################################################################
-    def render(self):
-        """ Force the scene to be rendered. Nothing is done if the
-        `disable_render` trait is set to True."""
-        if not self.disable_render:
-            self._vtk_control.Render()
-
     def get_size(self):
         """Return size of the render window."""
         sz = self._vtk_control.size()
@@ -428,6 +422,12 @@ class Scene(TVTKScene, Widget):
 
         return window
 
+    def _do_render(self):
+        """ Render the scene. Nothing is done if the `disable_render`
+        trait is set to True."""
+        if not self.disable_render:
+            self._vtk_control.Render()
+
     def _lift(self):
         """Lift the window to the top. Useful when saving screen to an
         image."""
@@ -452,6 +452,15 @@ class SpecialGenerator:
             array_handler.array2vtkCellArray(arr, self._vtk_obj)
             self.update_traits()
 
+        def from_offsets(self, offsets, connectivity):
+            '''Set the cells using the passed offsets and
+            connectivity arrays.  This is the most efficient way to
+            set cells of mixed sizes.
+            '''
+            array_handler.offsets2vtkCellArray(offsets, connectivity,
+                                               self._vtk_obj)
+            self.update_traits()
+
         def to_array(self):
             '''Return the object as a Numeric array.'''
             return array_handler.vtk2array(self._vtk_obj.GetData())
@@ -167,6 +167,52 @@ class TestArrayHandler(unittest.TestCase):
             array_handler.array2vtk(numpy.zeros((1,), dtype=dtype))
 
 
+    def test_array2vtk_copy(self):
+        """Test when array2vtk copies data and the copy argument."""
+        cache = array_handler._array_cache
+        cache.reset_stats()
+
+        # Contiguous arrays of a supported dtype are never copied.
+        a = numpy.arange(12, dtype='d').reshape(4, 3)
+        vtk_arr = array_handler.array2vtk(a, copy=False)
+        self.assertFalse(cache.is_copy(vtk_arr))
+        a[0, 0] = 100.0
+        self.assertEqual(vtk_arr.GetTuple3(0), (100.0, 1.0, 2.0))
+        stats = cache.get_stats()
+        self.assertEqual(stats['aliased'], 1)
+        self.assertEqual(stats['aliased_bytes'], a.nbytes)
+        self.assertEqual(stats['copied'], 0)
+
+        # Non-contiguous, byte swapped and mismatched dtype arrays
+        # must be copied.
+        b = a[:, :2]
+        self.assertRaises(ValueError, array_handler.array2vtk, b,
+                          copy=False)
+        vtk_arr1 = array_handler.array2vtk(b)
+        self.assertEqual(cache.get_copy_reason(vtk_arr1), 'non-contiguous')
+        self._check_arrays(b, vtk_arr1)
+
+        c = a.astype('>f8')
+        vtk_arr2 = array_handler.array2vtk(c)
+        self.assertEqual(cache.get_copy_reason(vtk_arr2), 'byte order')
+        self._check_arrays(a, vtk_arr2)
+
+        d = numpy.array([1, 2, 3], numpy.int8)
+        vtk_arr3 = array_handler.array2vtk(d, vtk.vtkDoubleArray())
+        self.assertEqual(cache.get_copy_reason(vtk_arr3), 'dtype')
+
+        # Forced copies do not alias the original data.
+        vtk_arr4 = array_handler.array2vtk(a, copy=True)
+        self.assertTrue(cache.is_copy(vtk_arr4))
+        a[0, 0] = 0.0
+        self.assertEqual(vtk_arr4.GetTuple3(0), (100.0, 1.0, 2.0))
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['copied'], 4)
+        self.assertEqual(stats['copy_reasons'],
+                         {'non-contiguous': 1, 'byte order': 1,
+                          'dtype': 1, 'requested': 1})
+
     def test_arr2cell_array(self):
         """Test Numeric array to vtkCellArray conversion."""
         # Test list of lists.
@@ -222,6 +268,42 @@ class TestArrayHandler(unittest.TestCase):
         cells = array_handler.array2vtkCellArray(a)
         self.assertEqual(cells.GetNumberOfCells(), N)
 
+    def test_offsets2cell_array(self):
+        """Test offsets and connectivity to vtkCellArray conversion."""
+        # A triangle, a quad and a tetrahedron.
+        offsets = numpy.array([0, 3, 7, 11])
+        connectivity = numpy.arange(11)
+        cells = array_handler.offsets2vtkCellArray(offsets, connectivity)
+        self.assertEqual(cells.GetNumberOfCells(), 3)
+        arr = array_handler.vtk2array(cells.GetData())
+        expect = [3, 0, 1, 2, 4, 3, 4, 5, 6, 4, 7, 8, 9, 10]
+        self.assertEqual(list(arr), expect)
+
+        # The final offset is optional and lists also work.
+        cells = vtk.vtkCellArray()
+        ident = id(cells)
+        cells = array_handler.offsets2vtkCellArray([0, 3, 7],
+                                                   list(range(11)), cells)
+        self.assertEqual(id(cells), ident)
+        arr = array_handler.vtk2array(cells.GetData())
+        self.assertEqual(list(arr), expect)
+
+        self.assertRaises(AssertionError,
+                          array_handler.offsets2vtkCellArray,
+                          [1, 3], connectivity)
+        self.assertRaises(AssertionError,
+                          array_handler.offsets2vtkCellArray,
+                          [0, 5, 3], connectivity)
+
+        # This should be fast for a million mixed cells.
+        N = int(1e6)
+        sizes = numpy.tile([4, 6, 8], N//3 + 1)[:N]
+        offsets = numpy.zeros(N + 1, int)
+        numpy.cumsum(sizes, out=offsets[1:])
+        connectivity = numpy.arange(offsets[-1]) % 1000
+        cells = array_handler.offsets2vtkCellArray(offsets, connectivity)
+        self.assertEqual(cells.GetNumberOfCells(), N)
+
     def test_arr2vtkPoints(self):
         """Test Numeric array to vtkPoints conversion."""
         a = [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]]
@@ -396,6 +478,76 @@ class TestArrayHandler(unittest.TestCase):
         del varr
         self.assertEqual(len(cache), 0)
 
+    def test_array_cache_memory_accounting(self):
+        """Test the memory accounting of the ArrayCache."""
+        cache = array_handler.ArrayCache()
+        calls = []
+        cache.add_high_water_callback(1000,
+                                      lambda c, n: calls.append(n))
+        a = numpy.zeros(100, 'f')
+        b = numpy.zeros(100, 'd')
+        va = vtk.vtkFloatArray()
+        vb = vtk.vtkDoubleArray()
+        cache.add(va, a)
+        self.assertEqual(cache.get_nbytes(), 400)
+        self.assertEqual(calls, [])
+        cache.add(vb, b, owner='points')
+        self.assertEqual(cache.get_nbytes(), 1200)
+        self.assertEqual(calls, [1200])
+
+        summary = cache.summary()
+        self.assertEqual(summary['n_arrays'], 2)
+        self.assertEqual(summary['by_dtype'],
+                         {'float32': (1, 400), 'float64': (1, 800)})
+        self.assertEqual(summary['by_owner'],
+                         {'vtkFloatArray': (1, 400), 'points': (1, 800)})
+        self.assertEqual(summary['largest'][0], ('points', 'float64', 800))
+
+        # Re-assigning data to a VTK array replaces its entry.
+        cache.add(vb, numpy.zeros(10, 'd'))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_nbytes(), 480)
+        self.assertEqual(cache.get_peak_bytes(), 1200)
+
+        # Crossing the threshold again calls the callback again.
+        cache.add(vb, b)
+        self.assertEqual(calls, [1200, 1200])
+
+        # Entries whose data is no longer used by VTK are released.
+        va.SetVoidArray(a, 100, 1)
+        vb.SetVoidArray(b, 100, 1)
+        self.assertEqual(cache.release_stale(), 0)
+        vb.SetNumberOfTuples(1000)
+        self.assertEqual(cache.release_stale(), 800)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(vb in cache, False)
+        self.assertEqual(cache.get_nbytes(), 400)
+
+        del va
+        self.assertEqual(cache.get_nbytes(), 0)
+
+    def test_release_stale_keeps_arrays_owned_by_vtk(self):
+        """Test that arrays still used by VTK are not released when
+        their Python wrappers are collected."""
+        cache = array_handler.ArrayCache()
+        a = numpy.arange(30000, dtype='d')
+        arr = vtk.vtkDoubleArray()
+        arr.SetVoidArray(a, a.size, 1)
+        cache.add(arr, a)
+        pd = vtk.vtkPolyData()
+        pd.GetPointData().SetScalars(arr)
+        del arr, a
+
+        self.assertEqual(cache.release_stale(), 0)
+        self.assertEqual(cache.get_nbytes(), 240000)
+        scalars = pd.GetPointData().GetScalars()
+        self.assertEqual(scalars.GetValue(7), 7.0)
+
+        # Once VTK no longer uses it, the array is released.
+        del scalars
+        pd.GetPointData().SetScalars(None)
+        self.assertEqual(cache.get_nbytes(), 0)
+
     def test_vtk2array_appended_array(self):
         """Test the vtk2array can tolerate appending a cached array."""
         # array is cached upon array2vtk is called
@@ -2,8 +2,11 @@
 
 import unittest
 
+import numpy
+
 from tvtk.util.ctf import (load_ctfs, save_ctfs, \
-        rescale_ctfs, ColorTransferFunction, PiecewiseFunction)
+        rescale_ctfs, get_table, set_lut, ColorTransferFunction,
+        PiecewiseFunction)
 from tvtk.api import tvtk
 
 
@@ -68,6 +71,31 @@ class TestCTFUtil(unittest.TestCase):
         # check that both the data are identical.
         self.assertEqual(edata, data)
 
+    def test_get_table(self):
+        """Test if sampled tables are cached and shared."""
+        table = get_table(self.vp, 5)
+        self.assertEqual(table.shape, (5, 4))
+        for i, x in enumerate(numpy.linspace(255, 355, 5)):
+            rgba = self.ctf.get_color(x) + (self.otf.get_value(x),)
+            self.assertTrue(numpy.allclose(table[i], rgba))
+        # The same table is used for identical transfer functions.
+        vp, ctf, otf = make_volume_prop()
+        self.assertTrue(get_table(vp, 5) is table)
+        # But not once a transfer function changes.
+        otf.add_point(300, 1.0)
+        self.assertFalse(get_table(vp, 5) is table)
+        self.assertTrue(get_table(self.vp, 5) is table)
+
+    def test_set_lut(self):
+        """Test setting a LUT from a volume property."""
+        lut = tvtk.LookupTable(number_of_colors=5)
+        lut.build()
+        set_lut(lut, self.vp)
+        self.assertEqual(lut.number_of_colors, 5)
+        r, g, b, a = lut.get_table_value(4)
+        self.assertTrue(numpy.allclose((r, g, b, a), (1.0, 0.0, 0.0, 0.2),
+                                       atol=1.0/255))
+
 
 if __name__ == '__main__':
     unittest.main()
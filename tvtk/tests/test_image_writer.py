@@ -0,0 +1,71 @@
+"""Tests for the asynchronous image writer.
+
+"""
+# Copyright (c) 2016, Enthought, Inc.
+# License: BSD Style.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from tvtk.api import tvtk
+from tvtk.pyface.image_writer import AsyncImageWriter
+
+
+def make_image(value, size=(32, 16)):
+    image = tvtk.ImageData(dimensions=(size[0], size[1], 1))
+    pixels = numpy.empty((size[0]*size[1], 3), dtype=numpy.uint8)
+    pixels[:] = value
+    image.point_data.scalars = pixels
+    return image
+
+
+class TestAsyncImageWriter(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.writer = AsyncImageWriter(n_threads=2, max_pending=2)
+
+    def tearDown(self):
+        self.writer.shutdown()
+        shutil.rmtree(self.root)
+
+    def test_writes_images_in_background(self):
+        # Given
+        names = [os.path.join(self.root, 'img%d.png'%i) for i in range(5)]
+
+        # When
+        futures = []
+        for i, name in enumerate(names):
+            ex = tvtk.PNGWriter(file_name=name)
+            futures.append(self.writer.submit(ex, make_image(i*50)))
+        self.writer.wait()
+
+        # Then
+        self.assertEqual([f.result() for f in futures], names)
+        self.assertEqual(self.writer.n_pending, 0)
+        for i, name in enumerate(names):
+            r = tvtk.PNGReader(file_name=name)
+            r.update()
+            pixels = r.output.point_data.scalars.to_array()
+            self.assertTrue(numpy.all(pixels == i*50))
+
+    def test_wait_raises_write_errors(self):
+        # Given
+        name = os.path.join(self.root, 'missing', 'img.png')
+        ex = tvtk.PNGWriter(file_name=name)
+
+        # When
+        future = self.writer.submit(ex, make_image(0))
+
+        # Then
+        self.assertRaises(IOError, self.writer.wait)
+        self.assertRaises(IOError, future.result)
+        # The error is only reported once.
+        self.writer.wait()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -146,6 +146,68 @@ class TestMessenger(unittest.TestCase):
         # Clean up.
         messenger.disconnect(c1)
 
+    def test_dead_ref_removed_on_gc(self):
+        """Test if a gc'd method callback is removed without a send."""
+        class C:
+            def foo(self, o, e):
+                pass
+        c = C()
+        c1 = C()
+        messenger.connect(c1, 'foo', c.foo)
+        m = messenger.Messenger()
+        self.assertEqual(len(m._signals[hash(c1)]['foo']), 1)
+        del c
+        self.assertEqual(len(m._signals[hash(c1)]['foo']), 0)
+        messenger.disconnect(c1)
+
+    def test_dispatch_cache(self):
+        """Test if connections made after a send are honored."""
+        b = B()
+        b.send(1)
+        self.assertEqual(b.a.did_catch_all, 0)
+        messenger.connect(b, 'all', b.a.catch_all_cb)
+        b.send(1)
+        self.assertEqual(b.a.did_catch_all, 1)
+        b.a.did_catch_all = 0
+        messenger.disconnect(b, 'all', b.a.catch_all_cb)
+        b.send(1)
+        self.assertEqual(b.a.did_catch_all, 0)
+
+    def test_classmethod_callback(self):
+        """Test if class methods can be used as callbacks."""
+        class C(object):
+            events = []
+            @classmethod
+            def foo(cls, o, e):
+                cls.events.append(e)
+        c = C()
+        b = B()
+        messenger.connect(b, 'cls', C.foo)
+        messenger.connect(b, 'inst', c.foo)
+        messenger.send(b, 'cls')
+        messenger.send(b, 'inst')
+        self.assertEqual(C.events, ['cls', 'inst'])
+        messenger.disconnect(b)
+
+    def test_stats(self):
+        """Test the event and callback statistics."""
+        b = B()
+        messenger.reset_stats()
+        messenger.set_profiling(True)
+        try:
+            b.send(1)
+            b.send(2)
+        finally:
+            messenger.set_profiling(False)
+        b.send(3)
+        stats = messenger.get_stats()
+        self.assertEqual(stats['events'], 6)
+        self.assertTrue(stats['events_per_second'] > 0)
+        calls, total = stats['callbacks']['A.callback']
+        self.assertEqual(calls, 2)
+        self.assertTrue(total >= 0)
+        self.assertEqual(stats['callbacks'][__name__ + '.callback'][0], 2)
+
 
 if __name__ == "__main__":
     unittest.main()
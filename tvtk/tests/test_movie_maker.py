@@ -5,6 +5,7 @@ import tempfile
 import unittest
 
 from tvtk.pyface.movie_maker import MovieMaker
+from tvtk.pyface.tvtk_scene import TVTKScene
 
 
 class TestMovieMaker(unittest.TestCase):
@@ -80,6 +81,22 @@ class TestMovieMaker(unittest.TestCase):
         # Then
         self.assertEqual(mm._subdir, 'movie002')
 
+    def test_asynchronous_saves_are_waited_for(self):
+        # Given
+        mm = MovieMaker(record=True, directory=self.root, asynchronous=True)
+        scene = mock.MagicMock(spec=TVTKScene)
+        mm.scene = scene
+
+        # When
+        with mm.record_movie():
+            mm.animation_step()
+
+        # Then
+        fname = os.path.join(self.root, 'movie001', 'anim00001.png')
+        scene.save.assert_called_with(fname, asynchronous=True)
+        self.assertEqual(scene.save.call_count, 2)
+        scene.wait_for_saves.assert_called_once_with()
+
 
 if __name__ == '__main__':
     unittest.main()
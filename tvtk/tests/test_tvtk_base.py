@@ -169,6 +169,91 @@ class TestTVTKBase(unittest.TestCase):
 
         obj.SetRepresentationToSurface()
         self.assertEqual(p.representation, 'surface')
+    def test_deferred_updates(self):
+        """Test if trait updates are coalesced when deferred."""
+        p = Prop()
+        obj = p._vtk_obj
+        changes = []
+        p.on_trait_change(lambda n: changes.append(n), 'opacity')
+        with tvtk_base.deferred_updates():
+            obj.SetOpacity(0.5)
+            obj.SetOpacity(0.25)
+            obj.SetEdgeVisibility(1)
+            # The traits are not updated yet.
+            self.assertEqual(p.opacity, 1.0)
+            self.assertEqual(p.edge_visibility, 0)
+        self.assertEqual(p.opacity, 0.25)
+        self.assertEqual(p.edge_visibility, 1)
+        self.assertEqual(changes, [0.25])
+
+        # Setting traits within the block still changes VTK.
+        with tvtk_base.deferred_updates():
+            p.opacity = 0.75
+            self.assertEqual(obj.GetOpacity(), 0.75)
+        self.assertEqual(p.opacity, 0.75)
+
+        # Only traits with listeners are updated when requested.
+        with tvtk_base.deferred_updates(listened_only=True):
+            obj.SetOpacity(0.5)
+            obj.SetEdgeVisibility(0)
+        self.assertEqual(p.opacity, 0.5)
+        self.assertEqual(p.edge_visibility, 1)
+        p.update_traits()
+        self.assertEqual(p.edge_visibility, 0)
+
+    def test_update_scheduler(self):
+        """Test if updates are flushed by the update scheduler."""
+        p = Prop()
+        obj = p._vtk_obj
+        scheduled = []
+        tvtk_base.set_update_scheduler(scheduled.append)
+        try:
+            obj.SetOpacity(0.5)
+            obj.SetOpacity(0.25)
+            self.assertEqual(len(scheduled), 1)
+            self.assertEqual(p.opacity, 1.0)
+            scheduled.pop()()
+            self.assertEqual(p.opacity, 0.25)
+            obj.SetOpacity(0.5)
+        finally:
+            tvtk_base.set_update_scheduler(None)
+        # Pending updates are flushed when the scheduler is removed.
+        self.assertEqual(p.opacity, 0.5)
+
+    def test_lazy_observers(self):
+        """Test if observers are only setup when needed."""
+        tvtk_base.set_lazy_observers(True)
+        try:
+            p = Prop()
+        finally:
+            tvtk_base.set_lazy_observers(False)
+        obj = p._vtk_obj
+        self.assertEqual(obj.__this__ in
+                         tvtk_base._object_cache._observer_data, False)
+        obj.SetOpacity(0.5)
+        self.assertEqual(p.opacity, 1.0)
+
+        # Adding a listener sets up the observers and syncs the traits.
+        changes = []
+        p.on_trait_change(lambda n: changes.append(n), 'opacity')
+        self.assertEqual(p.opacity, 0.5)
+        obj.SetOpacity(0.25)
+        self.assertEqual(p.opacity, 0.25)
+        self.assertEqual(changes, [0.25])
+        self.assertEqual(
+            len(tvtk_base._object_cache._observer_data[obj.__this__]), 1
+        )
+
+        # Adding more listeners does not add more observers.
+        p.on_trait_change(lambda n: None, 'color')
+        self.assertEqual(
+            len(tvtk_base._object_cache._observer_data[obj.__this__]), 1
+        )
+
+        # Lazily observed objects are still collected.
+        ref = weakref.ref(p)
+        del p
+        self.assertEqual(ref(), None)
 
     def test_pickle(self):
         """Test if pickling works."""
@@ -38,6 +38,30 @@ class TestTVTKScene(unittest.TestCase):
         # The TVTK Scene should have been collected.
         self.assertTrue(scene_collected[0])
 
+    def test_coalesce_renders(self):
+        # given
+        scene = TVTKScene(off_screen_rendering=True)
+        scene.reset_render_stats()
+
+        # when
+        with scene.coalesce_renders():
+            scene.render()
+            with scene.coalesce_renders():
+                scene.render()
+                scene.render()
+            # Nothing is rendered before the outermost block exits.
+            self.assertEqual(scene.get_render_stats()['performed'], 0)
+
+        # then
+        self.assertEqual(scene.get_render_stats(),
+                         {'requested': 3, 'performed': 1})
+
+        # Renders are not deferred outside a block.
+        scene.render()
+        self.assertEqual(scene.get_render_stats(),
+                         {'requested': 4, 'performed': 2})
+        scene.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -11,10 +11,13 @@ import sys
 import weakref
 import os
 import logging
+from collections import OrderedDict
+from contextlib import contextmanager
 
 import vtk
 
 from traits import api as traits
+from traits.trait_notifiers import StaticTraitChangeNotifyWrapper
 from . import messenger
 
 # Setup a logger for this module.
@@ -131,6 +134,138 @@ def get_tvtk_object_from_cache(vtk_obj):
     return _object_cache.get(vtk_obj.__this__)
 
 
+# If True, the observers keeping the traits of TVTK objects in sync
+# with the wrapped VTK object are only setup once a trait listener is
+# registered on the object or its UI is opened.
+_lazy_observers = False
+
+
+def set_lazy_observers(lazy):
+    """Enable or disable lazy observer setup for TVTK objects created
+    from now on.
+
+    Setting up the observer for the ModifiedEvent costs time when a
+    TVTK object is created and a callback on every change of the VTK
+    object.  When `lazy` is True, this is deferred until a trait
+    listener is added to the TVTK object (via `on_trait_change` or
+    `observe`) or its UI is opened.  Until then, changes made directly
+    to the VTK object are not reflected in the traits unless
+    `update_traits` is called.
+
+    """
+    global _lazy_observers
+    _lazy_observers = bool(lazy)
+
+
+def get_lazy_observers():
+    """Return True if lazy observer setup is enabled."""
+    return _lazy_observers
+
+
+######################################################################
+# Deferred trait updates.
+######################################################################
+
+class DeferredUpdates(object):
+    """Coalesces the trait updates of TVTK objects.
+
+    While updates are deferred, `TVTKBase.update_traits` only records
+    the object.  Each recorded object is updated once when the
+    updates are flushed, no matter how many ModifiedEvents it fired in
+    the meantime.  Updates are deferred inside a `deferred_updates`
+    block (and flushed at its end) or, once a scheduler has been set
+    with `set_update_scheduler`, until the scheduler runs the flush
+    (typically on the next event loop iteration).
+
+    """
+    def __init__(self):
+        # Nesting level of `deferred_updates` blocks.
+        self.depth = 0
+        # Callable used to run `flush` later, or None.
+        self.scheduler = None
+        # If True only traits that have listeners are updated on
+        # flush.
+        self.listened_only = False
+        # Weak references to the objects needing an update.
+        self._pending = OrderedDict()
+        self._flush_scheduled = False
+
+    def is_active(self):
+        """Return True if updates are currently being deferred."""
+        return self.depth > 0 or self.scheduler is not None
+
+    def add(self, obj):
+        """Record that the traits of `obj` need to be updated."""
+        self._pending[weakref.ref(obj)] = None
+        if self.depth == 0 and self.scheduler is not None and \
+           not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.scheduler(self.flush)
+
+    def flush(self):
+        """Update the traits of all the recorded objects."""
+        self._flush_scheduled = False
+        pending = self._pending
+        while pending:
+            ref, dummy = pending.popitem(last=False)
+            obj = ref()
+            if obj is not None:
+                obj._sync_traits(listened_only=self.listened_only)
+
+
+_deferred_updates = DeferredUpdates()
+
+
+@contextmanager
+def deferred_updates(listened_only=False):
+    """Context manager that defers the trait updates of all TVTK
+    objects until the end of the block, where each modified object is
+    updated once.
+
+    If `listened_only` is True, only traits that have listeners
+    (other than the handler syncing them to VTK), for example because
+    they are shown in a UI, are updated at the end of the block.  The
+    other traits may then be stale until the next `update_traits`
+    call.
+
+    """
+    d = _deferred_updates
+    old = d.listened_only
+    d.listened_only = listened_only
+    d.depth += 1
+    try:
+        yield d
+    finally:
+        d.depth -= 1
+        if d.depth == 0:
+            d.flush()
+        d.listened_only = old
+
+
+def set_update_scheduler(scheduler, listened_only=False):
+    """Defer the trait updates of all TVTK objects and flush them
+    using the given `scheduler`, a callable that is passed a function
+    to be called later, for example `pyface.api.GUI.invoke_later`.
+    This coalesces the updates triggered within one event loop
+    iteration.  Pass `None` to go back to immediate updates.  See
+    `deferred_updates` for the meaning of `listened_only`.
+    """
+    d = _deferred_updates
+    d.scheduler = scheduler
+    d.listened_only = listened_only
+    if scheduler is None and d.depth == 0:
+        d.flush()
+
+
+def _is_equal(a, b):
+    """Return True if `a == b` and the comparison yields a single
+    truth value."""
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
 ######################################################################
 # Special traits used by the tvtk objects.
 ######################################################################
@@ -271,6 +406,10 @@ class TVTKBase(traits.HasStrictTraits):
     # notifications when set which is why we use `Python`.
     _in_set = traits.Python
 
+    # True if the setup of the observers has been deferred until a
+    # listener is added (see `set_lazy_observers`).
+    _observers_deferred = traits.Python
+
     # The wrapped VTK object.
     _vtk_obj = traits.Trait(None, None, vtk.vtkObjectBase())
 
@@ -319,8 +458,9 @@ class TVTKBase(traits.HasStrictTraits):
           creating the object.
 
         """
-        # Initialize the Python attribute.
+        # Initialize the Python attributes.
         self._in_set = 0
+        self._observers_deferred = False
         if obj:
             assert obj.IsA(klass.__name__)
             self._vtk_obj = obj
@@ -340,8 +480,12 @@ class TVTKBase(traits.HasStrictTraits):
         if update:
             self.update_traits()
 
-        # Setup observers for the modified event.
-        self.setup_observers()
+        # Setup observers for the modified event unless this is done
+        # lazily.
+        if _lazy_observers:
+            self._observers_deferred = True
+        else:
+            self.setup_observers()
 
         _object_cache[self._vtk_obj.__this__] = self
 
@@ -359,10 +503,11 @@ class TVTKBase(traits.HasStrictTraits):
         """Support for primitive pickling.  Only the basic state is
         pickled.
         """
-        self.update_traits()
+        self._sync_traits()
         d = self.__dict__.copy()
-        for i in ['_vtk_obj', '_in_set', 'reference_count',
-                  'global_warning_display', '__sync_trait__']:
+        for i in ['_vtk_obj', '_in_set', '_observers_deferred',
+                  'reference_count', 'global_warning_display',
+                  '__sync_trait__']:
             d.pop(i, None)
         return d
 
@@ -437,6 +582,28 @@ class TVTKBase(traits.HasStrictTraits):
 
     class_trait_view_elements = classmethod( class_trait_view_elements )
 
+    def edit_traits(self, *args, **kw):
+        """Overridden to make sure the traits are kept in sync with
+        the VTK object while the UI is open."""
+        self._ensure_observers()
+        return super(TVTKBase, self).edit_traits(*args, **kw)
+
+    def observe(self, handler, expression, *args, **kw):
+        """Overridden to setup the observers lazily."""
+        if not kw.get('remove', False):
+            self._ensure_observers()
+        return super(TVTKBase, self).observe(handler, expression,
+                                             *args, **kw)
+
+    def _on_trait_change(self, handler, name=None, remove=False,
+                         *args, **kw):
+        """Overridden to setup the observers lazily.  This is used by
+        `on_trait_change` as well as by extended trait listeners."""
+        if not remove:
+            self._ensure_observers()
+        return super(TVTKBase, self)._on_trait_change(handler, name,
+                                                      remove, *args, **kw)
+
     #################################################################
     # `TVTKBase` interface.
     #################################################################
@@ -444,6 +611,7 @@ class TVTKBase(traits.HasStrictTraits):
         """Add an observer for the ModifiedEvent so the traits are kept
         up-to-date with the wrapped VTK object and do it in a way that
         avoids reference cycles."""
+        self._observers_deferred = False
         _object_cache.setup_observers(self._vtk_obj,
                                       'ModifiedEvent',
                                       self.update_traits)
@@ -464,6 +632,26 @@ class TVTKBase(traits.HasStrictTraits):
         used in the function.  They exist only for compatibility with
         the VTK observer callback functions.
 
+        If updates are being deferred (see `deferred_updates` and
+        `set_update_scheduler`), the object is only marked for
+        updating and the traits are updated later.
+
+        """
+        if self._in_set:
+            return
+        if _deferred_updates.is_active():
+            _deferred_updates.add(self)
+            return
+        self._sync_traits()
+
+    #################################################################
+    # Non-public interface.
+    #################################################################
+    def _sync_traits(self, listened_only=False):
+        """Set the 'updateable' traits from the wrapped VTK object.
+        Traits whose value has not changed are not set.  If
+        `listened_only` is True, only traits that have listeners
+        other than their own `_<name>_changed` handler are updated.
         """
         if self._in_set:
             return
@@ -477,11 +665,18 @@ class TVTKBase(traits.HasStrictTraits):
         warn = vtk.vtkObject.GetGlobalWarningDisplay()
         vtk.vtkObject.GlobalWarningDisplayOff()
 
+        if listened_only and self._notifiers(False):
+            # Someone listens to all the traits.
+            listened_only = False
+
         for name, getter in self._updateable_traits_:
             if name == 'global_warning_display':
                 setattr(self, name, warn)
                 continue
 
+            if listened_only and not self._has_listeners(name):
+                continue
+
             try:
                 val = getattr(vtk_obj, getter)()
             except (AttributeError, TypeError):
@@ -492,6 +687,10 @@ class TVTKBase(traits.HasStrictTraits):
                 # value (e.g. vtkImageConvolve.GetKernel3x3 and alike)
                 pass
             else:
+                # Skip the (comparatively expensive) validation and
+                # notification when the value is unchanged.
+                if _is_equal(getattr(self, name), val):
+                    continue
                 try:
                     setattr(self, name, val)
                 except traits.TraitError:
@@ -504,9 +703,29 @@ class TVTKBase(traits.HasStrictTraits):
         vtk.vtkObject.SetGlobalWarningDisplay(warn)
         self._in_set = 0
 
-    #################################################################
-    # Non-public interface.
-    #################################################################
+    def _ensure_observers(self):
+        """Setup the observers if they have been deferred by lazy
+        observer setup, updating the traits first."""
+        if self._observers_deferred:
+            self.update_traits()
+            self.setup_observers()
+
+    def _has_listeners(self, name):
+        """Return True if the named trait has any change listeners
+        apart from the static `_<name>_changed` handler that pushes
+        its value to VTK.
+        """
+        ctrait = self._trait(name, 0)
+        if ctrait is None:
+            return False
+        notifiers = ctrait._notifiers(False)
+        if not notifiers:
+            return False
+        for notifier in notifiers:
+            if not isinstance(notifier, StaticTraitChangeNotifyWrapper):
+                return True
+        return False
+
     def _do_change(self, method, val, force_update=False):
         """This is called by the various traits when they change in
         order to update the underlying VTK object.
@@ -5,10 +5,24 @@
 # Copyright (c) 2006-2015, Enthought, Inc.
 # License: BSD Style.
 
+# Standard library imports.
+from collections import OrderedDict
+
+import numpy
+
 # Enthought library imports.
 from traits.api import List
 from tvtk.api import tvtk
 
+# The maximum number of tables kept by `get_table`.
+TABLE_CACHE_SIZE = 64
+
+# The tables sampled by `get_table` keyed by the content of the
+# transfer functions, and these keys keyed by the address and
+# modification time of the transfer functions.
+_table_cache = OrderedDict()
+_key_cache = OrderedDict()
+
 
 ##########################################################################
 # Color transfer function related utility code from MayaVi1.
@@ -141,22 +155,53 @@ def rescale_ctfs(volume_property, new_range):
         ctf, otf = load_ctfs(s_d, volume_property)
     return ctf, otf
 
+def get_table(volume_property, n):
+    """Given a `tvtk.VolumeProperty` it returns an (n, 4) array of the
+    RGBA values of its color and opacity transfer functions sampled
+    uniformly over the range of the CTF.
+
+    The tables are cached and shared by all the volume properties with
+    identical transfer functions.  They are only sampled again when a
+    transfer function is modified.  The returned array must not be
+    modified.
+    """
+    ctf = tvtk.to_vtk(volume_property.rgb_transfer_function)
+    otf = tvtk.to_vtk(volume_property.get_scalar_opacity())
+    id_key = (ctf.__this__, ctf.GetMTime(), otf.__this__, otf.GetMTime())
+    key = _key_cache.get(id_key)
+    if key is None:
+        s_d = save_ctfs(volume_property)
+        key = (tuple(s_d['range']), tuple(map(tuple, s_d['rgb'])),
+               tuple(map(tuple, s_d['alpha'])))
+        _cache_item(_key_cache, id_key, key)
+    table = _table_cache.pop((key, n), None)
+    if table is None:
+        s1, s2 = key[0]
+        rgb = numpy.empty(3*n)
+        ctf.GetTable(s1, s2, n, rgb)
+        alpha = numpy.empty(n)
+        otf.GetTable(s1, s2, n, alpha)
+        table = numpy.column_stack((rgb.reshape(n, 3), alpha))
+        table.flags.writeable = False
+    # (Re)inserting the table marks it as the most recently used.
+    _cache_item(_table_cache, (key, n), table)
+    return table
+
+def _cache_item(cache, key, value):
+    """Adds an item to one of our LRU caches, discarding the oldest
+    items if the cache is full."""
+    cache[key] = value
+    while len(cache) > TABLE_CACHE_SIZE:
+        cache.popitem(last=False)
+
 def set_lut(lut, volume_property):
     """Given a `tvtk.LookupTable` and a `tvtk.VolumeProperty` it saves
     the state of the RGB and opacity CTF from the volume property to
     the LUT.  The number of colors to use is obtained from the LUT and
-    not the CTF.
+    not the CTF.  The sampled colors are cached, see `get_table`.
     """
-    vp = volume_property
-    ctf = vp.rgb_transfer_function
-    otf = vp.get_scalar_opacity()
-    s1, s2 = ctf.range
-    nc = lut.number_of_colors
-    ds = float(s2-s1)/(nc - 1)
-    for i in range(nc):
-        r, g, b = ctf.get_color(s1 + i*ds)
-        a = otf.get_value(s1 + i*ds)
-        lut.set_table_value(i, r, g, b, a)
+    table = get_table(volume_property, lut.number_of_colors)
+    lut.table = numpy.clip(table*255.0 + 0.5, 0, 255).astype(numpy.uint8)
 
 def set_ctf_from_lut(lut, volume_property):
     """Given a `tvtk.LookupTable` and a `tvtk.VolumeProperty` it loads